@@ -1,13 +1,24 @@
+import os
+
 import ezdxf
 import numpy as np
 from OCC.Core.gp import gp_Pnt
 from OCC.Core.BRepBuilderAPI import (
     BRepBuilderAPI_MakeEdge,
     BRepBuilderAPI_MakeWire,
-    BRepBuilderAPI_MakeFace,
 )
 from OCC.Core.BRep import BRep_Builder
 from OCC.Core.TopoDS import TopoDS_Compound, TopoDS_Shape
+from OCC.Core.Geom import Geom_BSplineCurve
+from OCC.Core.TColgp import TColgp_Array1OfPnt
+from OCC.Core.TColStd import TColStd_Array1OfReal, TColStd_Array1OfInteger
+
+from dxf_tools import polyline_wire, _lwpolyline_edges, _polyline_edges
+from tools.edge_chaining import build_faces
+from tools.geometry_cache import cached_import
+from tools.shape_healing import (
+    HealingOptions, heal_shape, simplify_polyline, refit_bspline_edge
+)
 
 
 def build_closed_wire(pts, close_tol=1e-3):
@@ -46,7 +57,91 @@ def make_compound_from_edges(edges):
     return compound
 
 
-def smart_load_dxf(path: str) -> TopoDS_Shape:
+# أقصى ارتفاع وتر (mm) عند تقسيم الـ Spline لخطوط — بدل 800 نقطة ثابتة
+SPLINE_CHORD_TOL = 0.01
+CLOSE_TOL = 1e-3
+
+
+def native_bspline_edge(bs):
+    """
+    حافة BSpline أصلية من نقاط التحكم والعُقد والأوزان (بدون أي تقسيم).
+    bs = entity.construction_tool() من ezdxf. يرجع None إن تعذّر البناء.
+    """
+    ctrl = np.asarray([tuple(p) for p in bs.control_points], dtype=float)
+    knots = np.asarray(bs.knots(), dtype=float)
+    degree = int(bs.degree)
+    if len(ctrl) < degree + 1 or len(knots) != len(ctrl) + degree + 1:
+        return None
+
+    # عُقد فريدة + تكراراتها كما يطلبها OCC
+    span = max(knots[-1] - knots[0], 1.0)
+    rounded = np.round((knots - knots[0]) / span, 9)
+    _, first_idx, mults = np.unique(rounded, return_index=True, return_counts=True)
+    unique_knots = knots[first_idx]
+
+    poles = TColgp_Array1OfPnt(1, len(ctrl))
+    for i, (x, y, *_rest) in enumerate(ctrl, 1):
+        poles.SetValue(i, gp_Pnt(float(x), float(y), 0.0))
+    occ_knots = TColStd_Array1OfReal(1, len(unique_knots))
+    occ_mults = TColStd_Array1OfInteger(1, len(mults))
+    for i, (k, m) in enumerate(zip(unique_knots, mults), 1):
+        occ_knots.SetValue(i, float(k))
+        occ_mults.SetValue(i, int(m))
+
+    weights = list(bs.weights()) if bs.is_rational else []
+    if weights:
+        occ_w = TColStd_Array1OfReal(1, len(weights))
+        for i, w in enumerate(weights, 1):
+            occ_w.SetValue(i, float(w))
+        curve = Geom_BSplineCurve(poles, occ_w, occ_knots, occ_mults, degree, False)
+    else:
+        curve = Geom_BSplineCurve(poles, occ_knots, occ_mults, degree, False)
+
+    mk = BRepBuilderAPI_MakeEdge(curve)
+    return mk.Edge() if mk.IsDone() else None
+
+
+def _edge_wire(edge):
+    """Wire من حافة Spline مغلقة واحدة."""
+    mk = BRepBuilderAPI_MakeWire(edge)
+    return mk.Wire() if mk.IsDone() else None
+
+
+def adaptive_spline_points(bs, tol: float = SPLINE_CHORD_TOL) -> np.ndarray:
+    """
+    تقسيم تكيّفي حسب الانحناء: نقاط أكثر في المنحنيات الحادة وأقل في الأجزاء المستقيمة،
+    بحيث لا يتجاوز ارتفاع الوتر tol. كل نقطة تُحسب مرة واحدة فقط.
+    """
+    pts = np.asarray([tuple(v) for v in bs.flattening(tol, segments=4)], dtype=float)
+    return pts[:, :2]
+
+
+def _spline_wire(pts, opts: HealingOptions):
+    """Wire من نقاط الـ Spline: BSpline واحد إن أمكن، وإلا خطوط بعد دمج المستقيمات."""
+    if opts.refit_splines:
+        edge = refit_bspline_edge([(p[0], p[1], 0.0) for p in pts], opts.tolerance)
+        if edge is not None:
+            mk = BRepBuilderAPI_MakeWire(edge)
+            if mk.IsDone() and mk.Wire().Closed():
+                print("🩹 Spline refit → 1 BSpline edge")
+                return mk.Wire()
+    if opts.merge_collinear:
+        before = len(pts)
+        pts = simplify_polyline(pts, opts.tolerance)
+        print(f"🩹 Collinear merge: {before} → {len(pts)} points")
+    return build_closed_wire(pts)
+
+
+@cached_import("smart_load_dxf")
+def smart_load_dxf(path: str, heal: bool = False, options: HealingOptions = None) -> TopoDS_Shape:
+    """
+    heal=True يشغّل مرحلة التبسيط (tools.shape_healing) على البروفايل المستورد
+    لتقليل عدد الحواف قبل الإكسترود وعمليات الـ Boolean.
+    الناتج يُحفظ في tools.geometry_cache ويُقرأ منه مباشرة في المرات التالية.
+    بدون options يُقاس زمن الـ Boolean قبل/بعد التبسيط (مرة واحدة لكل ملف بفضل الكاش)
+    ويُطبع في تقرير [HEAL].
+    """
+    opts = options or HealingOptions(measure_booleans=heal)
     print(f"📂 تحميل وتحليل ملف DXF: {path}")
     try:
         doc = ezdxf.readfile(path)
@@ -62,28 +157,47 @@ def smart_load_dxf(path: str) -> TopoDS_Shape:
                 start, end = e.dxf.start, e.dxf.end
                 edges.append(make_edge_from_points(start, end))
 
+            elif e.dxftype() == "LWPOLYLINE":
+                # Wire واحد بأقواس حقيقية من قيم bulge — نفس بنّاء dxf_tools
+                edges.extend(_lwpolyline_edges(e))
+
+            elif e.dxftype() == "POLYLINE":
+                # 2D فقط: 3D والـ Polyface / Polygon mesh تُتجاهل في dxf_tools._polyline_edges
+                edges.extend(_polyline_edges(e))
+
             elif e.dxftype() == "SPLINE":
                 bs = e.construction_tool()
                 knots = bs.knots()
                 t_min, t_max = knots[0], knots[-1]
-                T = np.linspace(t_min, t_max, 800)
-                pts = [(float(bs.point(t).x), float(bs.point(t).y)) for t in T]
-
-                # فحص الإغلاق هندسيًا بدل .closed
-                if np.allclose(bs.point(t_min), bs.point(t_max), atol=1e-3):
-                    pts.append(pts[0])
-                    print("🔁 المسار مغلق هندسيًا")
-                else:
-                    print("🔓 المسار مفتوح هندسيًا")
-
-                wire = build_closed_wire(pts)
-                if wire:
-                    face = BRepBuilderAPI_MakeFace(wire).Face()
-                    if not face.IsNull():
-                        print("✅ تم بناء وجه هندسي من Spline")
-                        return face
+                p_start, p_end = bs.point(t_min), bs.point(t_max)
+                # فحص الإغلاق هندسيًا بدل .closed — الـ Spline المفتوح جزء من مسار أكبر
+                closed = np.allclose(p_start, p_end, atol=CLOSE_TOL)
+
+                # 1) حافة BSpline أصلية واحدة من نقاط التحكم والعُقد
+                shape = None
+                try:
+                    edge = native_bspline_edge(bs)
+                    if edge is not None:
+                        shape = _edge_wire(edge) if closed else edge
+                        print("✅ Spline → 1 native BSpline edge")
+                except Exception as ex:
+                    print(f"⚠️ BSpline أصلي غير ممكن ({ex}) — تقسيم تكيّفي")
+
+                # 2) بديل: تقسيم تكيّفي بسماحية ارتفاع الوتر
+                if shape is None:
+                    pts = adaptive_spline_points(bs, SPLINE_CHORD_TOL)
+                    print(f"📈 Adaptive sampling: {len(pts)} points (tol={SPLINE_CHORD_TOL})")
+                    if closed:
+                        pts = np.vstack([pts, pts[:1]])
+                        shape = _spline_wire(pts, opts) if heal else build_closed_wire(pts)
                     else:
-                        print("⚠️ فشل بناء Face من Spline")
+                        if heal and opts.merge_collinear:
+                            pts = simplify_polyline(pts, opts.tolerance)
+                        shape = polyline_wire([(p[0], p[1], 0.0) for p in pts], False)
+
+                # المسار يُضاف مع باقي الحواف و build_faces يصنّف الخارجي والثقوب
+                if shape is not None:
+                    edges.append(shape)
                 else:
                     print("⚠️ فشل بناء Wire من Spline")
 
@@ -97,6 +211,19 @@ def smart_load_dxf(path: str) -> TopoDS_Shape:
         print("❌ لا يوجد هندسة قابلة للتحميل")
         return None
 
+    # بروفايل متعدد المسارات → Face واحد بثقوبه
+    try:
+        face = build_faces(edges)
+    except Exception as ex:
+        print(f"⚠️ فشل تجميع الحواف في Face: {ex}")
+        face = None
+    if face is not None and not face.IsNull():
+        print(f"✅ تم بناء Face من {len(edges)} حافة/مسار")
+        if heal:
+            face, report = heal_shape(face, opts)
+            print(f"[HEAL] {os.path.basename(path)}: {report.summary()}")
+        return face
+
     compound = make_compound_from_edges(edges)
     print(f"✅ تم بناء Compound من {len(edges)} حافة")
     return compound
\ No newline at end of file
@@ -1,22 +1,142 @@
 import ezdxf
 import math
-from OCC.Core.BRepBuilderAPI import (
-    BRepBuilderAPI_MakeEdge, BRepBuilderAPI_Transform
-)
+from collections import Counter
+from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeEdge, BRepBuilderAPI_MakeWire
+from OCC.Core.GC import GC_MakeArcOfCircle
 from OCC.Core.BRep import BRep_Builder
 from OCC.Core.TopoDS import TopoDS_Compound
-from OCC.Core.gp import gp_Pnt, gp_Dir, gp_Trsf, gp_Ax1, gp_Circ, gp_Ax2
+from OCC.Core.gp import gp_Pnt, gp_Dir, gp_Circ, gp_Ax2
 from OCC.Core.GeomAPI import GeomAPI_PointsToBSpline
 from OCC.Core.TColgp import TColgp_Array1OfPnt
 
+from tools.edge_chaining import build_faces
+from tools.extrusion import placed, rotation
+from tools.geometry_cache import cached_import
+
+
+BULGE_EPS = 1e-9
+
+
+# ==================== 🌙 Polyline مع Bulge ====================
+def bulge_arc_edge(p1, p2, bulge):
+    """
+    قوس دائري حقيقي بين نقطتين من قيمة bulge = tan(الزاوية/4).
+    bulge موجب = عكس عقارب الساعة من p1 إلى p2.
+    """
+    (x1, y1), (x2, y2) = p1, p2
+    dx, dy = x2 - x1, y2 - y1
+    chord = math.hypot(dx, dy)
+    # نقطة منتصف القوس = منتصف الوتر + السهم (sagitta) على الناظم الأيمن
+    sagitta = bulge * chord / 2.0
+    mx = (x1 + x2) / 2.0 + sagitta * dy / chord
+    my = (y1 + y2) / 2.0 - sagitta * dx / chord
+    arc = GC_MakeArcOfCircle(gp_Pnt(x1, y1, 0), gp_Pnt(mx, my, 0), gp_Pnt(x2, y2, 0)).Value()
+    return BRepBuilderAPI_MakeEdge(arc).Edge()
+
+
+def polyline_wire(vertices, closed):
+    """
+    Wire واحد لكل Polyline من رؤوس (x, y, bulge):
+    المقاطع ذات bulge تصبح أقواس حقيقية والباقي خطوط مستقيمة.
+    """
+    n = len(vertices)
+    if n < 2:
+        return None
+    mk = BRepBuilderAPI_MakeWire()
+    segments = n if closed else n - 1
+    for i in range(segments):
+        x1, y1, bulge = vertices[i]
+        x2, y2, _ = vertices[(i + 1) % n]
+        if math.hypot(x2 - x1, y2 - y1) < 1e-9:
+            continue
+        if abs(bulge) > BULGE_EPS:
+            edge = bulge_arc_edge((x1, y1), (x2, y2), bulge)
+        else:
+            edge = BRepBuilderAPI_MakeEdge(gp_Pnt(x1, y1, 0), gp_Pnt(x2, y2, 0)).Edge()
+        mk.Add(edge)
+    return mk.Wire() if mk.IsDone() else None
+
+
+# ==================== 🧱 بنّاء الحواف لكل نوع كائن ====================
+# كل دالة تستقبل كائن DXF وترجع (yield) حواف أو Wires جاهزة مباشرة
+
+def _line_edges(line):
+    s, e = line.dxf.start, line.dxf.end
+    yield BRepBuilderAPI_MakeEdge(
+        gp_Pnt(s[0], s[1], 0),
+        gp_Pnt(e[0], e[1], 0)
+    ).Edge()
+
+
+def _lwpolyline_edges(poly):
+    wire = polyline_wire([tuple(p) for p in poly.get_points("xyb")], poly.closed)
+    if wire is not None:
+        yield wire
+
+
+def _polyline_edges(poly):
+    # POLYLINE ثنائي الأبعاد فقط (الـ 3D والـ Mesh لا تحمل bulge)
+    if poly.is_3d_polyline or poly.is_poly_face_mesh or poly.is_polygon_mesh:
+        return
+    vertices = []
+    for v in poly.vertices:
+        loc = v.dxf.location
+        vertices.append((loc[0], loc[1], v.dxf.get("bulge", 0.0)))
+    wire = polyline_wire(vertices, poly.is_closed)
+    if wire is not None:
+        yield wire
+
+
+def _circle_edges(circ):
+    c = circ.dxf.center
+    r = circ.dxf.radius
+    circ_ax2 = gp_Ax2(gp_Pnt(c[0], c[1], 0), gp_Dir(0, 0, 1))
+    yield BRepBuilderAPI_MakeEdge(gp_Circ(circ_ax2, r)).Edge()
+
+
+def _arc_edges(arc):
+    c = arc.dxf.center
+    r = arc.dxf.radius
+    start_angle = math.radians(arc.dxf.start_angle)
+    end_angle = math.radians(arc.dxf.end_angle)
+    circ_ax2 = gp_Ax2(gp_Pnt(c[0], c[1], 0), gp_Dir(0, 0, 1))
+    yield BRepBuilderAPI_MakeEdge(gp_Circ(circ_ax2, r), start_angle, end_angle).Edge()
+
+
+def _spline_edges(spline):
+    fit_points = spline.fit_points
+    n = len(fit_points)
+    if n >= 2:
+        arr = TColgp_Array1OfPnt(1, n)
+        for i, pt in enumerate(fit_points, start=1):
+            arr.SetValue(i, gp_Pnt(pt[0], pt[1], 0))
+        bspline = GeomAPI_PointsToBSpline(arr).Curve()
+        yield BRepBuilderAPI_MakeEdge(bspline).Edge()
+
+
+ENTITY_BUILDERS = {
+    "LINE": _line_edges,
+    "LWPOLYLINE": _lwpolyline_edges,
+    "POLYLINE": _polyline_edges,
+    "CIRCLE": _circle_edges,
+    "ARC": _arc_edges,
+    "SPLINE": _spline_edges,
+}
+
+
+def register_entity_builder(dxftype, builder):
+    """إضافة دعم لنوع كائن DXF جديد: builder(entity) -> iterable of TopoDS_Edge / TopoDS_Wire"""
+    ENTITY_BUILDERS[dxftype.upper()] = builder
+
+
+@cached_import("load_dxf_file")
 def load_dxf_file(file_path):
     """
-    يحوّل DXF إلى شكل TopoDS_Compound يدعم:
-    - LINE
-    - LWPOLYLINE
-    - CIRCLE
-    - ARC
-    - SPLINE
+    يحوّل DXF إلى شكل TopoDS_Compound بمرور واحد على الـ modelspace:
+    كل كائن يُوجَّه مباشرة لبنّاء نوعه (ENTITY_BUILDERS) وتُضاف حوافه للـ Compound فورًا،
+    ثم تُجمَّع الحواف في Face بثقوبه (tools.edge_chaining) وإلا يُرجع الـ Compound.
+    الناتج يُحفظ كـ Binary BRep (tools.geometry_cache) فلا يُعاد التحليل لنفس المحتوى.
+    الأنواع المدعومة: LINE, LWPOLYLINE, POLYLINE (مع أقواس bulge), CIRCLE, ARC, SPLINE
     """
     try:
         doc = ezdxf.readfile(file_path)
@@ -25,85 +145,47 @@ def load_dxf_file(file_path):
         return None
 
     msp = doc.modelspace()
-    edges = []
-
-    # --------- LINE ----------
-    for line in msp.query("LINE"):
-        s, e = line.dxf.start, line.dxf.end
-        edges.append(
-            BRepBuilderAPI_MakeEdge(
-                gp_Pnt(s[0], s[1], 0),
-                gp_Pnt(e[0], e[1], 0)
-            ).Edge()
-        )
-
-    # --------- LWPOLYLINE ----------
-    for poly in msp.query("LWPOLYLINE"):
-        pts = poly.get_points("xy")
-        n = len(pts)
-        if n < 2:
-            continue
-        closed = poly.closed
-        for i in range(n):
-            x1, y1 = pts[i]
-            x2, y2 = pts[(i + 1) % n]
-            if i == n - 1 and not closed:
-                break
-            edges.append(
-                BRepBuilderAPI_MakeEdge(
-                    gp_Pnt(x1, y1, 0),
-                    gp_Pnt(x2, y2, 0)
-                ).Edge()
-            )
-
-    # --------- CIRCLE ----------
-    for circ in msp.query("CIRCLE"):
-        c = circ.dxf.center
-        r = circ.dxf.radius
-        circ_ax2 = gp_Ax2(gp_Pnt(c[0], c[1], 0), gp_Dir(0, 0, 1))
-        circle = gp_Circ(circ_ax2, r)
-        edges.append(BRepBuilderAPI_MakeEdge(circle).Edge())
-
-    # --------- ARC ----------
-    for arc in msp.query("ARC"):
-        c = arc.dxf.center
-        r = arc.dxf.radius
-        start_angle = math.radians(arc.dxf.start_angle)
-        end_angle = math.radians(arc.dxf.end_angle)
-        circ_ax2 = gp_Ax2(gp_Pnt(c[0], c[1], 0), gp_Dir(0, 0, 1))
-        circle = gp_Circ(circ_ax2, r)
-        edges.append(
-            BRepBuilderAPI_MakeEdge(circle, start_angle, end_angle).Edge()
-        )
-
-    # --------- SPLINE ----------
-    for spline in msp.query("SPLINE"):
-        fit_points = spline.fit_points
-        n = len(fit_points)
-        if n >= 2:
-            arr = TColgp_Array1OfPnt(1, n)
-            for i, pt in enumerate(fit_points, start=1):
-                arr.SetValue(i, gp_Pnt(pt[0], pt[1], 0))
-            bspline = GeomAPI_PointsToBSpline(arr).Curve()
-            edges.append(BRepBuilderAPI_MakeEdge(bspline).Edge())
-
-    if not edges:
-        print("❌ No valid geometry found in DXF.")
-        return None
 
-    # --------- COMPOUND ----------
     builder = BRep_Builder()
     compound = TopoDS_Compound()
     builder.MakeCompound(compound)
-    for e in edges:
-        builder.Add(compound, e)
-
-    # --------- Rotate DXF shape ----------
-    trsf = gp_Trsf()
-    trsf.SetRotation(
-        gp_Ax1(gp_Pnt(0, 0, 0), gp_Dir(1, 0, 0)),
-        math.radians(-90)
-    )
-    rotated_shape = BRepBuilderAPI_Transform(compound, trsf, True).Shape()
-
-    return rotated_shape
+
+    counts = Counter()
+    skipped = Counter()
+    shapes = []
+
+    # --------- مرور واحد على كل الكائنات ----------
+    for entity in msp:
+        dxftype = entity.dxftype()
+        make_edges = ENTITY_BUILDERS.get(dxftype)
+        if make_edges is None:
+            skipped[dxftype] += 1
+            continue
+        try:
+            for shape in make_edges(entity):
+                builder.Add(compound, shape)
+                shapes.append(shape)
+            counts[dxftype] += 1
+        except Exception as ex:
+            print(f"⚠️ Invalid {dxftype} skipped: {ex}")
+
+    if not shapes:
+        print("❌ No valid geometry found in DXF.")
+        return None
+
+    print(f"[DXF] {len(shapes)} edges/wires from {dict(counts)}"
+          + (f" | skipped {dict(skipped)}" if skipped else ""))
+
+    # --------- تجميع الحواف في Face (خارجي + تجاويف) إن أمكن ----------
+    result = compound
+    try:
+        face = build_faces(shapes)
+        if face is not None and not face.IsNull():
+            result = face
+        else:
+            print("[DXF] ⚠️ No closed contour — returning loose edges")
+    except Exception as ex:
+        print(f"[DXF] ⚠️ Face reconstruction failed ({ex}) — returning loose edges")
+
+    # --------- Rotate DXF shape (Location فقط بدون نسخ) ----------
+    return placed(result, rotation("X", -90.0))
@@ -20,6 +20,7 @@ from PyQt5.QtWidgets import QFileDialog, QMessageBox
 # ==========================================================
 from OCC.Core.BRepTools import breptools_Write
 from OCC.Core.TopoDS import TopoDS_Shape
+from tools.boolean_ops import BooleanOptions, get_default_options, set_default_options
 import os, json
 from pathlib import Path
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
@@ -67,6 +68,7 @@ def save_project_dialog(parent):
             "last_gcode": getattr(parent, "gcode_path", ""),
             "tool_settings": getattr(parent, "tool_settings", {}),
             "operations": operations,
+            "boolean_options": get_default_options().to_dict(),
         }
 
         with open(path, "w", encoding="utf-8") as f:
@@ -109,6 +111,8 @@ def open_project_dialog(parent):
 
         brep_path = project_data.get("brep_path", "")
         operations = project_data.get("operations", [])
+        # ⚙️ خيارات الـ Boolean الخاصة بالمشروع (fuzzy / glue / parallel ...)
+        set_default_options(BooleanOptions.from_dict(project_data.get("boolean_options", {})))
         print(f"[📂] Project loaded -> {path}")
 
         if not brep_path or not os.path.exists(brep_path):
@@ -123,6 +127,9 @@ def open_project_dialog(parent):
             if shape.IsNull():
                 raise ValueError("Failed to load BREP shape (null shape)")
 
+            # model.brep هو current_shape وقت الحفظ — الثقوب والأنماط مقصوصة فيه مسبقًا،
+            # فلا يُعاد قصها هنا (العمليات تُستعاد للشجرة فقط)
+
             # عرض الشكل
             if hasattr(parent, "display"):
                 parent.display.EraseAll()
@@ -135,9 +142,14 @@ def open_project_dialog(parent):
             parent.current_shape = shape  # احتفاظ بالشكل في الذاكرة
 
         # 🧠 استرجاع العمليات مع تمرير params دائمًا
+        restored_shape = getattr(parent, "current_shape", None)
         if operations:
             if hasattr(parent, "op_browser") and parent.op_browser and hasattr(parent.op_browser, "add_operation"):
                 print(f"[🔁] Found {len(operations)} stored operations.")
+                # 🌱 الشكل المستعاد أساس سجل كل بروفايل — فالحذف/التعديل لا يعيد البناء من لا شيء
+                if restored_shape is not None and hasattr(parent.op_browser, "add_profile"):
+                    for name in dict.fromkeys(op.get("name", "Unnamed") for op in operations):
+                        parent.op_browser.add_profile(name, restored_shape)
                 for op in operations:
                     try:
                         op_type = op.get("type", "Unknown")
@@ -151,7 +163,7 @@ def open_project_dialog(parent):
                             axis = params.get("axis", "Z"); tool = params.get("tool", "")
                             print(f"[TRACE] Hole params -> name={op_name}, pos=({x},{y},{z}), dia={dia}, depth={depth}, axis={axis}, tool={tool}")
 
-                        parent.op_browser.add_operation(op_type, op_name, params)
+                        parent.op_browser.add_operation(op_type, op_name, params, shape=restored_shape)
                     except Exception as e:
                         print(f"[⚠️] Failed to reload operation: {e}")
                 print(f"[✅] Operations restored to op_browser.")
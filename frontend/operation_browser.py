@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem,
-    QHBoxLayout, QPushButton, QMenu, QAction
+    QHBoxLayout, QPushButton, QMenu, QAction, QDialog, QFormLayout,
+    QLineEdit, QDialogButtonBox, QMessageBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QIcon, QColor
 
+from tools.feature_history import FeatureHistory
+
+# دور تخزين رقم العقدة داخل سجل العمليات (FeatureHistory)
+NODE_ID_ROLE = Qt.UserRole + 1
+
 class OperationBrowser(QWidget):
     """
     شجرة عمليات احترافية:
@@ -14,8 +20,12 @@ class OperationBrowser(QWidget):
     - تلوين + أيقونات + Tooltip
     - عدّاد أسفل الشجرة
     - API متوافقة: add_profile, add_hole
+    - سجل عمليات لكل بروفايل مع إعادة بناء تزايدية عند التعديل/الحذف
     """
 
+    # (profile_name, shape) بعد إعادة بناء السجل
+    shapeRegenerated = pyqtSignal(str, object)
+
     ICONS = {
         "profile": "frontend/icons/profile.png",
         "hole": "frontend/icons/hole.png",
@@ -26,6 +36,7 @@ class OperationBrowser(QWidget):
         super().__init__(parent)
 
         self._profiles = {}   # name -> QTreeWidgetItem
+        self._histories = {}  # name -> FeatureHistory
         self._ops_count = 0
         self._holes_count = 0
 
@@ -61,12 +72,14 @@ class OperationBrowser(QWidget):
         self.setLayout(layout)
 
     # ---------- API ----------
-    def add_profile(self, profile_name: str):
+    def add_profile(self, profile_name: str, shape=None):
         if not profile_name:
             return
+        if shape is not None:
+            self.history(profile_name).set_base(shape)
         if profile_name in self._profiles:
             # موجود مسبقًا
-            return
+            return self._profiles[profile_name]
         root = QTreeWidgetItem(self.tree, [profile_name, ""])
         if self.ICONS["profile"]:
             root.setIcon(0, QIcon(self.ICONS["profile"]))
@@ -74,17 +87,27 @@ class OperationBrowser(QWidget):
         root.setExpanded(True)
         self._profiles[profile_name] = root
         self._update_stats()
+        return root
 
-    def add_extrude(self, profile_name: str, height: float, axis: str = "Z"):
+    def add_extrude(self, profile_name: str, height: float, axis: str = "Z", shape=None, draft: float = 0.0,
+                    heal: bool = False):
         """عملية عرض فقط (غير مُصدّرة كجي كود حالياً)"""
         root = self._ensure_profile(profile_name)
         text = f"Extrude {height:g} along {axis}"
+        if draft:
+            text += f" (draft {draft:g}°)"
+        if heal:
+            text += " (simplified)"
         node = QTreeWidgetItem(root, ["Extrude", text])
-        node.setData(0, Qt.UserRole, {
+        meta = {
             "type": "Extrude",
             "height": float(height),
-            "axis": axis
-        })
+            "axis": axis,
+            "draft": float(draft),
+            "heal": bool(heal),
+        }
+        node.setData(0, Qt.UserRole, meta)
+        self._record(profile_name, node, meta, shape)
 
         if self.ICONS["extrude"]:
             node.setIcon(0, QIcon(self.ICONS["extrude"]))
@@ -94,7 +117,7 @@ class OperationBrowser(QWidget):
         self._update_stats()
         root.setExpanded(True)
 
-    def add_hole(self, profile_name: str, pos_xyz, dia, depth, axis, tool: str = None):
+    def add_hole(self, profile_name: str, pos_xyz, dia, depth, axis, tool: str = None, shape=None):
         """
         متوافق مع النداءات القديمة:
         add_hole(profile, (x,y,z), dia, depth, axis, tool=?)
@@ -113,7 +136,7 @@ class OperationBrowser(QWidget):
             node.setIcon(0, QIcon(self.ICONS["hole"]))
         node.setForeground(0, QColor(30, 90, 160))  # أزرق لعمليات الحفر
 
-        node.setData(0, Qt.UserRole, {
+        meta = {
             "type": "Hole",
             "x": float(x),
             "y": float(y),
@@ -122,13 +145,127 @@ class OperationBrowser(QWidget):
             "depth": float(depth),
             "axis": axis,
             "tool": tool or ""
-        })
+        }
+        node.setData(0, Qt.UserRole, meta)
+        self._record(profile_name, node, meta, shape)
 
         self._ops_count += 1
         self._holes_count += 1
         self._update_stats()
         root.setExpanded(True)
 
+    def add_pattern(self, profile_name: str, params: dict, tool: str = None, shape=None):
+        """
+        نمط ثقوب كعملية واحدة في الشجرة مهما كان عدد الثقوب.
+        params بنفس مفاتيح tools.hole_pattern (kind, x, y, z, dia, depth, axis, count, pitch ...)
+        """
+        from tools.hole_pattern import pattern_positions
+
+        root = self._ensure_profile(profile_name)
+        meta = {"type": "Pattern"}
+        meta.update({k: v for k, v in params.items() if k != "type"})
+        if tool:
+            meta["tool"] = tool
+        n_holes = len(pattern_positions(meta))
+
+        kind = str(meta.get("kind", "linear")).capitalize()
+        head = f"{kind} ×{n_holes} Ø{float(meta.get('dia', 0)):g} ⬇{float(meta.get('depth', 0)):g} ({meta.get('axis', 'Z')})"
+        detail = f"Δ{float(meta.get('pitch', 0)):g} along {meta.get('direction', 'X')}"
+        if meta.get("tool"):
+            detail += f" | Tool: {meta['tool']}"
+
+        node = QTreeWidgetItem(root, ["Pattern", f"{head}  {detail}"])
+        node.setToolTip(0, "Hole pattern (single batched operation)")
+        node.setToolTip(1, f"{n_holes} holes starting at ({meta.get('x', 0)},{meta.get('y', 0)},{meta.get('z', 0)})")
+        if self.ICONS["hole"]:
+            node.setIcon(0, QIcon(self.ICONS["hole"]))
+        node.setForeground(0, QColor(30, 90, 160))
+        node.setData(0, Qt.UserRole, meta)
+        self._record(profile_name, node, meta, shape)
+
+        self._ops_count += 1
+        self._holes_count += n_holes
+        self._update_stats()
+        root.setExpanded(True)
+        return node
+
+    def add_box_cut(self, profile_name: str, pos_xyz, size_xyz, shape=None):
+        """عملية طرح صندوق (Box Cut)"""
+        root = self._ensure_profile(profile_name)
+        x, y, z = pos_xyz
+        dx, dy, dz = size_xyz
+        text = f"Box {float(dx):g}×{float(dy):g}×{float(dz):g} @ ({float(x):g},{float(y):g},{float(z):g})"
+        node = QTreeWidgetItem(root, ["BoxCut", text])
+        meta = {
+            "type": "BoxCut",
+            "x": float(x), "y": float(y), "z": float(z),
+            "dx": float(dx), "dy": float(dy), "dz": float(dz)
+        }
+        node.setData(0, Qt.UserRole, meta)
+        node.setToolTip(0, text)
+        node.setForeground(0, QColor(160, 60, 30))
+        self._record(profile_name, node, meta, shape)
+        self._ops_count += 1
+        self._update_stats()
+        root.setExpanded(True)
+
+    # ---------- سجل العمليات (Feature History) ----------
+    def history(self, profile_name: str) -> FeatureHistory:
+        if not profile_name:
+            profile_name = "Unnamed"
+        if profile_name not in self._histories:
+            self._histories[profile_name] = FeatureHistory()
+        return self._histories[profile_name]
+
+    def shape_for_item(self, item: QTreeWidgetItem):
+        """الشكل الناتج عند عقدة معينة (أو الشكل النهائي للبروفايل)."""
+        if item is None:
+            return None
+        if item.parent() is None:
+            return self.history(item.text(0)).result()
+        node_id = item.data(0, NODE_ID_ROLE)
+        return self.history(item.parent().text(0)).shape_at(node_id)
+
+    def update_operation(self, item: QTreeWidgetItem, params: dict):
+        """تعديل معاملات عملية وإعادة بناء العمليات التالية لها فقط."""
+        if item is None or item.parent() is None:
+            return None
+        meta = dict(item.data(0, Qt.UserRole) or {})
+        meta.update(params)
+        item.setData(0, Qt.UserRole, meta)
+        profile = item.parent().text(0)
+        node_params = {k: v for k, v in meta.items() if k != "type"}
+        shape = self.history(profile).update(item.data(0, NODE_ID_ROLE), node_params)
+        self._emit_regenerated(profile, shape)
+        return shape
+
+    def delete_operation(self, item: QTreeWidgetItem):
+        """حذف عملية من الشجرة والسجل، وإرجاع الشكل بعد إعادة البناء."""
+        if item is None:
+            return None
+        parent = item.parent()
+        if parent is None:
+            self._delete_item(item)
+            return None
+        history = self.history(parent.text(0))
+        current = history.result()
+        self._delete_item(item)
+        shape = history.result()
+        if shape is None and current is not None:
+            # لا يوجد شكل أساسي لإعادة البناء (مشروع قديم/بروفايل بلا شكل) → نبقي الحالي
+            print("[HISTORY] ⚠️ لا يمكن إعادة البناء بدون شكل أساسي — الإبقاء على الشكل الحالي")
+            return current
+        return shape
+
+    def _record(self, profile_name, node, meta, shape):
+        params = {k: v for k, v in meta.items() if k != "type"}
+        fnode = self.history(profile_name).append(meta["type"], params, shape=shape)
+        node.setData(0, NODE_ID_ROLE, fnode.node_id)
+
+    def _emit_regenerated(self, profile_name, shape):
+        if shape is not None and not shape.IsNull():
+            self.shapeRegenerated.emit(profile_name, shape)
+
     def get_all_ops(self):
         """إرجاع قائمة بكل العمليات بشكل قاموسات مرتبة حسب البروفايل."""
         results = []
@@ -172,6 +309,10 @@ class OperationBrowser(QWidget):
             act_show.triggered.connect(lambda: self._show_msg(op_meta))
             menu.addAction(act_show)
 
+            act_edit = QAction("Edit parameters…", self)
+            act_edit.triggered.connect(lambda: self._edit_item(item))
+            menu.addAction(act_edit)
+
             menu.addSeparator()
             act_del = QAction("Delete", self)
             act_del.triggered.connect(lambda: self._delete_item(item))
@@ -186,14 +327,68 @@ class OperationBrowser(QWidget):
             name = item.text(0)
             self._tree_remove(item)
             self._profiles.pop(name, None)
+            self._histories.pop(name, None)
         else:
             meta = item.data(0, Qt.UserRole) or {}
             if meta.get("type") == "Hole":
                 self._holes_count = max(0, self._holes_count - 1)
+            elif meta.get("type") == "Pattern":
+                from tools.hole_pattern import pattern_positions
+                self._holes_count = max(0, self._holes_count - len(pattern_positions(meta)))
             self._ops_count = max(0, self._ops_count - 1)
+            profile = parent.text(0)
+            node_id = item.data(0, NODE_ID_ROLE)
             self._tree_remove(item)
+            # ♻️ إعادة بناء العمليات التي تلي المحذوفة فقط
+            if node_id is not None:
+                shape = self.history(profile).remove(node_id)
+                self._emit_regenerated(profile, shape)
         self._update_stats()
 
+    def _edit_item(self, item: QTreeWidgetItem):
+        """نافذة تعديل معاملات العملية ثم إعادة بناء ما بعدها عبر update_operation."""
+        meta = item.data(0, Qt.UserRole) or {}
+        editable = {k: v for k, v in meta.items()
+                    if k not in ("type", "profile") and isinstance(v, (int, float, str))
+                    and not isinstance(v, bool)}
+        if not editable:
+            self._show_msg(meta)
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Edit {meta.get('type', 'Operation')}")
+        form = QFormLayout(dialog)
+        fields = {}
+        for key, value in editable.items():
+            fields[key] = QLineEdit(str(value))
+            form.addRow(f"{key}:", fields[key])
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow(buttons)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+
+        params = {}
+        try:
+            for key, edit in fields.items():
+                text = edit.text().strip()
+                old = editable[key]
+                # نحافظ على نوع القيمة الأصلي (int/float/str)
+                params[key] = type(old)(float(text)) if isinstance(old, (int, float)) else text
+        except ValueError:
+            QMessageBox.warning(self, "Edit", f"⚠️ قيمة غير صالحة للحقل: {key}")
+            return
+        changed = {k: v for k, v in params.items() if v != editable[k]}
+        if not changed:
+            return
+
+        shape = self.update_operation(item, changed)  # يرسل shapeRegenerated عند النجاح
+        if shape is None or shape.IsNull():
+            QMessageBox.warning(self, "Edit", "⚠️ فشل إعادة بناء العمليات بالمعاملات الجديدة.")
+        else:
+            print(f"[HISTORY] ✏️ Updated {meta.get('type')} → {changed}")
+
     def _tree_remove(self, item: QTreeWidgetItem):
         if item.parent():
             item.parent().removeChild(item)
@@ -287,8 +482,11 @@ class OperationBrowser(QWidget):
             print(f"[⚠️] collect_operations failed: {e}")
         return ops
 
-    def add_operation(self, op_type, op_name, params=None):
-        """إضافة عملية إلى الشجرة أو استدعاء الدالة المناسبة"""
+    def add_operation(self, op_type, op_name, params=None, shape=None):
+        """
+        إضافة عملية إلى الشجرة أو استدعاء الدالة المناسبة.
+        shape: الشكل الناتج المعروف مسبقًا (مثل model.brep عند فتح مشروع) فلا يُعاد حسابه.
+        """
         try:
             op_type_lower = op_type.lower()
             params = params or {}
@@ -297,7 +495,8 @@ class OperationBrowser(QWidget):
             if "extrude" in op_type_lower and hasattr(self, "add_extrude"):
                 height = params.get("height", 0)
                 axis = params.get("axis", "Y")
-                self.add_extrude(op_name, height, axis)
+                self.add_extrude(op_name, height, axis, shape=shape, draft=float(params.get("draft", 0.0)),
+                                 heal=bool(params.get("heal", False)))
                 print(f"[🔁] Restored extrude '{op_name}' h={height} axis={axis}")
 
             # 🕳️ Hole
@@ -313,16 +512,18 @@ class OperationBrowser(QWidget):
                 axis = params.get("axis", "Z")
                 tool = params.get("tool", "")
 
-                self.add_hole(op_name, pos_xyz, dia, depth, axis, tool)
+                self.add_hole(op_name, pos_xyz, dia, depth, axis, tool, shape=shape)
                 print(f"[🔁] Restored hole '{op_name}' Ø{dia} ⬇{depth} ({axis}) at ({x}, {y}, {z})")
 
 
-            # 🧩 Pattern / أي نوع آخر
+            # 🧩 Pattern
             elif "pattern" in op_type_lower and hasattr(self, "add_pattern"):
-                count = params.get("count", 2)
-                spacing = params.get("spacing", 30)
-                self.add_pattern(op_name, count, spacing)
-                print(f"[🔁] Restored pattern '{op_name}' x{count} Δ={spacing}")
+                params = dict(params)
+                # توافق مع المشاريع القديمة التي حفظت spacing بدل pitch
+                params.setdefault("pitch", params.get("spacing", 30))
+                params.setdefault("kind", "linear")
+                self.add_pattern(op_name, params, tool=params.get("tool") or None, shape=shape)
+                print(f"[🔁] Restored pattern '{op_name}' {params['kind']} x{params.get('count', 2)} Δ={params['pitch']}")
 
             else:
                 # fallback: عنصر عام في الشجرة
@@ -1,6 +1,4 @@
-from OCC.Core.gp import gp_Pnt, gp_Dir, gp_Ax2
-from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeCylinder
-from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut
+from OCC.Core.gp import gp_Pnt
 from OCC.Core.GC import GC_MakeCircle
 from OCC.Core.Geom import Geom_Circle
 from OCC.Core.GeomAPI import GeomAPI_PointsToBSpline
@@ -12,31 +10,14 @@ from OCC.Core.gp import gp_Vec
 from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeVertex, BRepBuilderAPI_MakeEdge
 from OCC.Display.SimpleGui import init_display
 
+from tools.geometry_ops import add_holes
+
 # ========== 🔩 إنشاء ثقب فعلي في المجسم ==========
 def add_hole(base_shape, x, y, z, dia, axis="Z", depth=10.0):
-    """إنشاء ثقب داخل الشكل باستخدام القطع المنطقي."""
-    try:
-        radius = dia / 2.0
-        dir_map = {
-            "X": gp_Dir(1, 0, 0),
-            "Y": gp_Dir(0, 1, 0),
-            "Z": gp_Dir(0, 0, 1)
-        }
-        direction = dir_map.get(axis.upper(), gp_Dir(0, 0, 1))
-        pos = gp_Pnt(x, y, z)
-
-        # ✅ بناء محور الأسطوانة
-        cyl_axis = gp_Ax2(pos, direction)
-
-        # ✅ إنشاء الثقب (أسطوانة)
-        tool_cylinder = BRepPrimAPI_MakeCylinder(cyl_axis, radius, depth).Shape()
-
-        # ✅ تنفيذ عملية القطع
-        cut_shape = BRepAlgoAPI_Cut(base_shape, tool_cylinder).Shape()
-        return cut_shape
-    except Exception as e:
-        print(f"[❌ add_hole] Failed to create hole: {e}")
-        return None
+    """إنشاء ثقب داخل الشكل — نفس مسار القص المجمّع في tools.geometry_ops."""
+    return add_holes(base_shape, [
+        {"x": x, "y": y, "z": z, "dia": dia, "axis": axis, "depth": depth}
+    ])
 
 
 # ========== 📏 قياس الشكل وإظهار النقاط المرجعية ==========
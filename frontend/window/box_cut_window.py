@@ -1,12 +1,12 @@
 # frontend/window/box_cut_window.py — FINAL BUILD (Manual Box Cut)
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QFormLayout, QLineEdit, QPushButton, QHBoxLayout
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QFormLayout, QLineEdit, QPushButton, QHBoxLayout, QApplication
 from PyQt5.QtCore import Qt
 
-from OCC.Core.AIS import AIS_Shape
-from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
-
-from tools.geometry_ops import preview_box_cut, apply_box_cut
+from tools.geometry_ops import preview_box_geometry, apply_box_cut
 from tools.color_utils import display_with_fusion_style
+from tools.op_executor import get_executor
+from tools.preview_ais import ReusablePreview
+from tools.extrusion import translation
 from tools.dimensions import (
     measure_shape,
     box_cut_reference_dimensions,
@@ -23,6 +23,10 @@ class BoxCutWindow(QWidget):
         self.set_shape = shape_setter
 
         self._box_preview_ais = None
+        # القصات المطبّقة تُنفَّذ بالتسلسل، كل واحدة على ناتج السابقة
+        self._cut_queue = []
+        self._cut_running = False
+        self._preview = ReusablePreview(display, color=(1.0, 0.0, 0.0), transparency=0.5)
         self._build_ui()
         self._connect_live_preview()
 
@@ -63,12 +67,8 @@ class BoxCutWindow(QWidget):
             w.textChanged.connect(self._update_preview)
 
     def _clear_preview(self):
-        if self._box_preview_ais is not None:
-            try:
-                self.display.Context.Erase(self._box_preview_ais, False)
-            except Exception:
-                pass
-            self._box_preview_ais = None
+        self._preview.reset()
+        self._box_preview_ais = None
 
     def _get_values(self):
         try:
@@ -93,18 +93,16 @@ class BoxCutWindow(QWidget):
         if not base_shape or base_shape.IsNull():
             return
 
-        self._clear_preview()
-
-        # 🟥 معاينة الصندوق الطارح
-        box_shape = preview_box_cut(x, y, z, dx, dy, dz)
-        if not box_shape or box_shape.IsNull():
+        # 🟥 معاينة الصندوق الطارح — يُعاد بناؤه عند تغيّر الأبعاد فقط،
+        # وتغيير X/Y/Z يحرّك نفس الكائن
+        shown = self._preview.show(
+            (round(dx, 4), round(dy, 4), round(dz, 4)),
+            lambda: preview_box_geometry(dx, dy, dz),
+            translation(x, y, z),
+        )
+        if not shown:
             return
-
-        ais = AIS_Shape(box_shape)
-        ais.SetColor(Quantity_Color(1, 0, 0, Quantity_TOC_RGB))  # أحمر
-        ais.SetTransparency(0.5)
-        self.display.Context.Display(ais, False)
-        self._box_preview_ais = ais
+        self._box_preview_ais = self._preview.ais
 
         if ENABLE_PREVIEW_DIMS:
             box_cut_reference_dimensions(self.display, x, y, z, base_shape, offset_above=10, preview=True)
@@ -116,7 +114,6 @@ class BoxCutWindow(QWidget):
         vals = self._get_values()
         if not vals:
             return
-        x, y, z, dx, dy, dz = vals
 
         base_shape = self.get_shape()
         if not base_shape or base_shape.IsNull():
@@ -124,8 +121,39 @@ class BoxCutWindow(QWidget):
             return
 
         self._clear_preview()
+        self._cut_queue.append(vals)
+        if not self._cut_running:
+            self._run_next_cut()
+
+    def _run_next_cut(self):
+        """
+        ✂️ القص في الخلفية — بدون مفتاح إلغاء: Apply سريع ثانٍ لا يلغي الأول،
+        بل ينتظر في الطابور ويُطبَّق على ناتجه (get_shape بعد set_shape).
+        """
+        if not self._cut_queue:
+            self._cut_running = False
+            return
+        vals = self._cut_queue.pop(0)
+        base_shape = self.get_shape()
+        if not base_shape or base_shape.IsNull():
+            self._cut_queue.clear()
+            self._cut_running = False
+            return
+        self._cut_running = True
+        get_executor().submit(
+            apply_box_cut, base_shape, *vals,
+            on_done=lambda result, v=vals: self._on_box_cut_done(result, v),
+            on_error=lambda err: self._run_next_cut(),
+        )
+
+    def _on_box_cut_done(self, result, vals):
+        try:
+            self._show_box_cut(result, vals)
+        finally:
+            self._run_next_cut()
 
-        result = apply_box_cut(base_shape, x, y, z, dx, dy, dz)
+    def _show_box_cut(self, result, vals):
+        x, y, z, dx, dy, dz = vals
         if not result or result.IsNull():
             print("[❌] Box cut failed")
             return
@@ -141,3 +169,13 @@ class BoxCutWindow(QWidget):
         self.display.Context.UpdateCurrentViewer()
         self.display.FitAll()
         print(f"✂️ Box cut applied at ({x}, {y}, {z}) with size ({dx}, {dy}, {dz})")
+
+        # حفظ في سجل العمليات إن وُجد
+        try:
+            for w in QApplication.topLevelWidgets():
+                if hasattr(w, "op_browser"):
+                    profile_name = getattr(w, "active_profile_name", None) or "Unnamed"
+                    w.op_browser.add_box_cut(profile_name, (x, y, z), (dx, dy, dz), shape=result)
+                    break
+        except Exception as e:
+            print(f"[OPS] إضافة العملية فشلت: {e}")
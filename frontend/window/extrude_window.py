@@ -1,6 +1,9 @@
 # frontend/window/extrude_window.py — FINAL BUILD (Y Axis + Safe Extrude + Box Cut Dimensions)
 
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QFormLayout, QLineEdit, QLabel, QPushButton, QHBoxLayout
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QFormLayout, QLineEdit, QLabel, QPushButton, QHBoxLayout, QCheckBox,
+    QComboBox, QDoubleSpinBox
+)
 from PyQt5.QtCore import Qt
 
 from OCC.Core.AIS import AIS_Shape
@@ -8,6 +11,8 @@ from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
 
 from tools.geometry_ops import extrude_shape, preview_extrude
 from tools.color_utils import display_with_fusion_style
+from tools.op_executor import get_executor
+from tools.shape_healing import heal_shape
 from tools.dimensions import (
     measure_shape,
     box_cut_reference_dimensions,
@@ -42,6 +47,22 @@ class ExtrudeWindow(QWidget):
         hlayout.addWidget(self.distance_input)
         layout.addLayout(hlayout)
 
+        # 🧭 محور الإكسترود + زاوية Draft
+        self.axis_combo = QComboBox()
+        self.axis_combo.addItems(["Y", "X", "Z", "-X", "-Y", "-Z"])
+        self.draft_input = QDoubleSpinBox()
+        self.draft_input.setRange(-45.0, 45.0)
+        self.draft_input.setSingleStep(0.5)
+        self.draft_input.setSuffix(" °")
+        form.addRow("Axis:", self.axis_combo)
+        form.addRow("Draft:", self.draft_input)
+        layout.addLayout(form)
+
+        # 🩹 تبسيط البروفايل قبل الإكسترود (أقل حواف = Boolean أسرع)
+        self.heal_checkbox = QCheckBox("Simplify profile before extrude")
+        self.heal_checkbox.setToolTip("Merge collinear edges, unify same-domain faces and fix small edges")
+        layout.addWidget(self.heal_checkbox)
+
 
 
     # ================================
@@ -49,6 +70,9 @@ class ExtrudeWindow(QWidget):
     # ================================
     def _connect_live_preview(self):
         self.distance_input.textChanged.connect(self._update_preview)
+        self.axis_combo.currentIndexChanged.connect(self._update_preview)
+        self.draft_input.valueChanged.connect(self._update_preview)
+        self.heal_checkbox.toggled.connect(self._update_preview)
 
     def _clear_preview(self):
         if self._extrude_preview_ais is not None:
@@ -75,9 +99,16 @@ class ExtrudeWindow(QWidget):
         if not base_shape or base_shape.IsNull():
             return
 
-        self._clear_preview()
+        # 🔁 أي معاينة سابقة لم تنتهِ تُلغى وتُهمل نتيجتها
+        get_executor().submit(
+            preview_extrude, base_shape, height,
+            self.axis_combo.currentText(), self.draft_input.value(),
+            heal=self.heal_checkbox.isChecked(), key="extrude_preview",
+            on_done=self._show_preview,
+        )
 
-        shape = preview_extrude(base_shape, height)
+    def _show_preview(self, shape):
+        self._clear_preview()
         if not shape or shape.IsNull():
             print("[⚠] Preview extrude shape is null — skip")
             return
@@ -115,8 +146,13 @@ class ExtrudeWindow(QWidget):
 
         self._clear_preview()
 
-        # 🧱 تنفيذ الإكسترود بمحور Y فقط
-        result = extrude_shape(base_shape, height)
+        if self.heal_checkbox.isChecked():
+            base_shape, report = heal_shape(base_shape)
+            print(f"[HEAL] Extrude profile: {report.summary()}")
+
+        # 🧱 تنفيذ الإكسترود على المحور المختار
+        axis = self.axis_combo.currentText()
+        result = extrude_shape(base_shape, height, axis, self.draft_input.value())
         if not result or result.IsNull():
             print("[❌] Extrude failed (null result)")
             return
@@ -143,4 +179,4 @@ class ExtrudeWindow(QWidget):
             print("🎯 Extrude done (camera unchanged)")
         except Exception as e:
             print(f"⚠️ Display update failed: {e}")
-        print(f"🟦 Extruded along Y by {height} mm")
+        print(f"🟦 Extruded along {axis} by {height} mm")
@@ -310,7 +310,12 @@ def create_tool_window(parent):
 
                 # 🧱 أضف العملية إلى شجرة العمليات
                 if hasattr(parent, "op_browser"):
-                    parent.op_browser.add_extrude(profile_name, distance_val, axis="Y")
+                    parent.op_browser.add_extrude(
+                        profile_name, distance_val, axis=dialog.extrude_page.axis_combo.currentText(),
+                        shape=getattr(dialog.extrude_page, "result_shape", None),
+                        draft=dialog.extrude_page.draft_input.value(),
+                        heal=dialog.extrude_page.heal_checkbox.isChecked()
+                    )
 
                 dialog.hide()
 
@@ -368,7 +373,7 @@ def create_tool_window(parent):
                 )
 
                 if hasattr(parent, "op_browser"):
-                    parent.op_browser.add_profile(name)
+                    parent.op_browser.add_profile(name, shape)
 
                 QMessageBox.information(dialog, "Saved", "Profile saved successfully.")
                 dialog.hide()
@@ -24,41 +24,13 @@ from OCC.Core.AIS import AIS_Shape
 from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
 from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeEdge
 from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeCylinder
-from OCC.Core.Bnd import Bnd_Box
+from tools.bbox_service import top_z
 
 # ============ دالة آمنة للحصول على أعلى Z للشكل متوافقة مع 7.9 ============
 def _model_top_from_shape(shape) -> float:
-    from OCC.Core.Bnd import Bnd_Box
-    box = Bnd_Box()
-    ok = False
-    try:
-        # المحاولة 1: الاسم المتاح عادة في 7.9
-        from OCC.Core.BRepBndLib import brepbndlib
-        brepbndlib.Add(shape, box, True)
-        ok = True
-    except Exception:
-        try:
-            from OCC.Core.BRepBndLib import brepbndlib_Add
-            brepbndlib_Add(shape, box, True)
-            ok = True
-        except Exception:
-            try:
-                from OCC.Core.TopExp import TopExp_Explorer
-                from OCC.Core.TopAbs import TopAbs_VERTEX
-                from OCC.Core.BRep import BRep_Tool
-                exp = TopExp_Explorer(shape, TopAbs_VERTEX)
-                count = 0
-                while exp.More():
-                    v = exp.Current()
-                    p = BRep_Tool.Pnt(v)
-                    box.Add(p)
-                    exp.Next()
-                    count += 1
-                ok = count > 0
-            except Exception:
-                ok = False
-    xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
-    return float(zmax if ok else 0.0)
+    if shape is None or shape.IsNull():
+        return 0.0
+    return float(top_z(shape))
 
 # =====================================================
 def _get_top_z_from_scene():
@@ -1,22 +1,22 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QFormLayout, QLineEdit, QComboBox,
     QPushButton, QHBoxLayout, QSpacerItem, QSizePolicy, QLabel,
-    QMessageBox, QFrame, QApplication, QDoubleSpinBox
+    QMessageBox, QFrame, QApplication, QDoubleSpinBox, QSpinBox, QCheckBox,
+    QProgressBar
 )
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt, QTimer
-from OCC.Core.AIS import AIS_Shape
-from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
 
-from tools.geometry_ops import add_hole, preview_hole
+from tools.geometry_ops import add_holes, preview_hole_geometry, preview_hole_origin
+from tools.hole_pattern import pattern_holes, fill_along_extent
+from tools.gcode_generator import HoleOp
+from tools.bbox_service import get_extents
+from tools.op_executor import get_executor
+from tools.preview_ais import ReusablePreview
+from tools.extrusion import translation
 from tools.color_utils import display_with_fusion_style
 from tools.dimensions import measure_shape, hole_reference_dimensions, hole_size_dimensions
-from frontend.window.tools_db import ToolsDB
-
-from OCC.Core.Bnd import Bnd_Box
-from OCC.Core.TopAbs import TopAbs_VERTEX
-from OCC.Core.TopExp import TopExp_Explorer
-from OCC.Core.BRep import BRep_Tool
+from tools.tool_db import ToolLibrary
 
 import os, json
 from pathlib import Path
@@ -26,42 +26,8 @@ PREFS_PATH = Path("data/hole_prefs.json")
 IMAGES_DIR = Path("tools/images")
 
 def _bbox_extents(shape):
-    try:
-        from OCC.Core.BRepBndLib import brepbndlib
-        box = Bnd_Box()
-        brepbndlib.Add(shape, box, True)
-        return box.Get()
-    except Exception:
-        pass
-    try:
-        from OCC.Core.BRepBndLib import BRepBndLib_Add
-        box = Bnd_Box()
-        try:
-            BRepBndLib_Add(shape, box, True)
-        except TypeError:
-            BRepBndLib_Add(shape, box)
-        return box.Get()
-    except Exception:
-        pass
-    try:
-        xmin = ymin = zmin = float("inf")
-        xmax = ymax = zmax = float("-inf")
-        exp = TopExp_Explorer(shape, TopAbs_VERTEX)
-        any_vertex = False
-        while exp.More():
-            v = exp.Current()
-            p = BRep_Tool.Pnt(v)
-            x, y, z = p.X(), p.Y(), p.Z()
-            xmin = min(xmin, x); ymin = min(ymin, y); zmin = min(zmin, z)
-            xmax = max(xmax, x); ymax = max(ymax, y); zmax = max(zmax, z)
-            any_vertex = True
-            exp.Next()
-        if any_vertex:
-            return (xmin, ymin, zmin, xmax, ymax, zmax)
-    except Exception:
-        pass
-    print("[BBOX] ⚠️ Failed to compute bbox.")
-    return (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    """حدود الشكل عبر خدمة الـ bbox المشتركة (محسوبة مرة واحدة لكل شكل)."""
+    return get_extents(shape)
 
 SAFE_A_CLEARANCE = 30.0
 
@@ -72,6 +38,7 @@ class HoleWindow(QWidget):
         self.get_shape = shape_getter
         self.set_shape = shape_setter
         self._hole_preview_ais = None
+        self._preview = ReusablePreview(display, color=(1.0, 0.0, 0.0), transparency=0.5)
         self._preview_dim_shapes = []
         self._last_tool_id = None
 
@@ -88,7 +55,11 @@ class HoleWindow(QWidget):
         self.tool_combo = QComboBox()
         btn_refresh = QPushButton("↻ Refresh")
         btn_refresh.clicked.connect(self._load_tools)
+        self.auto_tool_check = QCheckBox("Auto")
+        self.auto_tool_check.setChecked(True)
+        self.auto_tool_check.setToolTip("Pick the best tool for the hole diameter and depth")
         top_tools_layout.addWidget(self.tool_combo)
+        top_tools_layout.addWidget(self.auto_tool_check)
         top_tools_layout.addWidget(btn_refresh)
         form.addRow("Tool:", top_tools_layout)
 
@@ -123,6 +94,44 @@ class HoleWindow(QWidget):
         form.addRow("Preview Length:", self.preview_len_input)
         form.addRow("Spindle Angle (A):", self.angle_a_combo)
         form.addRow("Safe Clearance:", self.clearance_input)
+
+        # 🧩 نمط الثقوب (عملية واحدة لعدة ثقوب)
+        self.pattern_combo = QComboBox()
+        self.pattern_combo.addItem("Single Hole", None)
+        self.pattern_combo.addItem("Linear", "linear")
+        self.pattern_combo.addItem("Grid", "grid")
+        self.pattern_combo.addItem("Along Length", "along")
+        self.pattern_dir_combo = QComboBox()
+        self.pattern_dir_combo.addItems(["X", "Y", "Z"])
+        self.pattern_count = QSpinBox()
+        self.pattern_count.setRange(1, 10000)
+        self.pattern_count.setValue(2)
+        self.pattern_pitch = QDoubleSpinBox()
+        self.pattern_pitch.setRange(0.1, 100000.0)
+        self.pattern_pitch.setValue(30.0)
+        self.pattern_pitch.setSuffix(" mm")
+        self.pattern_dir2_combo = QComboBox()
+        self.pattern_dir2_combo.addItems(["Y", "X", "Z"])
+        self.pattern_count2 = QSpinBox()
+        self.pattern_count2.setRange(1, 10000)
+        self.pattern_count2.setValue(1)
+        self.pattern_pitch2 = QDoubleSpinBox()
+        self.pattern_pitch2.setRange(0.1, 100000.0)
+        self.pattern_pitch2.setValue(30.0)
+        self.pattern_pitch2.setSuffix(" mm")
+        self.pattern_margin = QDoubleSpinBox()
+        self.pattern_margin.setRange(0.0, 100000.0)
+        self.pattern_margin.setValue(20.0)
+        self.pattern_margin.setSuffix(" mm")
+
+        form.addRow("Pattern:", self.pattern_combo)
+        form.addRow("Direction:", self.pattern_dir_combo)
+        form.addRow("Count:", self.pattern_count)
+        form.addRow("Pitch:", self.pattern_pitch)
+        form.addRow("Direction 2:", self.pattern_dir2_combo)
+        form.addRow("Count 2:", self.pattern_count2)
+        form.addRow("Pitch 2:", self.pattern_pitch2)
+        form.addRow("End Margin:", self.pattern_margin)
         layout.addLayout(form)
 
         self.preview_btn = QPushButton("Preview Hole")
@@ -134,6 +143,11 @@ class HoleWindow(QWidget):
         btn_row.addWidget(self.apply_btn)
         btn_row.addWidget(self.center_btn)
         layout.addLayout(btn_row)
+
+        # ⏳ تقدّم القص في الخلفية (يظهر أثناء Apply فقط)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
         self.setLayout(layout)
 
         self.preview_btn.clicked.connect(self._update_preview)
@@ -148,6 +162,10 @@ class HoleWindow(QWidget):
         ):
             w.textChanged.connect(self._update_preview)
         self.angle_a_combo.currentIndexChanged.connect(self._update_preview)
+        self.dia_input.textChanged.connect(self._auto_pick_tool)
+        self.depth_input.textChanged.connect(self._auto_pick_tool)
+        self.tool_combo.currentIndexChanged.connect(
+            lambda _i: self._show_tool_image(self.tool_combo.currentData() or {}))
         self.clearance_input.valueChanged.connect(self._update_preview)
 
     def _get_values(self):
@@ -168,20 +186,64 @@ class HoleWindow(QWidget):
         except ValueError:
             return None
 
+    def _pattern_params(self, cx, cy, cz, dia, depth, axis, base_shape):
+        """معاملات النمط المختار، أو None للثقب المفرد."""
+        kind = self.pattern_combo.currentData()
+        if not kind:
+            return None
+        params = {
+            "kind": kind,
+            "x": cx, "y": cy, "z": cz,
+            "dia": dia, "depth": depth, "axis": axis,
+            "count": self.pattern_count.value(),
+            "pitch": self.pattern_pitch.value(),
+            "direction": self.pattern_dir_combo.currentText(),
+            "count2": self.pattern_count2.value(),
+            "pitch2": self.pattern_pitch2.value(),
+            "direction2": self.pattern_dir2_combo.currentText(),
+            "margin": self.pattern_margin.value(),
+        }
+        if kind == "along":
+            params = fill_along_extent(params, base_shape)
+        return params
+
     def _load_tools(self):
-        """تحميل أدوات الحفر من قاعدة البيانات وعرض الصور."""
+        """تحميل أدوات الحفر فقط (استعلام مفهرس حسب النوع) وعرض الصور."""
         try:
-            db = ToolsDB()
-            tools = db.list_tools()
+            self._tool_lib = ToolLibrary()
+            tools = self._tool_lib.tools_for_holes()
+            self.tool_combo.blockSignals(True)
             self.tool_combo.clear()
             for t in tools:
-                display_name = f"{t['name']} ⌀{t['diameter']}mm"
-                self.tool_combo.addItem(display_name, t)
+                display_name = f"{t.name} ⌀{t.diameter}mm"
+                self.tool_combo.addItem(display_name, t.as_dict())
+            self.tool_combo.blockSignals(False)
             if tools:
-                self._show_tool_image(tools[0])
+                self._show_tool_image(tools[0].as_dict())
+            self._auto_pick_tool()
         except Exception as e:
             print(f"[TOOLS] فشل تحميل الأدوات: {e}")
 
+    def _auto_pick_tool(self):
+        """اختيار أفضل أداة للقطر/العمق الحاليين عبر best_tool_for_hole (بدون مسح الجدول)."""
+        if not self.auto_tool_check.isChecked() or getattr(self, "_tool_lib", None) is None:
+            return
+        try:
+            dia = float(self.dia_input.text())
+            depth = float(self.depth_input.text())
+        except ValueError:
+            return
+        best = self._tool_lib.best_tool_for_hole(dia, depth)
+        if best is None:
+            return
+        for i in range(self.tool_combo.count()):
+            tool = self.tool_combo.itemData(i)
+            if tool and tool.get("id") == best.id:
+                if i != self.tool_combo.currentIndex():
+                    self.tool_combo.setCurrentIndex(i)
+                    print(f"[TOOLS] 🎯 Auto tool for ⌀{dia} ⬇{depth}: {best.name}")
+                break
+
     def _show_tool_image(self, tool):
         """عرض صورة الأداة المحددة."""
         try:
@@ -277,26 +339,18 @@ class HoleWindow(QWidget):
 
             print(f"[PREVIEW] A=-90° → -X, side={side:.2f}, cx={cx:.2f}")
 
-        # 🧹 تنظيف المعاينة السابقة
-        try:
-            if self._hole_preview_ais:
-                self.display.Context.Erase(self._hole_preview_ais, False)
-        except Exception:
-            pass
-        self._hole_preview_ais = None
-
-        # 🧱 إنشاء الشكل التمهيدي للمعاينة
-        hole_shape = preview_hole(base_shape, cx, cy, cz, dia, axis, preview_len)
-        if not hole_shape or hole_shape.IsNull():
+        # 🧱 المعاينة: الأسطوانة تُبنى فقط عند تغيّر القطر/الطول/المحور،
+        # وتغيير الموضع يحرّك نفس كائن الـ AIS بتحويل فقط
+        px, py, pz = preview_hole_origin(base_shape, cx, cy, cz)
+        shown = self._preview.show(
+            (round(dia, 4), axis, round(preview_len, 4)),
+            lambda: preview_hole_geometry(dia, axis, preview_len),
+            translation(px, py, pz),
+        )
+        if not shown:
             print("[PREVIEW] ⚠️ فشل إنشاء شكل المعاينة.")
             return
-
-        # 🎨 عرض المعاينة باللون الأحمر الشفاف
-        ais = AIS_Shape(hole_shape)
-        ais.SetColor(Quantity_Color(1.0, 0.0, 0.0, Quantity_TOC_RGB))
-        ais.SetTransparency(0.5)
-        self.display.Context.Display(ais, False)
-        self._hole_preview_ais = ais
+        self._hole_preview_ais = self._preview.ais
 
         self.display.Context.UpdateCurrentViewer()
         print(f"[PREVIEW] ✅ Angle={a_angle}°, Axis={axis}, Clearance={clearance:.1f}mm, Len={preview_len:.1f}mm")
@@ -348,46 +402,8 @@ class HoleWindow(QWidget):
                 axis = "X"
                 print(f"[A-90] left side={side_left:.3f}  -> center.x={cx:.3f}  (dir -X)")
 
-            # 🧱 إنشاء الثقب (Boolean cut) بمركز واتجاه صحيحين
-            result = add_hole(base_shape, cx, cy, cz, dia, axis, depth=depth)
-            if not result or result.IsNull():
-                print("[❌] add_hole أرجعت نتيجة فارغة.")
-                return None
-
-            # تنظيف أي معاينة قديمة
-            try:
-                if self._hole_preview_ais:
-                    self.display.Context.Erase(self._hole_preview_ais, False)
-                    self._hole_preview_ais = None
-            except Exception:
-                pass
-            self._preview_dim_shapes.clear()
-
-            # عرض الشكل الجديد
-            self.set_shape(result)
-            display_with_fusion_style(result, self.display)
-            measure_shape(self.display, result)
-            self.display.Context.UpdateCurrentViewer()
-            self.display.Repaint()
-
-            print(f"🧱 Hole applied: A={a_angle}°, axis={axis}, dia={dia}, depth={depth}, "
-                  f"center=({cx:.3f},{cy:.3f},{cz:.3f})")
             print(f"[BBOX] xmin={xmin:.3f} xmax={xmax:.3f}  zmax={zmax:.3f}  RIGHT_IS_XMIN={RIGHT_IS_XMIN}")
-
-            # حفظ في سجل العمليات إن وُجد
-            try:
-                for w in QApplication.topLevelWidgets():
-                    if hasattr(w, "op_browser"):
-                        profile_name = getattr(w, "active_profile_name", "Unnamed")
-                        w.op_browser.add_hole(
-                            profile_name, (cx, cy, cz), dia, depth, axis,
-                            tool=(tool['name'] if tool else None)
-                        )
-                        break
-            except Exception as e:
-                print(f"[OPS] إضافة العملية فشلت: {e}")
-
-            return {
+            info = {
                 "type": "Hole",
                 "x": cx, "y": cy, "z": cz,
                 "dia": dia, "depth": depth,
@@ -396,10 +412,82 @@ class HoleWindow(QWidget):
                 "tool": tool["name"] if tool else "Unknown"
             }
 
+            # 🧩 نمط: كل الثقوب تُولَّد دفعة واحدة وتُسجَّل كعملية واحدة
+            pattern = self._pattern_params(cx, cy, cz, dia, depth, axis, base_shape)
+            if pattern is not None:
+                info = dict(pattern, type="Pattern", A=a_angle,
+                            tool=tool["name"] if tool else "Unknown")
+                holes = pattern_holes(pattern)
+                if not holes:
+                    QMessageBox.warning(self, "Hole", "⚠️ النمط لا يحتوي أي ثقب.")
+                    return None
+            else:
+                holes = [HoleOp(cx, cy, cz, dia, depth, axis)]
+
+            # 🧱 إنشاء الثقب (Boolean cut) في الخلفية — عبر القص المجمّع
+            self.apply_btn.setEnabled(False)
+            get_executor().submit(
+                add_holes, base_shape, holes,
+                progress=True, progress_bar=self.progress_bar,
+                on_done=lambda result: self._on_hole_applied(result, info, tool),
+                on_error=lambda err: self._on_hole_failed(err),
+            )
+            return info
+
         except Exception as e:
             print(f"[❌ APPLY] فشل تطبيق الثقب: {e}")
             return None
 
+    def _on_hole_applied(self, result, info, tool):
+        """يُستدعى على خيط الواجهة بعد انتهاء القص في الخلفية."""
+        self.apply_btn.setEnabled(True)
+        if not result or result.IsNull():
+            print("[❌] add_holes أرجعت نتيجة فارغة.")
+            return
+
+        # تنظيف أي معاينة قديمة
+        self._preview.reset()
+        self._hole_preview_ais = None
+        self._preview_dim_shapes.clear()
+
+        # عرض الشكل الجديد
+        self.set_shape(result)
+        display_with_fusion_style(result, self.display)
+        measure_shape(self.display, result)
+        self.display.Context.UpdateCurrentViewer()
+        self.display.Repaint()
+
+        cx, cy, cz = info["x"], info["y"], info["z"]
+        dia, depth, axis = info["dia"], info["depth"], info["axis"]
+        print(f"🧱 {info['type']} applied: A={info['A']}°, axis={axis}, dia={dia}, depth={depth}, "
+              f"center=({cx:.3f},{cy:.3f},{cz:.3f})")
+
+        # حفظ في سجل العمليات إن وُجد
+        try:
+            for w in QApplication.topLevelWidgets():
+                if hasattr(w, "op_browser"):
+                    profile_name = getattr(w, "active_profile_name", "Unnamed")
+                    if info["type"] == "Pattern":
+                        params = {k: v for k, v in info.items() if k not in ("type", "A", "tool")}
+                        w.op_browser.add_pattern(
+                            profile_name, params,
+                            tool=(tool['name'] if tool else None),
+                            shape=result
+                        )
+                    else:
+                        w.op_browser.add_hole(
+                            profile_name, (cx, cy, cz), dia, depth, axis,
+                            tool=(tool['name'] if tool else None),
+                            shape=result
+                        )
+                    break
+        except Exception as e:
+            print(f"[OPS] إضافة العملية فشلت: {e}")
+
+    def _on_hole_failed(self, error):
+        self.apply_btn.setEnabled(True)
+        print(f"[❌ APPLY] فشل تطبيق الثقب: {error}")
+
     def _center_view(self):
         try:
             if hasattr(self.display, "FitAll"): self.display.FitAll()
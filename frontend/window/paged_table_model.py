@@ -0,0 +1,144 @@
+# frontend/window/paged_table_model.py — جدول افتراضي (Model/View) فوق استعلام مقسّم لصفحات
+"""
+بدل QTableWidget يُعاد بناؤه بالكامل مع QLabel و QPushButton لكل صف:
+- rowCount من COUNT(*) فقط، والصفوف تُجلب صفحةً صفحة (LIMIT/OFFSET) عند ظهورها في العرض
+- آخر MAX_PAGES صفحات فقط في الذاكرة (LRU) → ذاكرة ثابتة مهما كبر الجدول
+- الصور المصغرة تُحمّل عند أول رسم للخلية وتُحفظ في QPixmapCache (محدود الحجم)
+"""
+
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant, QSize
+from PyQt5.QtGui import QPixmap, QPixmapCache, QColor
+from PyQt5.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+
+PAGE_SIZE = 200
+MAX_PAGES = 8
+THUMB_SIZE = 48
+
+
+def cached_thumbnail_pixmap(path: str, size: int = THUMB_SIZE):
+    """QPixmap مصغّر من القرص مرة واحدة ثم من QPixmapCache."""
+    if not path:
+        return None
+    key = f"thumb:{size}:{path}"
+    pix = QPixmapCache.find(key)
+    if pix is None or pix.isNull():
+        pix = QPixmap(path)
+        if pix.isNull():
+            return None
+        pix = pix.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        QPixmapCache.insert(key, pix)
+    return pix
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    count_fn() -> int
+    fetch_fn(offset, limit) -> [dict, ...]
+    columns: [(key, header), ...] — key=None لعمود إجراء (نص ثابت من action_text)
+    """
+
+    def __init__(self, count_fn, fetch_fn, columns, image_key=None, action_text=None,
+                 action_color: str = "#d32f2f", page_size: int = PAGE_SIZE,
+                 thumb_size: int = THUMB_SIZE, parent=None):
+        super().__init__(parent)
+        self._count_fn = count_fn
+        self._fetch_fn = fetch_fn
+        self._columns = list(columns)
+        self._image_key = image_key
+        self._action_text = action_text
+        self._action_color = QColor(action_color)
+        self._page_size = page_size
+        self._thumb_size = thumb_size
+        self._pages = OrderedDict()
+        self._count = 0
+        self.reload()
+
+    # ---------- البيانات ----------
+    def reload(self):
+        """إعادة العد ومسح الصفحات المحمّلة — الصفوف الظاهرة فقط تُجلب من جديد."""
+        self.beginResetModel()
+        self._pages.clear()
+        self._count = int(self._count_fn() or 0)
+        self.endResetModel()
+
+    def _page(self, number: int):
+        page = self._pages.get(number)
+        if page is None:
+            page = self._fetch_fn(number * self._page_size, self._page_size) or []
+            self._pages[number] = page
+            while len(self._pages) > MAX_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(number)
+        return page
+
+    def row_data(self, row: int):
+        if row < 0 or row >= self._count:
+            return None
+        page = self._page(row // self._page_size)
+        offset = row % self._page_size
+        return page[offset] if offset < len(page) else None
+
+    def column_key(self, column: int):
+        return self._columns[column][0]
+
+    # ---------- واجهة Qt ----------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._columns[section][1]
+        return QVariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        key = self.column_key(index.column())
+
+        if key is None:  # عمود إجراء (حذف / تحميل)
+            if role == Qt.DisplayRole:
+                return self._action_text
+            if role == Qt.ForegroundRole:
+                return self._action_color
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+            return QVariant()
+
+        row = self.row_data(index.row())
+        if row is None:
+            return QVariant()
+
+        if key == self._image_key:
+            if role == Qt.DecorationRole:
+                pix = cached_thumbnail_pixmap(row.get(key) or "", self._thumb_size)
+                return pix if pix is not None else QVariant()
+            if role == Qt.DisplayRole and not row.get(key):
+                return "—"
+            return QVariant()
+
+        if role == Qt.DisplayRole:
+            value = row.get(key)
+            return "" if value is None else str(value)
+        return QVariant()
+
+
+def make_paged_view(model: PagedTableModel, row_height: int = THUMB_SIZE + 4) -> QTableView:
+    """QTableView بارتفاع صف ثابت — Qt يسأل النموذج عن الصفوف الظاهرة فقط."""
+    view = QTableView()
+    view.setModel(model)
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    view.setSelectionMode(QAbstractItemView.SingleSelection)
+    view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    view.setIconSize(QSize(row_height - 4, row_height - 4))
+    vh = view.verticalHeader()
+    vh.setSectionResizeMode(QHeaderView.Fixed)
+    vh.setDefaultSectionSize(row_height)
+    vh.hide()
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    return view
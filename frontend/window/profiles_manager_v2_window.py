@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QListWidget, QLabel, QSizePolicy,
-    QPushButton, QMessageBox
+    QPushButton, QMessageBox, QLineEdit
 )
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
@@ -17,11 +17,19 @@ def create_profile_manager_page_v2(parent, profile_page_getter=None, stacked_get
     root.setContentsMargins(10, 10, 10, 10)
     root.setSpacing(14)
 
-    # ---------- قائمة الأسماء ----------
+    # ---------- بحث + قائمة الأسماء ----------
+    list_container = QWidget()
+    list_container.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+    list_layout = QVBoxLayout(list_container)
+    list_layout.setContentsMargins(0, 0, 0, 0)
+    search_box = QLineEdit()
+    search_box.setPlaceholderText("🔎 name / code / 60x60 slot 8")
+    search_box.setClearButtonEnabled(True)
+    list_layout.addWidget(search_box)
     profile_list = QListWidget()
     profile_list.setMinimumWidth(200)
-    profile_list.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
-    root.addWidget(profile_list, alignment=Qt.AlignRight)
+    list_layout.addWidget(profile_list)
+    root.addWidget(list_container, alignment=Qt.AlignRight)
 
     # ---------- تفاصيل ----------
     left_container = QWidget()
@@ -55,12 +63,15 @@ def create_profile_manager_page_v2(parent, profile_page_getter=None, stacked_get
     root.addWidget(left_container, alignment=Qt.AlignLeft)
 
     page.profile_list = profile_list
+    page.search_box = search_box
     page.image_label = image_label
     page.lbl_name = lbl_name
     page.lbl_code = lbl_code
     page.lbl_size = lbl_size
     page.lbl_desc = lbl_desc
     page.selected = {"dxf": None, "pid": None, "name": None, "img": None}
+    # نسخة واحدة للصفحة — الإنشاء يعيد فحص المخطط والفهارس و FTS
+    page.db = ProfileDB()
 
     # ======================================================
     #  🧹 أداة مسح آمنة لكائنات AIS
@@ -79,14 +90,15 @@ def create_profile_manager_page_v2(parent, profile_page_getter=None, stacked_get
     # ---------- تحديث القائمة ----------
     def refresh_profiles_list_v2():
         page.profile_list.clear()
-        db_local = ProfileDB()
-        profiles = db_local.list_profiles() or []
+        # البحث في قاعدة البيانات (فهارس + FTS5) بدل التصفية في Python
+        profiles = page.db.quick_search(search_box.text()) or []
         page.profiles = profiles
         for prof in profiles:
             page.profile_list.addItem(prof[1])
         print("[DEBUG] Profile list refreshed (v2). count =", len(profiles))
 
     page.refresh_profiles_list_v2 = refresh_profiles_list_v2
+    search_box.textChanged.connect(lambda _text: refresh_profiles_list_v2())
 
     # ---------- عند اختيار عنصر ----------
     def on_select(row):
@@ -123,14 +135,11 @@ def create_profile_manager_page_v2(parent, profile_page_getter=None, stacked_get
             if shape is None:
                 raise RuntimeError("DXF returned no shape.")
 
-            from OCC.Core.Bnd import Bnd_Box
-            from OCC.Core.BRepBndLib import brepbndlib
             from OCC.Core.gp import gp_Trsf, gp_Vec
             from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Transform
+            from tools.bbox_service import get_extents
 
-            bbox = Bnd_Box()
-            brepbndlib.Add(shape, bbox)
-            xmin, ymin, zmin, xmax, ymax, zmax = bbox.Get()
+            xmin, ymin, zmin, xmax, ymax, zmax = get_extents(shape)
 
             trsf = gp_Trsf()
             trsf.SetTranslation(gp_Vec(-xmin, -ymin, -zmin))
@@ -178,15 +187,11 @@ def create_profile_manager_page_v2(parent, profile_page_getter=None, stacked_get
                 print(f"⚠️ Failed to register active profile (v2): {e}")
 
             # ✨ قياسات X + Z (تبقى كما هي)
-            from OCC.Core.Bnd import Bnd_Box
-            from OCC.Core.BRepBndLib import brepbndlib
             from OCC.Core.gp import gp_Pnt
             from tools.dimensions import draw_dimension
             from math import isclose
 
-            bbox = Bnd_Box()
-            brepbndlib.Add(shape, bbox)
-            xmin, ymin, zmin, xmax, ymax, zmax = bbox.Get()
+            xmin, ymin, zmin, xmax, ymax, zmax = get_extents(shape)
             x_len = xmax - xmin
             z_len = zmax - zmin
 
@@ -210,7 +215,7 @@ def create_profile_manager_page_v2(parent, profile_page_getter=None, stacked_get
 
             if hasattr(main_window, "op_browser"):
                 profile_name = Path(dxf).stem
-                main_window.op_browser.add_profile(profile_name)
+                main_window.op_browser.add_profile(profile_name, shape=shape)
                 print(f"[DEBUG] Added profile to browser: {profile_name}")
 
         except Exception as e:
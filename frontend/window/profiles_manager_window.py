@@ -1,8 +1,15 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QLabel, QGridLayout, QPushButton, QFrame, QMessageBox
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QMessageBox
 from pathlib import Path
-from .utils_window import safe_exists
+from .paged_table_model import PagedTableModel, make_paged_view
+
+PROFILE_COLUMNS = [
+    ("image_path", ""),
+    ("name", "Name"),
+    ("code", "Code"),
+    ("dimensions", "Dims"),
+    ("notes", "Notes"),
+    (None, ""),          # عمود التحميل
+]
 
 class ProfilesManagerWindow(QWidget):
 
@@ -25,65 +32,51 @@ class ProfilesManagerWindow(QWidget):
 
     def _build_ui(self):
         layout = QVBoxLayout(self)
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        layout.addWidget(scroll)
-        container = QWidget()
-        scroll.setWidget(container)
-        grid = QGridLayout(container)
 
         from tools.database import ProfileDB
         self._db = ProfileDB()
 
-        def _make_loader(dxf_path_local, profile_name):
-            def _loader():
-                try:
-                    shape = self._load_dxf(Path(dxf_path_local))
-                    mwin = self._main_parent
-                    mwin.display.EraseAll()
-                    mwin.display.DisplayShape(shape, update=True)
-                    mwin.loaded_shape = shape
-                    mwin.display.FitAll()
-                    if hasattr(mwin, "op_browser"):
-                        mwin.op_browser.add_profile(profile_name)
-                except Exception as e:
-                    QMessageBox.critical(self, "Load Error", str(e))
-            return _loader
+        def _load_profile(dxf_path_local, profile_name):
+            try:
+                shape = self._load_dxf(Path(dxf_path_local))
+                mwin = self._main_parent
+                mwin.display.EraseAll()
+                mwin.display.DisplayShape(shape, update=True)
+                mwin.loaded_shape = shape
+                mwin.display.FitAll()
+                if hasattr(mwin, "op_browser"):
+                    mwin.op_browser.add_profile(profile_name, shape=shape)
+            except Exception as e:
+                QMessageBox.critical(self, "Load Error", str(e))
 
-        def refresh_profiles_list():
-            # مسح الموجودين
-            while grid.count():
-                item = grid.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-
-            profiles = self._db.list_profiles()
-            if not profiles:
-                grid.addWidget(QLabel("لا توجد بروفايلات."), 0, 0)
+        # جدول افتراضي: الصفوف تُجلب صفحةً صفحة والصور تُحمّل عند ظهورها فقط
+        self._model = PagedTableModel(
+            self._db.count_profiles, self._db.list_profiles_page, PROFILE_COLUMNS,
+            image_key="image_path", action_text="Load", action_color="#0078d4",
+            thumb_size=64, parent=self,
+        )
+        table = make_paged_view(self._model, row_height=68)
+        layout.addWidget(table)
+
+        empty_label = QLabel("لا توجد بروفايلات.")
+        layout.addWidget(empty_label)
+
+        def on_click(index):
+            if self._model.column_key(index.column()) is not None:
                 return
+            row = self._model.row_data(index.row())
+            if row:
+                _load_profile(row["dxf_path"], row["name"])
+
+        table.clicked.connect(on_click)
+
+        def refresh_profiles_list():
+            self._model.reload()
+            empty_label.setVisible(self._model.rowCount() == 0)
 
-            for row_idx, prof in enumerate(profiles):
-                pid, name, code, dims, notes, dxf_path, brep, img, created = prof
-                img_label = QLabel()
-                img_label.setFixedSize(64, 64)
-                img_label.setFrameShape(QFrame.Box)
-                if safe_exists(img):
-                    pix = QPixmap(img).scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    img_label.setPixmap(pix)
-                else:
-                    img_label.setText("No\nImage")
-                    img_label.setAlignment(Qt.AlignCenter)
-
-                text = QLabel(f"{name}\nCode: {code}\nDims: {dims}\n{notes}")
-                text.setWordWrap(True)
-                load_btn = QPushButton("Load")
-                load_btn.clicked.connect(_make_loader(dxf_path, name))
-
-                grid.addWidget(img_label, row_idx, 0)
-                grid.addWidget(text, row_idx, 1)
-                grid.addWidget(load_btn, row_idx, 2)
+        refresh_profiles_list()
 
         # حفظ المراجع للوصول منها من floating_window
-        self._grid = grid
+        self._table = table
         self.refresh_profiles_list = refresh_profiles_list
         print("[DEBUG] ProfilesManagerWindow init end")
@@ -17,12 +17,8 @@ from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QPixmap, QImage, QPainter, QFont, QColor
 
 from OCC.Core.TopoDS import TopoDS_Shape
-from OCC.Core.gp import gp_Vec, gp_Trsf, gp_Ax1, gp_Dir, gp_Pnt
-from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakePrism
+from OCC.Core.gp import gp_Trsf, gp_Pnt
 from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Transform
-from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut
-from OCC.Core.Bnd import Bnd_Box
-from OCC.Core.BRepBndLib import brepbndlib
 from OCC.Core.AIS import AIS_Shape
 from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
 
@@ -31,63 +27,55 @@ from os.path import basename, dirname, join, splitext, exists
 
 import json
 from dxf_loader import smart_load_dxf
+from tools import bbox_service
+from tools.op_executor import get_executor
+from tools.boolean_ops import cut
+from tools import extrusion
+from tools.library_loader import LibraryLoader
+from tools.shape_library import ShapeLibrary, read_entry_metadata
+from tools.thumbnail_cache import cached_thumbnail, render_thumbnail
+from tools.thumbnail_loader import ThumbnailCache
 
 # للمعاينة التلقائية في العارض الرئيسي (ليست للعارض المصغّر)
 from frontend.window.shape_auto_preview import safe_auto_preview, connect_auto_preview
 
+# 🩹 تبسيط البروفايلات عند تحميل المكتبة (دمج المستقيمات + BSpline + UnifySameDomain)
+HEAL_IMPORTED_PROFILES = False
+
 
 # ===============================
 # هندسة مساعدة (كما كانت لديك)
 # ===============================
 
 def orient_shape_to_axis(shape: TopoDS_Shape, axis: str) -> TopoDS_Shape:
-    trsf = gp_Trsf()
+    # دوران صلب → Location فقط (بدون نسخ الـ topology)
     if axis.upper() == 'X':
-        trsf.SetRotation(gp_Ax1(gp_Pnt(0, 0, 0), gp_Dir(0, 1, 0)), -1.5708)
+        return extrusion.placed(shape, extrusion.rotation('Y', -90.0))
     elif axis.upper() == 'Y':
-        trsf.SetRotation(gp_Ax1(gp_Pnt(0, 0, 0), gp_Dir(1, 0, 0)), 1.5708)
-    return BRepBuilderAPI_Transform(shape, trsf, True).Shape()
+        return extrusion.placed(shape, extrusion.rotation('X', 90.0))
+    return shape
 
 
 def extrude_shape(shape_2d: TopoDS_Shape, depth: float, axis: str) -> TopoDS_Shape:
     # تُبقي دوران الشكل كما هو (حسب منطقك الحالي) ثم تمده باتجاه المحور
     shape_oriented = orient_shape_to_axis(shape_2d, axis)
-    axis_map = {
-        'X': gp_Vec(depth, 0, 0),
-        'Y': gp_Vec(0, depth, 0),
-        'Z': gp_Vec(0, 0, depth)
-    }
-    vec = axis_map.get(axis.upper(), gp_Vec(0, 0, depth))
-    return BRepPrimAPI_MakePrism(shape_oriented, vec).Shape()
+    direction = axis.upper() if axis.upper() in ('X', 'Y', 'Z') else 'Z'
+    return extrusion.extrude(shape_oriented, depth, direction)
 
 
 def translate_shape(shape: TopoDS_Shape, x: float, y: float, z: float) -> TopoDS_Shape:
-    trsf = gp_Trsf()
-    trsf.SetTranslation(gp_Vec(x, y, z))
-    return BRepBuilderAPI_Transform(shape, trsf, True).Shape()
+    return extrusion.place(shape, x, y, z)
 
 
 def rotate_shape(shape: TopoDS_Shape, axis: str, angle_deg: float) -> TopoDS_Shape:
-    angle_rad = angle_deg * 3.14159265 / 180.0
-    trsf = gp_Trsf()
-    axis_map = {
-        'X': gp_Ax1(gp_Pnt(0, 0, 0), gp_Dir(1, 0, 0)),
-        'Y': gp_Ax1(gp_Pnt(0, 0, 0), gp_Dir(0, 1, 0)),
-        'Z': gp_Ax1(gp_Pnt(0, 0, 0), gp_Dir(0, 0, 1)),
-    }
-    ax = axis_map.get(axis.upper())
-    if ax is None:
+    if axis.upper() not in ('X', 'Y', 'Z'):
         print(f"❌ محور غير معروف: {axis}")
         return shape
-    trsf.SetRotation(ax, angle_rad)
-    return BRepBuilderAPI_Transform(shape, trsf, True).Shape()
+    return extrusion.placed(shape, extrusion.rotation(axis, angle_deg))
 
 
 def get_shape_center(shape: TopoDS_Shape) -> gp_Pnt:
-    box = Bnd_Box()
-    brepbndlib.Add(shape, box)
-    xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
-    return gp_Pnt((xmin + xmax) / 2, (ymin + ymax) / 2, (zmin + zmax) / 2)
+    return gp_Pnt(*bbox_service.center(shape))
 
 
 def scale_shape(shape: TopoDS_Shape, factor: float) -> TopoDS_Shape:
@@ -98,23 +86,11 @@ def scale_shape(shape: TopoDS_Shape, factor: float) -> TopoDS_Shape:
 
 
 def get_shape_size(shape: TopoDS_Shape, axis: str) -> float:
-    box = Bnd_Box()
-    brepbndlib.Add(shape, box)
-    xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
-    if axis.upper() == "X":
-        return xmax - xmin
-    elif axis.upper() == "Y":
-        return ymax - ymin
-    elif axis.upper() == "Z":
-        return zmax - zmin
-    return 0
+    return bbox_service.size_along(shape, axis)
 
 
 def get_z_min(shape: TopoDS_Shape) -> float:
-    box = Bnd_Box()
-    brepbndlib.Add(shape, box)
-    _, _, zmin, _, _, _ = box.Get()
-    return zmin
+    return bbox_service.z_min(shape)
 
 
 def show_shape(display, shape: TopoDS_Shape):
@@ -163,18 +139,14 @@ def preview_extrude(page, display):
 
         # توسيط 2D حول الأصل
         center = get_shape_center(page.shape_2d)
-        trsf = gp_Trsf()
-        trsf.SetTranslation(gp_Vec(-center.X(), -center.Y(), -center.Z()))
-        shape_centered = BRepBuilderAPI_Transform(page.shape_2d, trsf, True).Shape()
+        shape_centered = extrusion.place(page.shape_2d, -center.X(), -center.Y(), -center.Z())
 
         # إنشاء 3D
         shape_3d = extrude_shape(shape_centered, depth, axis)
 
         # توسيط 3D النهائي حول الأصل
         center3d = get_shape_center(shape_3d)
-        trsf_center = gp_Trsf()
-        trsf_center.SetTranslation(gp_Vec(-center3d.X(), -center3d.Y(), -center3d.Z()))
-        shape_3d = BRepBuilderAPI_Transform(shape_3d, trsf_center, True).Shape()
+        shape_3d = extrusion.place(shape_3d, -center3d.X(), -center3d.Y(), -center3d.Z())
 
         print(f"[Centering] ΔX={center3d.X():.3f}, ΔY={center3d.Y():.3f}, ΔZ={center3d.Z():.3f}")
 
@@ -215,8 +187,48 @@ def apply_cut_core(parent, page):
             print("❌ لا يوجد شكل Base صالح للقص.")
             return
 
-        # عملية القص
-        result = BRepAlgoAPI_Cut(base, cutter).Shape()
+        if not hasattr(page, "cut_queue"):
+            page.cut_queue = []
+        page.cut_queue.append(cutter)
+        if not getattr(page, "cut_running", False):
+            _run_next_cut(parent, page)
+
+    except Exception as e:
+        print(f"🔥 كراش أثناء تنفيذ عملية القص: {e}")
+
+
+def _run_next_cut(parent, page):
+    """
+    عملية القص في الخلفية — العرض يتم عند انتهاءها على خيط الواجهة.
+    بدون مفتاح إلغاء: القصات تُنفَّذ بالتسلسل وكل واحدة على parent.loaded_shape بعد السابقة.
+    """
+    if not page.cut_queue:
+        page.cut_running = False
+        return
+    cutter = page.cut_queue.pop(0)
+    base = getattr(parent, "loaded_shape", None)
+    if base is None or base.IsNull():
+        page.cut_queue.clear()
+        page.cut_running = False
+        return
+    page.cut_running = True
+
+    def finished(result):
+        try:
+            _show_cut_result(parent, result)
+        finally:
+            _run_next_cut(parent, page)
+
+    get_executor().submit(cut, base, cutter, on_done=finished,
+                          on_error=lambda err: _run_next_cut(parent, page),
+                          progress=True, progress_bar=getattr(page, "load_progress", None))
+
+
+def _show_cut_result(parent, result):
+    try:
+        if result is None or result.IsNull():
+            print("❌ نتيجة القص فارغة.")
+            return
         parent.loaded_shape = result
 
         # عرض النتيجة في العارض الرئيسي
@@ -235,7 +247,7 @@ def apply_cut_core(parent, page):
         print("✅ تم تنفيذ القص وعرض النتيجة بلون Fusion.")
 
     except Exception as e:
-        print(f"🔥 كراش أثناء تنفيذ عملية القص: {e}")
+        print(f"🔥 كراش أثناء عرض نتيجة القص: {e}")
 
 
 # ===============================
@@ -263,24 +275,20 @@ def _draw_text_thumbnail(png_path: str, title: str, size=(480, 320)):
     img.save(png_path)
 
 
-def ensure_preview_image(dxf_path: str):
+def ensure_preview_image(dxf_path: str, size: str = "detail"):
     """
-    توليد صورة المعاينة PNG بجانب DXF إن لم تكن موجودة:
-    - لو عندك مولّد جاهز مثل البروفايل مانجر: tools.preview_utils.generate_dxf_preview_png
-    - وإلا: نصنع صورة نصّية بديلة تحمل اسم الشكل.
+    مسار صورة المعاينة من tools.thumbnail_cache (مفتاحها محتوى الـ DXF فتتجدد عند تعديله):
+    - تُولَّد Offscreen عند الحاجة بدون لمس العارض
+    - وإلا: نصنع صورة نصّية بديلة تحمل اسم الشكل بجانب الملف.
     """
-    png_path = png_path_for_dxf(dxf_path)
-    if exists(png_path):
-        return png_path
-
-    # محاولة استخدام مولّد جاهز (إن وُجد)
     try:
-        from tools.preview_utils import generate_dxf_preview_png  # هوك اختياري
-        ok = generate_dxf_preview_png(dxf_path, png_path)
-        if ok and exists(png_path):
+        png_path = render_thumbnail(dxf_path, size)
+        if png_path:
             return png_path
-    except Exception:
-        pass
+    except Exception as e:
+        print(f"[THUMB] ⚠️ {e}")
+
+    png_path = png_path_for_dxf(dxf_path)
 
     # بديل مبسّط: صورة نصّية باسم الملف
     _draw_text_thumbnail(png_path, basename(dxf_path).replace(".dxf", ""))
@@ -328,14 +336,14 @@ def scale_preview_shape_wrapper(page, parent):
 def create_shape_manager_page(parent):
     from PyQt5.QtWidgets import (
         QWidget, QHBoxLayout, QVBoxLayout, QFormLayout, QListWidget, QLabel,
-        QLineEdit, QComboBox, QPushButton, QFileDialog, QSizePolicy, QFrame
+        QLineEdit, QComboBox, QPushButton, QFileDialog, QSizePolicy, QFrame, QProgressBar,
+        QListWidgetItem
     )
     from PyQt5.QtCore import Qt, QTimer
-    from PyQt5.QtGui import QPixmap
+    from PyQt5.QtGui import QPixmap, QIcon
     import os
     from os.path import basename, join, splitext, exists
     import logging
-    from dxf_loader import smart_load_dxf
 
     page = QWidget()
     main = QHBoxLayout(page)
@@ -353,8 +361,15 @@ def create_shape_manager_page(parent):
     shape_list = QListWidget()
     shape_list.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
 
+    # ⏳ تقدّم تحميل المكتبة / القص في الخلفية
+    load_progress = QProgressBar()
+    load_progress.setTextVisible(True)
+    load_progress.setFormat("%v / %m")
+    load_progress.hide()
+
     left_v.addWidget(title_list)
     left_v.addWidget(shape_list)
+    left_v.addWidget(load_progress)
 
     # ====== يمين: عارض صورة + أزرار + مدخلات ======
     right_panel = QWidget()
@@ -437,6 +452,7 @@ def create_shape_manager_page(parent):
 
     # ====== ربط الصفحة ======
     page.shape_list = shape_list
+    page.load_progress = load_progress
     page.depth_input = depth_input
     page.axis_selector = axis_selector
     page.x_input = x_input
@@ -448,63 +464,107 @@ def create_shape_manager_page(parent):
     page.shape_2d = None
     page.preview_shape = None
     page.preview_actor = None
-    page.test_shapes = {}
     page.display = parent.display
 
     shapes_folder = os.path.join("frontend", "window", "library", "shapes")
     os.makedirs(shapes_folder, exist_ok=True)
 
-    from frontend.window.tools.preview_utils import generate_dxf_preview_png
     logging.getLogger("ezdxf").setLevel(logging.ERROR)
 
-    def ensure_preview_image(dxf_path: str):
-        png_path = os.path.splitext(dxf_path)[0] + ".png"
-        if os.path.exists(png_path):
-            return png_path
-        try:
-            ok = generate_dxf_preview_png(dxf_path, png_path)
-            if ok and os.path.exists(png_path):
-                return png_path
-        except Exception:
-            pass
-        return None
+    # 🖼 صور المعاينة من كاش حسب محتوى الملف — الناقص/القديم يُولَّد Offscreen في الخلفية
+    page.thumbs = ThumbnailCache(parent=page)
+
+    def set_detail_pixmap(png_path: str):
+        pix = QPixmap(png_path)
+        scaled = pix.scaled(img_view.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        img_view.setPixmap(scaled)
 
     def show_image_preview(name: str):
         dxf_path = os.path.join(shapes_folder, name + ".dxf")
-        png_path = ensure_preview_image(dxf_path)
-        if png_path and os.path.exists(png_path):
-            pix = QPixmap(png_path)
-            scaled = pix.scaled(img_view.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            img_view.setPixmap(scaled)
+        png_path = cached_thumbnail(dxf_path, "detail")
+        if png_path:
+            set_detail_pixmap(png_path)
         else:
             img_view.clear()
+            page.thumbs.request(dxf_path, "detail")
+
+    def on_thumbnail_ready(dxf_path, size, png_path):
+        name = os.path.splitext(os.path.basename(dxf_path))[0]
+        if size == "list":
+            for item in page.shape_list.findItems(name, Qt.MatchExactly):
+                item.setIcon(QIcon(png_path))
+        elif size == "detail":
+            current = page.shape_list.currentItem()
+            if current is not None and current.text() == name:
+                set_detail_pixmap(png_path)
+
+    page.thumbs.thumbnailReady.connect(on_thumbnail_ready)
+
+    # 📚 مكتبة كسولة: القائمة من فهرس خفيف، والهندسة تُحلَّل عند الاختيار فقط (LRU)
+    page.library = ShapeLibrary(shapes_folder, max_shapes=8)
+
+    # 🧵 فهرسة الملفات الجديدة/المعدّلة فقط في Process Pool — بدون OCC
+    page.library_loader = LibraryLoader(worker=read_entry_metadata, parent=page)
+
+    def add_library_item(entry):
+        item = QListWidgetItem(entry.name)
+        item.setToolTip(entry.summary())
+        page.shape_list.addItem(item)
+        page.thumbs.request(entry.dxf_path, "list")
+
+    def on_library_entry(key, dxf_path, meta):
+        add_library_item(page.library.update_entry(meta))
+
+    def on_library_progress(done, total):
+        load_progress.setFormat("%v / %m")
+        load_progress.setMaximum(max(total, 1))
+        load_progress.setValue(done)
+        load_progress.setVisible(done < total)
+
+    def on_library_finished(count):
+        load_progress.hide()
+        page.library.save_index()
+        print(f"✅ تمت فهرسة {count} ملف DXF في {shapes_folder}")
+
+    page.library_loader.itemLoaded.connect(on_library_entry)
+    page.library_loader.progress.connect(on_library_progress)
+    page.library_loader.finished.connect(on_library_finished)
 
     def load_all_shapes_from_folder():
-        """تحميل ملفات DXF فقط عند الطلب."""
+        """عرض المكتبة فورًا من الفهرس، وفهرسة الملفات المتغيرة في الخلفية."""
         print("📂 [Manual Load] بدء تحميل مكتبة الأشكال...")
         page.shape_list.clear()
-        page.test_shapes.clear()
-        dxf_files = [f for f in os.listdir(shapes_folder) if f.lower().endswith(".dxf")]
-        for fname in dxf_files:
-            dxf_path = os.path.join(shapes_folder, fname)
-            shape = smart_load_dxf(dxf_path)
-            if shape and not shape.IsNull():
-                key = os.path.splitext(fname)[0]
-                page.test_shapes[key] = shape
-                page.shape_list.addItem(key)
-                ensure_preview_image(dxf_path)
-        print(f"✅ تم تحميل {len(dxf_files)} ملف DXF من {shapes_folder}")
+        fresh, stale = page.library.refresh()
+        for entry in fresh:
+            add_library_item(entry)
+        print(f"📚 {len(fresh)} من الفهرس | {len(stale)} تحتاج فهرسة")
+        page.library_loader.start(stale)
 
     def on_select(row):
         if row < 0:
             img_view.clear()
             return
         name = shape_list.item(row).text()
-        shape = page.test_shapes.get(name)
-        if shape and not shape.IsNull():
-            page.shape_2d = shape
-            show_image_preview(name)
-            print(f"📐 تم اختيار الشكل: {name}")
+        show_image_preview(name)
+
+        def on_shape_ready(shape, name=name):
+            # تجاهل النتيجة إن غيّر المستخدم الاختيار أثناء التحليل
+            current = shape_list.currentItem()
+            if current is None or current.text() != name:
+                return
+            if shape and not shape.IsNull():
+                page.shape_2d = shape
+                print(f"📐 تم اختيار الشكل: {name} | cache={page.library.stats()}")
+
+        shape = page.library.cached_shape(name, HEAL_IMPORTED_PROFILES)
+        if shape is not None:
+            on_shape_ready(shape)
+        else:
+            page.shape_2d = None
+            get_executor().submit(
+                page.library.get_shape, name, HEAL_IMPORTED_PROFILES,
+                key="library_select", on_done=on_shape_ready,
+            )
 
     shape_list.currentRowChanged.connect(on_select)
 
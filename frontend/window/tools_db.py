@@ -1,69 +1,64 @@
-import sqlite3
 from pathlib import Path
 
+from tools.db_access import get_database
+from tools.tool_db import ensure_tool_schema
+
 DB_PATH = Path("data/tools.db")
 
 class ToolsDB:
     """Tool Library DB with auto-migrations."""
 
     def __init__(self):
+        # اتصال مشترك طويل العمر (WAL) بدل sqlite3.connect في كل نداء
+        self.db = get_database(DB_PATH)
         self._ensure_db()
         self._migrate_columns()
 
     def _ensure_db(self):
-        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(DB_PATH) as con:
-            con.execute("""
-                CREATE TABLE IF NOT EXISTS tools (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    type TEXT,
-                    diameter REAL,
-                    length REAL,
-                    rpm INTEGER,
-                    feedrate REAL,
-                    image_path TEXT
-                )
-            """)
-            con.commit()
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS tools (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                type TEXT,
+                diameter REAL,
+                length REAL,
+                rpm INTEGER,
+                feedrate REAL,
+                image_path TEXT
+            )
+        """)
 
     def _migrate_columns(self):
-        """Add missing columns if the DB is old."""
-        with sqlite3.connect(DB_PATH) as con:
-            cur = con.execute("PRAGMA table_info(tools)")
-            cols = {row[1] for row in cur.fetchall()}
-            if "feedrate" not in cols:
-                con.execute("ALTER TABLE tools ADD COLUMN feedrate REAL DEFAULT 500;")
-            if "image_path" not in cols:
-                con.execute("ALTER TABLE tools ADD COLUMN image_path TEXT DEFAULT '';")
-            con.commit()
+        """Add missing columns (typed schema, cutting_data, indexes) if the DB is old."""
+        ensure_tool_schema(self.db)
 
     # CRUD
-    def add_tool(self, name, type_, diameter, length, rpm, feedrate, image_path=""):
-        with sqlite3.connect(DB_PATH) as con:
+    def add_tool(self, name, type_, diameter, length, rpm, feedrate, image_path="",
+                 flute_count=2, material="", max_depth=None):
+        with self.db.transaction() as con:
             cur = con.execute("""
-                INSERT INTO tools (name, type, diameter, length, rpm, feedrate, image_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (name, type_, diameter, length, rpm, feedrate, image_path))
-            con.commit()
+                INSERT INTO tools (name, type, diameter, length, rpm, feedrate, image_path,
+                                   flute_count, material, max_depth)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (name, type_, diameter, length, rpm, feedrate, image_path,
+                  flute_count, material, max_depth))
             return cur.lastrowid
 
     def list_tools(self):
-        with sqlite3.connect(DB_PATH) as con:
-            cur = con.execute("SELECT * FROM tools ORDER BY id ASC")
-            cols = [c[0] for c in cur.description]
-            return [dict(zip(cols, r)) for r in cur.fetchall()]
+        return self.db.query_dicts("SELECT * FROM tools ORDER BY id ASC")
+
+    def count_tools(self):
+        return self.db.query("SELECT COUNT(*) FROM tools")[0][0]
+
+    def list_tools_page(self, offset, limit):
+        """صفحة واحدة من الأدوات (للجدول الافتراضي)."""
+        return self.db.query_dicts("SELECT * FROM tools ORDER BY id ASC LIMIT ? OFFSET ?", (limit, offset))
 
     def get_tool(self, tool_id):
         if not tool_id:
             return None
-        with sqlite3.connect(DB_PATH) as con:
-            cur = con.execute("SELECT * FROM tools WHERE id=?", (tool_id,))
-            row = cur.fetchone()
-            if not row:
-                return None
-            cols = [c[0] for c in cur.description]
-            return dict(zip(cols, row))
+        rows = self.db.query_dicts("SELECT * FROM tools WHERE id=?", (tool_id,))
+        return rows[0] if rows else None
 
     def update_tool(self, tool_id, **kw):
         if not tool_id:
@@ -75,11 +70,9 @@ class ToolsDB:
         if not fields:
             return
         vals.append(tool_id)
-        with sqlite3.connect(DB_PATH) as con:
+        with self.db.transaction() as con:
             con.execute(f"UPDATE tools SET {', '.join(fields)} WHERE id=?", tuple(vals))
-            con.commit()
 
     def delete_tool(self, tool_id):
-        with sqlite3.connect(DB_PATH) as con:
+        with self.db.transaction() as con:
             con.execute("DELETE FROM tools WHERE id=?", (tool_id,))
-            con.commit()
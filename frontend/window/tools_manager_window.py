@@ -1,12 +1,22 @@
 from PyQt5.QtWidgets import (
     QWidget, QFormLayout, QLineEdit, QDoubleSpinBox, QSpinBox,
-    QComboBox, QLabel, QMessageBox, QVBoxLayout,
-    QTableWidget, QTableWidgetItem, QHeaderView, QPushButton
+    QComboBox, QLabel, QMessageBox, QVBoxLayout
 )
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
 from pathlib import Path
 from frontend.window.tools_db import ToolsDB
+from frontend.window.paged_table_model import PagedTableModel, make_paged_view
+
+TOOL_COLUMNS = [
+    ("id", "ID"),
+    ("name", "Name"),
+    ("type", "Type"),
+    ("diameter", "Dia (mm)"),
+    ("rpm", "RPM"),
+    ("image_path", "Image"),
+    (None, ""),          # عمود الحذف
+]
 
 
 class ToolsManagerWindow(QWidget):
@@ -29,6 +39,11 @@ class ToolsManagerWindow(QWidget):
         self.type_combo = QComboBox(); self.type_combo.addItems(self._tool_types.keys())
         self.rpm_input = QSpinBox(); self.rpm_input.setRange(0, 100000); self.rpm_input.setValue(1500)
         self.feed_input = QSpinBox(); self.feed_input.setRange(0, 100000); self.feed_input.setValue(300)
+        self.flutes_input = QSpinBox(); self.flutes_input.setRange(1, 12); self.flutes_input.setValue(2)
+        self.material_input = QComboBox(); self.material_input.setEditable(True)
+        self.material_input.addItems(["", "HSS", "Carbide", "Cobalt"])
+        self.max_depth_input = QDoubleSpinBox(); self.max_depth_input.setSuffix(" mm"); self.max_depth_input.setRange(0, 1000)
+        self.max_depth_input.setSpecialValueText("—")  # 0 = غير محدد (يُستخدم طول الأداة)
 
         form.addRow("Tool Name:", self.name_input)
         form.addRow("Diameter:", self.dia_input)
@@ -36,6 +51,9 @@ class ToolsManagerWindow(QWidget):
         form.addRow("Type:", self.type_combo)
         form.addRow("Default RPM:", self.rpm_input)
         form.addRow("Feedrate:", self.feed_input)
+        form.addRow("Flutes:", self.flutes_input)
+        form.addRow("Tool Material:", self.material_input)
+        form.addRow("Max Depth:", self.max_depth_input)
 
         # معاينة الصورة
         self.image_label = QLabel("No image")
@@ -49,13 +67,14 @@ class ToolsManagerWindow(QWidget):
 
         main_layout.addLayout(form)
 
-        # ===== جدول الأدوات =====
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["ID", "Name", "Type", "Dia (mm)", "RPM", "Image", ""])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # ===== جدول الأدوات (Model/View مقسّم لصفحات) =====
+        self.tool_model = PagedTableModel(
+            self._db.count_tools, self._db.list_tools_page, TOOL_COLUMNS,
+            image_key="image_path", action_text="🗑", parent=self,
+        )
+        self.table = make_paged_view(self.tool_model)
         self.table.setFixedHeight(300)
-        self.table.cellClicked.connect(self.on_table_click)  # تحميل القيم عند اختيار صف
+        self.table.clicked.connect(self.on_table_click)  # تحميل القيم أو الحذف حسب العمود
         main_layout.addWidget(self.table)
 
         self.setLayout(main_layout)
@@ -82,6 +101,9 @@ class ToolsManagerWindow(QWidget):
         length = self.length_input.value()
         rpm = self.rpm_input.value()
         feed = self.feed_input.value()
+        flutes = self.flutes_input.value()
+        material = self.material_input.currentText().strip()
+        max_depth = self.max_depth_input.value() or None
         img_path = self._tool_types.get(tool_type, "")
 
         try:
@@ -89,11 +111,13 @@ class ToolsManagerWindow(QWidget):
                 self._db.update_tool(
                     self._current_edit_id,
                     name=name, type=tool_type, diameter=dia,
-                    length=length, rpm=rpm, feedrate=feed, image_path=img_path
+                    length=length, rpm=rpm, feedrate=feed, image_path=img_path,
+                    flute_count=flutes, material=material, max_depth=max_depth
                 )
                 print(f"[TOOLS] ✏️ Updated: id={self._current_edit_id}, {name}")
             else:  # إضافة
-                new_id = self._db.add_tool(name, tool_type, dia, length, rpm, feed, img_path)
+                new_id = self._db.add_tool(name, tool_type, dia, length, rpm, feed, img_path,
+                                           flute_count=flutes, material=material, max_depth=max_depth)
                 print(f"[TOOLS] ✅ Added: id={new_id}, {name}")
 
             self.refresh_tool_table()
@@ -110,54 +134,26 @@ class ToolsManagerWindow(QWidget):
         self.length_input.setValue(0.0)
         self.rpm_input.setValue(1500)
         self.feed_input.setValue(300)
+        self.flutes_input.setValue(2)
+        self.material_input.setCurrentText("")
+        self.max_depth_input.setValue(0.0)
         # اترك النوع كما هو، والصورة تتبع النوع الحالي
         self.update_tool_image(self.type_combo.currentText())
 
     def refresh_tool_table(self):
-        tools = self._db.list_tools()
-        self.table.setRowCount(len(tools))
-        for i, tool in enumerate(tools):
-            self.table.setItem(i, 0, QTableWidgetItem(str(tool["id"])))
-            self.table.setItem(i, 1, QTableWidgetItem(tool["name"]))
-            self.table.setItem(i, 2, QTableWidgetItem(tool["type"]))
-            self.table.setItem(i, 3, QTableWidgetItem(str(tool["diameter"])))
-            self.table.setItem(i, 4, QTableWidgetItem(str(tool["rpm"])))
-
-            # صورة مصغرة
-            img_cell = QLabel()
-            img_path = tool.get("image_path", "")
-            if img_path and Path(img_path).exists():
-                pix = QPixmap(img_path).scaled(48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                img_cell.setPixmap(pix)
-            else:
-                img_cell.setText("—")
-            img_cell.setAlignment(Qt.AlignCenter)
-            self.table.setCellWidget(i, 5, img_cell)
-
-            # أيقونة الحذف (نص أحمر)
-            del_btn = QPushButton("🗑")
-            del_btn.setStyleSheet("""
-                QPushButton {
-                    color: #d32f2f;
-                    background: none;
-                    border: none;
-                    font-size: 16px;
-                }
-                QPushButton:hover {
-                    color: #b71c1c;
-                }
-            """)
-            del_btn.setToolTip(f"Delete {tool['name']}")
-            del_btn.clicked.connect(lambda _, tid=tool["id"], name=tool["name"]: self.delete_tool(tid, name))
-            self.table.setCellWidget(i, 6, del_btn)
+        # إعادة العد فقط — الصفوف والصور تُجلب عند ظهورها في الجدول
+        self.tool_model.reload()
 
     # اختيار صف ⇒ تحميله للأعلى للتعديل
-    def on_table_click(self, row, col):
+    def on_table_click(self, index):
         try:
-            tool_id_item = self.table.item(row, 0)
-            if not tool_id_item:
+            row = self.tool_model.row_data(index.row())
+            if not row:
+                return
+            if self.tool_model.column_key(index.column()) is None:
+                self.delete_tool(row["id"], row["name"])
                 return
-            tool_id = int(tool_id_item.text())
+            tool_id = int(row["id"])
             tool = self._db.get_tool(tool_id)
             if not tool:
                 return
@@ -169,6 +165,9 @@ class ToolsManagerWindow(QWidget):
             self.length_input.setValue(float(tool.get("length", 0) or 0.0))
             self.rpm_input.setValue(int(tool.get("rpm", 0) or 0))
             self.feed_input.setValue(int(tool.get("feedrate", 0) or 0))
+            self.flutes_input.setValue(int(tool.get("flute_count") or 2))
+            self.material_input.setCurrentText(tool.get("material") or "")
+            self.max_depth_input.setValue(float(tool.get("max_depth") or 0.0))
             self.update_tool_image(self.type_combo.currentText())
             print(f"[TOOLS] 📝 Editing tool id={tool_id}")
         except Exception as e:
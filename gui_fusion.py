@@ -17,6 +17,8 @@ from tools.gcode_generator import generate_program, save_program, GCodeSettings
 from dxf_tools import load_dxf_file
 from frontend.fusion_topbar import FusionTopBar
 from tools.sketch_page import SketchPage
+from tools.shape_cache import invalidate_shape_cache
+from tools.boolean_ops import BooleanOptions, set_default_options
 # ✅ استبدلنا العارض الافتراضي بالعارض المستقر الرسمي
 from OCCViewer import OCCViewer
 
@@ -47,6 +49,7 @@ class AlumCamGUI(QMainWindow):
         self.op_browser = OperationBrowser()
         self.op_browser.setStyleSheet("background-color: rgba(220, 220, 220, 180);")
         self.op_browser.setFixedWidth(250)
+        self.op_browser.shapeRegenerated.connect(self._on_history_regenerated)
 
         # 🎨 تطبيق ستايل إضافي إن وجد
         try:
@@ -109,7 +112,7 @@ class AlumCamGUI(QMainWindow):
     def _export_gcode(self):
         """توليد G-Code كامل"""
         try:
-            ops = self.op_browser.list_operations()
+            ops = self.op_browser.get_all_ops()
             if not ops:
                 QMessageBox.information(self, "G-Code", "لا توجد عمليات في الشجرة.")
                 return
@@ -123,10 +126,19 @@ class AlumCamGUI(QMainWindow):
     # ------------------------------------------------------------------
     def on_operation_selected(self, category, name):
         """عرض الشكل عند اختيار عملية من الشجرة"""
-        item = self.op_browser.currentItem()
-        shape = getattr(item, "shape", None)
+        item = self.op_browser.tree.currentItem()
+        shape = self.op_browser.shape_for_item(item)
         if shape and not shape.IsNull():
-            self.display_shape_with_axes(shape)
+            self.display_shape(shape)
+
+    # ------------------------------------------------------------------
+    def _on_history_regenerated(self, profile_name, shape):
+        """تحديث الشكل المعروض بعد إعادة بناء سجل العمليات"""
+        if shape is None or shape.IsNull():
+            return
+        self.loaded_shape = shape
+        self.display_shape(shape)
+        print(f"[HISTORY] ✅ '{profile_name}' regenerated and displayed.")
 
     # ------------------------------------------------------------------
     def display_shape(self, shape):
@@ -158,8 +170,7 @@ class AlumCamGUI(QMainWindow):
             return
         self.loaded_shape = shape
         QTimer.singleShot(100, self._safe_display_shape)
-        item = self.op_browser.add_profile("DXF Profile")
-        item.shape = self.loaded_shape
+        self.op_browser.add_profile("DXF Profile", shape=self.loaded_shape)
 
     # ------------------------------------------------------------------
     def _safe_display_shape(self):
@@ -221,6 +232,8 @@ class AlumCamGUI(QMainWindow):
     def new_file(self):
         """إنشاء مشروع جديد فارغ"""
         self.loaded_shape = None
+        invalidate_shape_cache()
+        set_default_options(BooleanOptions())
         self.display.EraseAll()
         self.display.Repaint()
         print("🆕 تم إنشاء مشروع جديد فارغ")
@@ -228,19 +241,9 @@ class AlumCamGUI(QMainWindow):
     # ------------------------------------------------------------------
     def delete_selected_operation(self):
         """حذف العملية المحددة من الشجرة"""
-        item = self.op_browser.currentItem()
+        item = self.op_browser.tree.currentItem()
         if item and item.parent():
-            parent = item.parent()
-            parent.removeChild(item)
-
-            # عرض آخر عنصر متبقي
-            remaining = parent.childCount()
-            if remaining > 0:
-                last_item = parent.child(remaining - 1)
-                shape = getattr(last_item, "shape", None)
-                if shape and not shape.IsNull():
-                    self.display_shape(shape)
-                else:
-                    self.display.EraseAll()
-            else:
+            # الحذف يعيد بناء العمليات التالية فقط ويرسل shapeRegenerated
+            shape = self.op_browser.delete_operation(item)
+            if shape is None or shape.IsNull():
                 self.display.EraseAll()
@@ -0,0 +1,48 @@
+# tests/test_bulk_import.py — إعادة استيراد اسم موجود لا تكتب فوق ملفات البروفايل القائم
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tools import bulk_import, profile_tools
+from tools.database import ProfileDB
+
+
+def _fake_import_one(dxf_path, name, code, notes):
+    """بديل _import_one بدون OCC: يكتب ملفات البروفايل كما يفعل process_dxf_to_assets."""
+    out_dir = profile_tools.ensure_profile_dir(name)
+    dxf_dst = out_dir / f"{name}.dxf"
+    dxf_dst.write_bytes(Path(dxf_path).read_bytes())
+    img = out_dir / f"{name}.png"
+    img.write_bytes(b"new-png")
+    return {"name": name, "code": code, "dimensions": "60x40", "notes": notes,
+            "dxf_path": str(dxf_dst), "brep_path": "", "image_path": str(img)}
+
+
+def test_reimport_existing_name_keeps_existing_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_tools, "PROFILES_ROOT", tmp_path / "profiles")
+    monkeypatch.setattr(bulk_import, "_import_one", _fake_import_one)
+    monkeypatch.setattr(bulk_import, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+    db = ProfileDB(tmp_path / "profiles.db")
+    old_dir = profile_tools.ensure_profile_dir("frame")
+    (old_dir / "frame.dxf").write_bytes(b"old-dxf")
+    (old_dir / "frame.png").write_bytes(b"old-png")
+    db.add_profile(name="frame", code="OLD", dimensions="60x40", notes="",
+                   dxf_path=str(old_dir / "frame.dxf"), brep_path="",
+                   image_path=str(old_dir / "frame.png"))
+
+    source = tmp_path / "incoming"
+    source.mkdir()
+    (source / "frame.dxf").write_bytes(b"new-dxf")
+
+    report = bulk_import.bulk_import(source, code="NEW", workers=1, db=db)
+
+    assert report.imported == 1 and report.duplicates == 0 and not report.failed
+    assert (old_dir / "frame.dxf").read_bytes() == b"old-dxf"
+    assert (old_dir / "frame.png").read_bytes() == b"old-png"
+    codes = {row[1]: row[2] for row in db.list_profiles()}
+    assert codes == {"frame": "OLD", "frame_2": "NEW"}
+
+
+def test_unique_names_skips_taken_and_batch_duplicates():
+    paths = [Path("a/Frame.dxf"), Path("b/Frame.dxf"), Path("c/rail.dxf")]
+    assert bulk_import._unique_names(paths, {"frame"}) == ["Frame_2", "Frame_3", "rail"]
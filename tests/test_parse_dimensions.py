@@ -0,0 +1,16 @@
+# tests/test_parse_dimensions.py — الأرقام المجردة لا تصبح عرضًا/ارتفاعًا
+from tools.database import parse_dimensions
+
+
+def test_size_pair_wins():
+    assert parse_dimensions("Series 6063 60x40 thk 2") == (60.0, 40.0, 2.0)
+
+
+def test_lone_number_stays_null():
+    assert parse_dimensions("slot 8") == (None, None, None)
+    assert parse_dimensions("6063-T5 frame") == (None, None, None)
+
+
+def test_labelled_values():
+    assert parse_dimensions("width=60, height: 40,5") == (60.0, 40.5, None)
+    assert parse_dimensions("H40 W60") == (60.0, 40.0, None)
@@ -0,0 +1,146 @@
+# tools/bbox_service.py — خدمة Bounding Box موحّدة مع كاش لكل شكل
+"""
+بدل أن تستدعي كل دالة brepbndlib.Add على نفس الشكل في كل تحديث للمعاينة،
+تُحسب الحدود مرة واحدة لكل (شكل، نمط) وتُحفظ في كاش LRU.
+
+الأنماط:
+- "fast"    : Bnd_Box العادي (مع الـ triangulation إن وُجدت)
+- "optimal" : AddOptimal — حدود أدق على الأسطح المنحنية (أبطأ)
+- "oriented": Bnd_OBB — صندوق موجّه عبر get_oriented_box
+"""
+
+from OCC.Core.Bnd import Bnd_Box
+
+from tools.shape_cache import ShapeCache, shape_identity
+
+_EMPTY = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+# كل مدخل يحتفظ بمرجع للشكل نفسه (لفحص IsSame) — حد صغير حتى لا تبقى أشكال قديمة حيّة
+BBOX_CACHE = ShapeCache(max_entries=64)
+
+
+# ==================== 🧮 الحساب الفعلي ====================
+def _compute_fast(shape):
+    box = Bnd_Box()
+    try:
+        from OCC.Core.BRepBndLib import brepbndlib
+        brepbndlib.Add(shape, box, True)
+    except ImportError:
+        # بعض إصدارات pythonocc توفّر الدالة الحرة فقط
+        from OCC.Core.BRepBndLib import brepbndlib_Add
+        brepbndlib_Add(shape, box, True)
+    if box.IsVoid():
+        return _compute_from_vertices(shape)
+    return box.Get()
+
+
+def _compute_optimal(shape):
+    from OCC.Core.BRepBndLib import brepbndlib
+    box = Bnd_Box()
+    brepbndlib.AddOptimal(shape, box, True, False)
+    if box.IsVoid():
+        return _compute_from_vertices(shape)
+    return box.Get()
+
+
+def _compute_from_vertices(shape):
+    """بديل أخير: حدود من رؤوس الشكل فقط."""
+    from OCC.Core.TopExp import TopExp_Explorer
+    from OCC.Core.TopAbs import TopAbs_VERTEX
+    from OCC.Core.BRep import BRep_Tool
+
+    box = Bnd_Box()
+    exp = TopExp_Explorer(shape, TopAbs_VERTEX)
+    count = 0
+    while exp.More():
+        box.Add(BRep_Tool.Pnt(exp.Current()))
+        exp.Next()
+        count += 1
+    if count == 0:
+        print("[BBOX] ⚠️ Failed to compute bbox.")
+        return _EMPTY
+    return box.Get()
+
+
+_MODES = {
+    "fast": _compute_fast,
+    "optimal": _compute_optimal,
+}
+
+
+# ==================== 📦 API ====================
+def get_extents(shape, mode: str = "fast"):
+    """إرجاع (xmin, ymin, zmin, xmax, ymax, zmax) للشكل من الكاش أو بحسابها مرة واحدة."""
+    if shape is None or shape.IsNull():
+        return _EMPTY
+    # المرجع للشكل يبقى في العنصر + IsSame عند القراءة → لا bbox قديم لعنوان أُعيد استخدامه
+    key = (mode, shape_identity(shape))
+    ext = BBOX_CACHE.get(key, shapes=(shape,))
+    if ext is not None:
+        return ext
+    try:
+        ext = tuple(float(v) for v in _MODES[mode](shape))
+    except KeyError:
+        raise ValueError(f"Unknown bbox mode: {mode}")
+    except Exception as e:
+        print(f"[BBOX] ⚠️ {mode} bbox failed ({e}) — using vertices.")
+        ext = tuple(float(v) for v in _compute_from_vertices(shape))
+    BBOX_CACHE.put(key, ext, shapes=(shape,))
+    return ext
+
+
+def get_oriented_box(shape):
+    """
+    صندوق موجّه (OBB): يرجع dict فيه center و axes (3 اتجاهات) و half_sizes.
+    """
+    if shape is None or shape.IsNull():
+        return None
+    key = ("oriented", shape_identity(shape))
+    obb_data = BBOX_CACHE.get(key, shapes=(shape,))
+    if obb_data is not None:
+        return obb_data
+
+    from OCC.Core.Bnd import Bnd_OBB
+    from OCC.Core.BRepBndLib import brepbndlib
+    obb = Bnd_OBB()
+    brepbndlib.AddOBB(shape, obb, True, True, False)
+    c = obb.Center()
+    axes = []
+    for d in (obb.XDirection(), obb.YDirection(), obb.ZDirection()):
+        axes.append((d.X(), d.Y(), d.Z()))
+    obb_data = {
+        "center": (c.X(), c.Y(), c.Z()),
+        "axes": tuple(axes),
+        "half_sizes": (obb.XHSize(), obb.YHSize(), obb.ZHSize()),
+    }
+    BBOX_CACHE.put(key, obb_data, shapes=(shape,))
+    return obb_data
+
+
+def top_z(shape) -> float:
+    return get_extents(shape)[5]
+
+
+def z_min(shape) -> float:
+    return get_extents(shape)[2]
+
+
+def size_along(shape, axis: str) -> float:
+    xmin, ymin, zmin, xmax, ymax, zmax = get_extents(shape)
+    axis = axis.upper()
+    if axis == "X":
+        return xmax - xmin
+    if axis == "Y":
+        return ymax - ymin
+    if axis == "Z":
+        return zmax - zmin
+    return 0
+
+
+def center(shape):
+    xmin, ymin, zmin, xmax, ymax, zmax = get_extents(shape)
+    return ((xmin + xmax) / 2.0, (ymin + ymax) / 2.0, (zmin + zmax) / 2.0)
+
+
+def invalidate_bbox_cache():
+    BBOX_CACHE.invalidate()
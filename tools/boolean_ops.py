@@ -0,0 +1,133 @@
+# tools/boolean_ops.py — عمليات Boolean المجمّعة (Multi-tool Cut) مع خيارات الدقة
+"""
+كل القص في البرنامج يمر من هنا بخيارات موحّدة (BooleanOptions):
+- fuzzy          : سماحية Fuzzy — الأوجه شبه المتطابقة (قاع ثقب أو Box Cut على سطح البروفايل)
+                   تُعامل كمتطابقة بدل المسار الحسابي الدقيق البطيء/الفاشل
+- parallel       : تشغيل الخوارزمية على عدة أنوية
+- glue           : "off" | "shift" | "full" — تسريع عندما الأدوات تلامس الشكل بأوجه مشتركة فقط
+- non_destructive: عدم تعديل أشكال الإدخال (آمن مع الكاش وسجل العمليات)
+- retry_fuzzy    : إن فشل القص الدقيق يُعاد مرة واحدة بهذه السماحية
+
+الإعدادات الافتراضية على مستوى المشروع تُحفظ في ملف .alucam عبر to_dict/from_dict.
+"""
+
+from dataclasses import dataclass, asdict, fields, replace
+
+from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut
+from OCC.Core.TopTools import TopTools_ListOfShape
+
+
+@dataclass
+class BooleanOptions:
+    fuzzy: float = 0.0
+    parallel: bool = True
+    glue: str = "off"
+    non_destructive: bool = True
+    retry_fuzzy: float = 1e-5
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BooleanOptions":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in names})
+
+
+_project_options = BooleanOptions()
+
+
+def get_default_options() -> BooleanOptions:
+    """خيارات الـ Boolean الافتراضية للمشروع الحالي."""
+    return _project_options
+
+
+def set_default_options(options: BooleanOptions):
+    global _project_options
+    _project_options = options or BooleanOptions()
+    print(f"[BOOL] Project boolean options: {_project_options}")
+
+
+def _glue_mode(name):
+    from OCC.Core.BOPAlgo import BOPAlgo_GlueOff, BOPAlgo_GlueShift, BOPAlgo_GlueFull
+    return {
+        "off": BOPAlgo_GlueOff,
+        "shift": BOPAlgo_GlueShift,
+        "full": BOPAlgo_GlueFull,
+    }.get(str(name).lower(), BOPAlgo_GlueOff)
+
+
+def _to_list(shapes):
+    lst = TopTools_ListOfShape()
+    for s in shapes:
+        if s is not None and not s.IsNull():
+            lst.Append(s)
+    return lst
+
+
+def _run_cut(base_shape, tools, opts: BooleanOptions, progress=None):
+    op = BRepAlgoAPI_Cut()
+    op.SetArguments(_to_list([base_shape]))
+    op.SetTools(tools)
+    op.SetRunParallel(opts.parallel)
+    op.SetNonDestructive(opts.non_destructive)
+    if opts.fuzzy > 0:
+        op.SetFuzzyValue(opts.fuzzy)
+    if str(opts.glue).lower() != "off":
+        op.SetGlue(_glue_mode(opts.glue))
+    if progress is not None:
+        op.Build(progress)  # يتوقف عند UserBreak() للمؤشر (إلغاء المهمة)
+    else:
+        op.Build()
+    if not op.IsDone() or op.HasErrors():
+        return None
+    return op.Shape()
+
+
+# ==================== ✂️ Multi-tool Cut ====================
+def _user_break(progress) -> bool:
+    try:
+        return progress is not None and progress.UserBreak()
+    except Exception:
+        return False
+
+
+def cut_many(base_shape, tool_shapes, parallel: bool = None, options: BooleanOptions = None,
+             progress=None):
+    """
+    طرح مجموعة أدوات من الشكل الأساسي بعملية Boolean واحدة
+    بدل تنفيذ BRepAlgoAPI_Cut لكل أداة على حدة.
+    progress: Message_ProgressRange اختياري (تقدّم + إلغاء من op_executor).
+    """
+    if base_shape is None or base_shape.IsNull():
+        print("[❌] cut_many: base_shape is null")
+        return None
+
+    opts = options or get_default_options()
+    if parallel is not None:
+        opts = replace(opts, parallel=parallel)
+
+    tools = _to_list(tool_shapes)
+    if tools.Size() == 0:
+        return base_shape
+
+    try:
+        result = _run_cut(base_shape, tools, opts, progress)
+        if result is None and _user_break(progress):
+            print("[BOOL] ⏹️ cut cancelled")
+            return None
+        if result is None and opts.fuzzy <= 0 < opts.retry_fuzzy:
+            # النطاق استُهلك في المحاولة الأولى — الإعادة بدون تقدّم
+            print(f"[BOOL] ⚠️ exact cut failed — retrying with fuzzy={opts.retry_fuzzy}")
+            result = _run_cut(base_shape, tools, replace(opts, fuzzy=opts.retry_fuzzy))
+        if result is None:
+            print("[❌] cut_many: boolean not done")
+        return result
+    except Exception as e:
+        print(f"[❌] cut_many failed: {e}")
+        return None
+
+
+def cut(base_shape, tool_shape, options: BooleanOptions = None, progress=None):
+    """قص أداة واحدة بنفس خيارات المشروع."""
+    return cut_many(base_shape, [tool_shape], options=options, progress=progress)
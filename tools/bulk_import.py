@@ -0,0 +1,188 @@
+# tools/bulk_import.py — استيراد جماعي لبروفايلات DXF (مجلد أو zip) بالتوازي
+"""
+process_dxf_to_assets + ProfileDB.add_profile لكل ملف على حدة = اتصال SQLite و commit
+لكل بروفايل، ونسخ/تحليل/رسم بالتسلسل. هنا:
+
+1) جمع ملفات DXF من مجلد (بشكل متكرر) أو من ملف zip
+2) الأسماء تُحسم قبل التوزيع مقابل ProfileDB ومجلدات profiles/ الموجودة
+   → لا يكتب أي عامل فوق ملفات بروفايل قائم
+3) كل ملف في عملية منفصلة: نسخ → تحليل → B-rep في مجلد البروفايل
+   → صورة Headless (tools.raster2d) → أبعاد من الـ bbox
+4) كل الصفوف تُدخل بـ executemany في Transaction واحدة (ProfileDB.add_profiles)
+
+الاستخدام من سطر الأوامر:
+    python -m tools.bulk_import catalogue.zip --code SUP --workers 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tools import profile_tools
+from tools.profile_tools import slugify
+
+
+@dataclass
+class BulkImportReport:
+    found: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    failed: list = field(default_factory=list)   # [(dxf_path, error), ...]
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (f"{self.imported}/{self.found} imported | {self.duplicates} duplicate(s) | "
+                f"{len(self.failed)} failed | {self.seconds:.1f}s")
+
+
+# ==================== 🧵 العامل (عملية منفصلة) ====================
+def _profile_dimensions(shape) -> str:
+    from tools.bbox_service import get_extents
+
+    xmin, ymin, zmin, xmax, ymax, zmax = get_extents(shape)
+    spans = sorted((xmax - xmin, ymax - ymin, zmax - zmin), reverse=True)
+    return f"{spans[0]:.1f}x{spans[1]:.1f}"
+
+
+def _import_one(dxf_path: str, name: str, code: str, notes: str) -> dict:
+    """يعمل داخل عملية العامل — يرجع صف قاعدة البيانات جاهزًا."""
+    from dxf_tools import load_dxf_file
+    from tools.profile_tools import _write_brep, process_dxf_to_assets
+
+    shape = load_dxf_file(dxf_path)
+    if shape is None or shape.IsNull():
+        raise RuntimeError("DXF parsing returned no shape.")
+
+    dxf_dst, _brep, img_path = process_dxf_to_assets(Path(dxf_path), name, shape=shape)
+    # B-rep بجانب DXF في مجلد البروفايل (geometry_cache قابل للمسح ولا يصلح كمرجع دائم)
+    brep = dxf_dst.with_suffix(".brep")
+    _write_brep(shape, brep)
+    return {
+        "name": name,
+        "code": code,
+        "dimensions": _profile_dimensions(shape),
+        "notes": notes,
+        "dxf_path": str(dxf_dst),
+        "brep_path": str(brep),
+        "image_path": str(img_path),
+    }
+
+
+# ==================== 📂 جمع الملفات ====================
+def collect_dxf_files(source: Path, workdir: Path):
+    """مسارات DXF من مجلد أو zip (يُفك في workdir بأسماء الملفات فقط — بدون مسارات من الأرشيف)."""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(p for p in source.rglob("*") if p.suffix.lower() == ".dxf")
+
+    if zipfile.is_zipfile(source):
+        paths = []
+        with zipfile.ZipFile(source) as zf:
+            for i, info in enumerate(zf.infolist()):
+                if info.is_dir() or not info.filename.lower().endswith(".dxf"):
+                    continue
+                target = workdir / f"{i:05d}" / os.path.basename(info.filename)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with zf.open(info) as src, open(target, "wb") as dst:
+                    dst.write(src.read())
+                paths.append(target)
+        return paths
+
+    if source.suffix.lower() == ".dxf":
+        return [source]
+    raise ValueError(f"Not a folder, zip or DXF: {source}")
+
+
+def _taken_names(db) -> set:
+    """أسماء محجوزة: صفوف ProfileDB + مجلدات profiles/ (حتى اليتيمة منها) — بدون حساسية للحالة."""
+    taken = {name.casefold() for name in db.profile_names()}
+    root = profile_tools.PROFILES_ROOT
+    if root.exists():
+        taken.update(p.name.casefold() for p in root.iterdir() if p.is_dir())
+    return taken
+
+
+def _unique_names(paths, taken=()):
+    """
+    اسم بروفايل فريد لكل ملف: لا يصطدم بـ taken ولا بملف آخر في نفس الدفعة
+    (ملفات بنفس الاسم في مجلدات مختلفة أو بنفس اسم بروفايل قائم تأخذ لاحقة _2, _3 ...).
+    """
+    used = set(taken)
+    names = []
+    for p in paths:
+        base = slugify(p.stem)
+        name, n = base, 1
+        while name.casefold() in used:
+            n += 1
+            name = f"{base}_{n}"
+        used.add(name.casefold())
+        names.append(name)
+    return names
+
+
+# ==================== 🚀 الاستيراد ====================
+def bulk_import(source, *, code: str = "", notes: str = "", workers: int = None,
+                db=None, progress=None) -> BulkImportReport:
+    """
+    استيراد كل ملفات DXF في source (مجلد / zip / ملف).
+    progress(done, total) اختياري — يُستدعى في العملية الرئيسية.
+    """
+    from tools.database import ProfileDB
+
+    db = db or ProfileDB()
+    report = BulkImportReport()
+    started = time.perf_counter()
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+
+    with tempfile.TemporaryDirectory(prefix="alucam_import_") as tmp:
+        paths = collect_dxf_files(Path(source), Path(tmp))
+        report.found = len(paths)
+        names = _unique_names(paths, _taken_names(db))
+        print(f"[IMPORT] 📂 {report.found} DXF file(s) from {source} | {workers} worker(s)")
+
+        rows = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_import_one, str(p), name, code, notes): p
+                for p, name in zip(paths, names)
+            }
+            for done, fut in enumerate(as_completed(futures), 1):
+                path = futures[fut]
+                try:
+                    rows.append(fut.result())
+                except Exception as e:
+                    report.failed.append((str(path), str(e)))
+                    print(f"[IMPORT] ❌ {path.name}: {e}")
+                if progress is not None:
+                    progress(done, report.found)
+
+    # ترتيب ثابت قبل الإدخال (as_completed يرجع بترتيب الانتهاء)
+    rows.sort(key=lambda r: r["name"])
+    report.imported = db.add_profiles(rows)
+    report.duplicates = len(rows) - report.imported
+    report.seconds = time.perf_counter() - started
+    print(f"[IMPORT] ✅ {report.summary()}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import DXF profiles into the profile library.")
+    parser.add_argument("source", help="Folder, .zip archive or single .dxf file")
+    parser.add_argument("--code", default="", help="Profile code stored for every imported row")
+    parser.add_argument("--notes", default="", help="Notes stored for every imported row")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count - 1)")
+    args = parser.parse_args(argv)
+
+    report = bulk_import(args.source, code=args.code, notes=args.notes, workers=args.workers)
+    for path, error in report.failed:
+        print(f"  ❌ {path}: {error}")
+    return 1 if report.failed and not report.imported else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,8 @@
 
+import re
 from pathlib import Path
-import sqlite3
+
+from tools.db_access import get_database
 
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "profiles.db"
 
@@ -19,37 +21,268 @@ CREATE TABLE IF NOT EXISTS profiles (
 );
 """
 
+# أبعاد رقمية مستخرجة من نص dimensions ("60x60", "100 x 50 x 2.5", "60*40 slot 8")
+DIMENSION_COLUMNS = {
+    "width_mm": "REAL",
+    "height_mm": "REAL",
+    "extra_mm": "REAL",     # الرقم الثالث إن وجد (سماكة / مجرى ...)
+}
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_profiles_created_at ON profiles(created_at);
+CREATE INDEX IF NOT EXISTS idx_profiles_name_nocase ON profiles(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_profiles_code_nocase ON profiles(code COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_profiles_dims ON profiles(width_mm, height_mm);
+CREATE INDEX IF NOT EXISTS idx_profiles_dims_rev ON profiles(height_mm, width_mm);
+"""
+
+# FTS5 خارجي المحتوى فوق جدول profiles + Triggers للمزامنة
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts USING fts5(
+    name, code, notes, dimensions,
+    content='profiles', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS profiles_fts_ai AFTER INSERT ON profiles BEGIN
+    INSERT INTO profiles_fts(rowid, name, code, notes, dimensions)
+    VALUES (new.id, new.name, new.code, new.notes, new.dimensions);
+END;
+CREATE TRIGGER IF NOT EXISTS profiles_fts_ad AFTER DELETE ON profiles BEGIN
+    INSERT INTO profiles_fts(profiles_fts, rowid, name, code, notes, dimensions)
+    VALUES ('delete', old.id, old.name, old.code, old.notes, old.dimensions);
+END;
+CREATE TRIGGER IF NOT EXISTS profiles_fts_au AFTER UPDATE ON profiles BEGIN
+    INSERT INTO profiles_fts(profiles_fts, rowid, name, code, notes, dimensions)
+    VALUES ('delete', old.id, old.name, old.code, old.notes, old.dimensions);
+    INSERT INTO profiles_fts(rowid, name, code, notes, dimensions)
+    VALUES (new.id, new.name, new.code, new.notes, new.dimensions);
+END;
+"""
+
+# يُرفع عند تغيير parse_dimensions → إعادة حساب width/height/extra للصفوف الموجودة
+DIMENSIONS_VERSION = 3
+
+# نفس ترتيب الأعمدة الذي تفككه الواجهات (pid, name, code, dims, notes, dxf, brep, img, created)
+PROFILE_COLUMNS = "id, name, code, dimensions, notes, dxf_path, brep_path, image_path, created_at"
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+_SIZE = re.compile(r"(\d+(?:[.,]\d+)?)\s*[x×*]\s*(\d+(?:[.,]\d+)?)", re.IGNORECASE)
+# قيمة معنونة: "W 60" / "width=60" / "H: 40" / "thk 2" — بدون "t" وحدها (تتعارض مع T5/T6 للسبيكة)
+_LABELLED = re.compile(
+    r"(?<![a-z])(width|height|thickness|thk|w|h)(?![a-z])\s*[:=]?\s*(\d+(?:[.,]\d+)?)",
+    re.IGNORECASE,
+)
+_LABEL_SLOT = {"width": 0, "w": 0, "height": 1, "h": 1, "thickness": 2, "thk": 2}
+
+
+def _num(text):
+    return float(text.replace(",", "."))
+
+
+def parse_dimensions(text):
+    """
+    (width, height, extra) من نص الأبعاد — None لما لا يوجد.
+    AxB له الأولوية ("Series 6063 60x40" → 60, 40) و extra = أول رقم بعده؛
+    بدونه تُقرأ القيم المعنونة فقط ("W 60 H 40 thk 2"). الأرقام المجردة ("slot 8")
+    لا تصبح عرضًا/ارتفاعًا — تبقى NULL.
+    """
+    text = text or ""
+    size = _SIZE.search(text)
+    if size:
+        rest = _NUMBER.search(text, size.end())
+        return _num(size.group(1)), _num(size.group(2)), _num(rest.group()) if rest else None
+    dims = [None, None, None]
+    for label, value in _LABELLED.findall(text):
+        slot = _LABEL_SLOT[label.lower()]
+        if dims[slot] is None:
+            dims[slot] = _num(value)
+    return tuple(dims)
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _fts_query(text: str) -> str:
+    """كل كلمة كـ prefix token بين علامتي تنصيص (بدون صياغة FTS خاصة من المستخدم)."""
+    tokens = re.findall(r"\w+", text or "", flags=re.UNICODE)
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
 class ProfileDB:
     def __init__(self, db_path: Path = DB_PATH):
         self.db_path = Path(db_path)
+        # اتصال مشترك طويل العمر (WAL) بدل sqlite3.connect في كل نداء
+        self.db = get_database(self.db_path)
+        self.has_fts = False
         self._ensure_db()
 
     def _ensure_db(self):
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(self.db_path) as con:
-            con.execute(SCHEMA)
+        con = self.db.conn
+        con.execute(SCHEMA)
+        missing = [c for c in DIMENSION_COLUMNS if c not in self.db.columns("profiles")]
+        version = self.db.query("PRAGMA user_version")[0][0]
+        with self.db.transaction():
+            for col in missing:
+                con.execute(f"ALTER TABLE profiles ADD COLUMN {col} {DIMENSION_COLUMNS[col]}")
+            if missing or version < DIMENSIONS_VERSION:
+                self._backfill_dimensions(con)
+                con.execute(f"PRAGMA user_version = {DIMENSIONS_VERSION}")
+        con.executescript(INDEXES)
+        self._ensure_fts(con)
+
+    def _backfill_dimensions(self, con):
+        rows = con.execute("SELECT id, dimensions FROM profiles").fetchall()
+        con.executemany(
+            "UPDATE profiles SET width_mm=?, height_mm=?, extra_mm=? WHERE id=?",
+            [(*parse_dimensions(dims), pid) for pid, dims in rows],
+        )
+
+    def _ensure_fts(self, con):
+        existed = bool(self.db.query("SELECT 1 FROM sqlite_master WHERE name='profiles_fts'"))
+        try:
+            con.executescript(FTS_SCHEMA)
+            if not existed:
+                con.execute("INSERT INTO profiles_fts(profiles_fts) VALUES ('rebuild')")
+            self.has_fts = True
+        except Exception as e:
+            # SQLite بدون FTS5 — البحث النصي يرجع إلى LIKE
+            print(f"[DB] ⚠️ FTS5 unavailable ({e}) — text search falls back to LIKE")
+
+    @staticmethod
+    def _row_params(r):
+        return (r["name"], r.get("code", ""), r.get("dimensions", ""), r.get("notes", ""),
+                r["dxf_path"], r.get("brep_path", ""), r.get("image_path", ""),
+                *parse_dimensions(r.get("dimensions", "")))
+
+    _INSERT = """
+        INSERT INTO profiles (name, code, dimensions, notes, dxf_path, brep_path, image_path,
+                              width_mm, height_mm, extra_mm)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
 
     def add_profile(self, *, name: str, code: str, dimensions: str, notes: str,
                     dxf_path: str, brep_path: str, image_path: str) -> int:
-        with sqlite3.connect(self.db_path) as con:
-            cur = con.cursor()
-            cur.execute("""
-                INSERT INTO profiles (name, code, dimensions, notes, dxf_path, brep_path, image_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (name, code, dimensions, notes, dxf_path, brep_path, image_path))
-            con.commit()
-            return cur.lastrowid
+        params = self._row_params({
+            "name": name, "code": code, "dimensions": dimensions, "notes": notes,
+            "dxf_path": dxf_path, "brep_path": brep_path, "image_path": image_path,
+        })
+        with self.db.transaction() as con:
+            return con.execute(self._INSERT, params).lastrowid
+
+    def add_profiles(self, rows) -> int:
+        """
+        إدخال دفعة بروفايلات بـ executemany داخل Transaction واحدة.
+        rows: iterable من dicts بنفس مفاتيح add_profile. يرجع عدد الصفوف المضافة
+        (الأسماء المكررة تُتجاهل بسبب UNIQUE ... ON CONFLICT IGNORE).
+        """
+        params = [self._row_params(r) for r in rows]
+        if not params:
+            return 0
+        with self.db.transaction() as con:
+            return con.executemany(self._INSERT, params).rowcount
 
     def list_profiles(self, limit: int = 200):
-        with sqlite3.connect(self.db_path) as con:
-            cur = con.cursor()
-            cur.execute("""SELECT id, name, code, dimensions, notes, dxf_path, brep_path, image_path, created_at
-                           FROM profiles ORDER BY created_at DESC LIMIT ?""", (limit,))
-            return cur.fetchall()
+        return self.db.query(f"""SELECT {PROFILE_COLUMNS}
+                                 FROM profiles ORDER BY created_at DESC LIMIT ?""", (limit,))
+
+    def profile_names(self):
+        return [row[0] for row in self.db.query("SELECT name FROM profiles")]
+
+    def count_profiles(self) -> int:
+        return self.db.query("SELECT COUNT(*) FROM profiles")[0][0]
+
+    def list_profiles_page(self, offset: int, limit: int):
+        """صفحة واحدة كـ dicts (للجدول الافتراضي) — idx_profiles_created_at."""
+        return self.db.query_dicts(f"""SELECT {PROFILE_COLUMNS} FROM profiles
+                                       ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?""",
+                                   (limit, offset))
+
+    # ==================== 🔎 البحث (كلها استعلامات على فهارس) ====================
+    def search_prefix(self, prefix: str, limit: int = 200):
+        """أسماء تبدأ بـ prefix (بدون حساسية لحالة الأحرف) — idx_profiles_name_nocase."""
+        return self.db.query(f"""SELECT {PROFILE_COLUMNS} FROM profiles
+                                 WHERE name LIKE ? ESCAPE '\\' ORDER BY name COLLATE NOCASE LIMIT ?""",
+                             (_like_prefix(prefix), limit))
+
+    def find_by_code(self, code: str, prefix: bool = False, limit: int = 200):
+        if prefix:
+            return self.db.query(f"""SELECT {PROFILE_COLUMNS} FROM profiles
+                                     WHERE code LIKE ? ESCAPE '\\' ORDER BY code COLLATE NOCASE LIMIT ?""",
+                                 (_like_prefix(code), limit))
+        return self.db.query(f"""SELECT {PROFILE_COLUMNS} FROM profiles
+                                 WHERE code = ? COLLATE NOCASE LIMIT ?""", (code, limit))
+
+    def search_dimensions(self, width=None, height=None, tol: float = 0.5,
+                          either_orientation: bool = True, limit: int = 200):
+        """
+        بروفايلات بأبعاد width × height (± tol). None = أي قيمة.
+        either_orientation=True يقبل 40x60 عند البحث عن 60x40.
+        """
+        return self.search(width=width, height=height, tol=tol,
+                           either_orientation=either_orientation, limit=limit)
+
+    def search_text(self, text: str, limit: int = 200):
+        return self.search(text=text, limit=limit)
+
+    def search(self, text: str = None, width=None, height=None, tol: float = 0.5,
+               either_orientation: bool = True, limit: int = 200):
+        """
+        بحث مركّب: نص (FTS5 على name/code/notes/dimensions) + نطاق أبعاد رقمي.
+        مثال: search("slot 8", width=60, height=60) → كل بروفايلات 60x60 التي فيها مجرى 8 mm.
+        """
+        where, params = [], []
+
+        dims = []
+        for w, h in ((width, height), (height, width)) if either_orientation else ((width, height),):
+            clause, vals = [], []
+            if w is not None:
+                clause.append("p.width_mm BETWEEN ? AND ?")
+                vals += [w - tol, w + tol]
+            if h is not None:
+                clause.append("p.height_mm BETWEEN ? AND ?")
+                vals += [h - tol, h + tol]
+            if clause:
+                dims.append("(" + " AND ".join(clause) + ")")
+                params += vals
+            if width == height:
+                break
+        if dims:
+            where.append("(" + " OR ".join(dims) + ")")
+
+        join, order = "", "p.created_at DESC"
+        query = _fts_query(text) if text else ""
+        if query and self.has_fts:
+            join = "JOIN profiles_fts f ON f.rowid = p.id"
+            where.append("profiles_fts MATCH ?")
+            params.append(query)
+            order = "f.rank"
+        elif text:
+            like = f"%{text}%"
+            where.append("(p.name LIKE ? OR p.code LIKE ? OR p.notes LIKE ? OR p.dimensions LIKE ?)")
+            params += [like] * 4
+
+        cols = ", ".join(f"p.{c.strip()}" for c in PROFILE_COLUMNS.split(","))
+        sql = f"SELECT {cols} FROM profiles p {join}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        return self.db.query(sql, params)
+
+    def quick_search(self, query: str, limit: int = 200):
+        """نص حر من مربع البحث: "60x60 slot 8" → أبعاد 60×60 + بحث نصي عن "slot 8"."""
+        query = (query or "").strip()
+        if not query:
+            return self.list_profiles(limit)
+        width = height = None
+        m = _SIZE.search(query)
+        if m:
+            width, height = (float(g.replace(",", ".")) for g in m.groups())
+            query = (query[:m.start()] + " " + query[m.end():]).strip()
+        return self.search(text=query or None, width=width, height=height, limit=limit)
 
     def delete_profile(self, profile_id: int):
         """يحذف بروفايل من قاعدة البيانات حسب الـ ID."""
-        with sqlite3.connect(self.db_path) as con:
-            cur = con.cursor()
-            cur.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
-            con.commit()
+        with self.db.transaction() as con:
+            con.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
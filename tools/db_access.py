@@ -0,0 +1,127 @@
+# tools/db_access.py — طبقة وصول موحّدة لقواعد SQLite (بروفايلات + أدوات)
+"""
+كل نداء في ProfileDB / tool_db / ToolsDB كان يفتح sqlite3.connect جديدًا ويغلقه،
+بدون WAL ولا pragmas ولا إعادة استخدام للـ statements المحضّرة.
+
+هنا:
+- اتصال طويل العمر لكل (خيط، ملف قاعدة بيانات) — sqlite3 لا يسمح بمشاركة الاتصال بين الخيوط
+  (وبعد fork في Process Pool يُنشأ اتصال جديد تلقائيًا)
+- journal_mode=WAL: القراءة لا تنتظر الكتابة
+- synchronous=NORMAL + cache_size + temp_store=MEMORY
+- cached_statements: الاستعلامات المتكررة لا يُعاد تحضيرها
+- الاتصال بوضع autocommit، و transaction() يجمع عدة كتابات في BEGIN ... COMMIT واحد
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",      # ~16 MB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+BUSY_TIMEOUT = 5.0
+CACHED_STATEMENTS = 256
+
+
+class Database:
+    """مدخل واحد لملف قاعدة بيانات؛ الاتصال الفعلي خاص بكل خيط."""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+
+    # ---------- الاتصال ----------
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(
+            str(self.db_path),
+            timeout=BUSY_TIMEOUT,
+            isolation_level=None,               # autocommit — المعاملات عبر transaction()
+            cached_statements=CACHED_STATEMENTS,
+        )
+        for pragma in PRAGMAS:
+            con.execute(pragma)
+        return con
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.con = self._connect()
+            local.pid = os.getpid()
+            local.depth = 0
+        return local.con
+
+    def close(self):
+        """إغلاق اتصال الخيط الحالي (يُعاد فتحه عند أول استخدام)."""
+        con = getattr(self._local, "con", None)
+        if con is not None and getattr(self._local, "pid", None) == os.getpid():
+            con.close()
+        self._local.__dict__.clear()
+
+    # ---------- المعاملات ----------
+    @contextmanager
+    def transaction(self, immediate: bool = True):
+        """
+        BEGIN ... COMMIT حول كل الكتابات داخل الكتلة (ROLLBACK عند الاستثناء).
+        الكتل المتداخلة تنضم للمعاملة الخارجية.
+        """
+        con = self.conn
+        local = self._local
+        if local.depth:
+            local.depth += 1
+            try:
+                yield con
+            finally:
+                local.depth -= 1
+            return
+
+        con.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        local.depth = 1
+        try:
+            yield con
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        else:
+            con.execute("COMMIT")
+        finally:
+            local.depth = 0
+
+    # ---------- اختصارات ----------
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        return self.conn.execute(sql, params)
+
+    def executemany(self, sql: str, seq) -> sqlite3.Cursor:
+        return self.conn.executemany(sql, seq)
+
+    def query(self, sql: str, params=()):
+        return self.conn.execute(sql, params).fetchall()
+
+    def query_dicts(self, sql: str, params=()):
+        cur = self.conn.execute(sql, params)
+        cols = [c[0] for c in cur.description]
+        return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+    def columns(self, table: str) -> set:
+        return {row[1] for row in self.query(f"PRAGMA table_info({table})")}
+
+
+_databases = {}
+_registry_lock = threading.Lock()
+
+
+def get_database(db_path) -> Database:
+    """Database مشترك لكل ملف (نفس الكائن لكل المستدعين في العملية)."""
+    key = str(Path(db_path).resolve())
+    with _registry_lock:
+        db = _databases.get(key)
+        if db is None:
+            db = _databases[key] = Database(db_path)
+    return db
@@ -4,8 +4,7 @@
 # ===========================================
 
 from OCC.Core.gp import gp_Pnt
-from OCC.Core.Bnd import Bnd_Box
-from OCC.Core.BRepBndLib import brepbndlib_Add
+from tools.bbox_service import get_extents
 from OCC.Core.AIS import AIS_LengthDimension
 from OCC.Core.TCollection import TCollection_ExtendedString
 
@@ -24,9 +23,7 @@ def add_measurements_between_edges_and_center(display, dim_mgr, shape, group="pr
         return
 
     # 🧭 حساب الـ Bounding Box
-    bbox = Bnd_Box()
-    brepbndlib_Add(shape, bbox)
-    xmin, ymin, zmin, xmax, ymax, zmax = bbox.Get()
+    xmin, ymin, zmin, xmax, ymax, zmax = get_extents(shape)
 
     # 📍 مركز الشكل
     center = gp_Pnt(
@@ -4,8 +4,8 @@ from OCC.Core.gp import gp_Pnt, gp_Dir, gp_Ax2
 from OCC.Core.Geom import Geom_CartesianPoint
 from OCC.Core.AIS import AIS_Line, AIS_TextLabel
 from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
-from OCC.Core.Bnd import Bnd_Box
-from OCC.Core.BRepBndLib import brepbndlib
+
+from tools.bbox_service import get_extents
 
 # ==================== 🎨 ألوان القياسات ====================
 _DIM_COLOR_FINAL = Quantity_Color(1.0, 0.0, 0.0, Quantity_TOC_RGB)     # أحمر - للقياسات النهائية
@@ -20,10 +20,7 @@ def _get_z_level_for_shape(shape, extra_lift: float = 10.0):
     """يرجع مستوى Z أعلى المجسم بقليل لعرض القياسات فوق الشكل."""
     if shape is None or shape.IsNull():
         return extra_lift
-    box = Bnd_Box()
-    brepbndlib.Add(shape, box)
-    xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
-    return zmax + extra_lift
+    return get_extents(shape)[5] + extra_lift
 
 
 # ==================== 📝 أداة رسم البُعد الأساسية ====================
@@ -74,9 +71,7 @@ def measure_shape(display, shape):
     """يرسم قياسات الطول والعرض والارتفاع للشكل، مرفوعة فوقه."""
     if shape is None or shape.IsNull():
         return
-    box = Bnd_Box()
-    brepbndlib.Add(shape, box)
-    xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
+    xmin, ymin, zmin, xmax, ymax, zmax = get_extents(shape)
 
     z_level = zmax + 10.0
 
@@ -92,12 +87,7 @@ def hole_reference_dimensions(display, x, y, z, shape=None, offset_above: float=
     """
     z_level = z + offset_above
     if shape:
-        from OCC.Core.Bnd import Bnd_Box
-        from OCC.Core.BRepBndLib import brepbndlib
-        box = Bnd_Box()
-        brepbndlib.Add(shape, box)
-        xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
-        z_level = zmax + offset_above
+        z_level = get_extents(shape)[5] + offset_above
 
     # X reference line
     draw_dimension(
@@ -0,0 +1,99 @@
+# tools/dxf_flatten.py — تحويل كائنات DXF إلى مصفوفات رؤوس NumPy (بدون Qt وبدون OCC)
+"""
+مرور واحد على الـ modelspace: كل كائن (LINE / ARC / CIRCLE / ELLIPSE / SPLINE /
+LWPOLYLINE / POLYLINE مع bulge / INSERT ...) يُحوَّل إلى ezdxf.path ثم يُقسَّم
+بسماحية ارتفاع وتر ثابتة → مصفوفة (N, 2) لكل مسار.
+
+الحدود تُحسب متجهة على كل الرؤوس دفعة واحدة، والنتيجة تصلح لأي راسم:
+QPainterPath في الواجهة، أو Rasterizer خالص في الوضع Headless.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# أقصى ارتفاع وتر (mm) عند تقسيم المنحنيات للمعاينة
+PREVIEW_CHORD_TOL = 0.05
+
+
+@dataclass
+class FlatDrawing:
+    polylines: list = field(default_factory=list)   # [np.ndarray (N, 2), ...]
+    bounds: tuple = None                             # (min_x, min_y, max_x, max_y) أو None
+    skipped: dict = field(default_factory=dict)      # dxftype -> عدد
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.polylines
+
+    def vertex_count(self) -> int:
+        return sum(len(p) for p in self.polylines)
+
+    def segments(self) -> np.ndarray:
+        """كل المقاطع كمصفوفة (M, 4) = x1, y1, x2, y2 — للرسم الدفعي."""
+        if not self.polylines:
+            return np.empty((0, 4), dtype=float)
+        return np.vstack([np.hstack([p[:-1], p[1:]]) for p in self.polylines if len(p) >= 2])
+
+
+def _entity_paths(entity):
+    """ezdxf.path لكل كائن؛ الـ INSERT يُفكك لكائناته الافتراضية."""
+    from ezdxf import path as ezpath
+
+    if entity.dxftype() == "INSERT":
+        for sub in entity.virtual_entities():
+            yield from _entity_paths(sub)
+        return
+    yield ezpath.make_path(entity)
+
+
+def flatten_entities(entities, tol: float = PREVIEW_CHORD_TOL) -> FlatDrawing:
+    drawing = FlatDrawing()
+    for entity in entities:
+        try:
+            for p in _entity_paths(entity):
+                # المسارات متعددة الأجزاء (مثل LWPOLYLINE بعدة حلقات) تُقسم لكل جزء
+                for sub in p.sub_paths() if p.has_sub_paths else (p,):
+                    pts = np.asarray([(v.x, v.y) for v in sub.flattening(tol)], dtype=float)
+                    if len(pts) >= 2:
+                        drawing.polylines.append(pts)
+        except (TypeError, ValueError, AttributeError):
+            # نوع لا يملك تمثيل Path (TEXT، DIMENSION ...)
+            kind = entity.dxftype()
+            drawing.skipped[kind] = drawing.skipped.get(kind, 0) + 1
+
+    if drawing.polylines:
+        allpts = np.vstack(drawing.polylines)
+        mn, mx = allpts.min(axis=0), allpts.max(axis=0)
+        drawing.bounds = (float(mn[0]), float(mn[1]), float(mx[0]), float(mx[1]))
+    return drawing
+
+
+def flatten_dxf(dxf_path: str, tol: float = PREVIEW_CHORD_TOL) -> FlatDrawing:
+    import ezdxf
+    doc = ezdxf.readfile(dxf_path)
+    return flatten_entities(doc.modelspace(), tol)
+
+
+def fit_transform(bounds, width: int, height: int, margin: float = 0.05):
+    """
+    (scale, ox, oy) لتحويل إحداثيات الرسم إلى بكسلات (Y للأسفل) مع توسيط وهامش.
+    px = ox + x * scale ، py = oy - y * scale
+    """
+    if bounds is None:
+        bounds = (-10.0, -10.0, 10.0, 10.0)
+    min_x, min_y, max_x, max_y = bounds
+    w = max(max_x - min_x, 1e-9)
+    h = max(max_y - min_y, 1e-9)
+    scale = min(width / w, height / h) * (1.0 - 2 * margin)
+    ox = (width - w * scale) / 2 - min_x * scale
+    oy = (height + h * scale) / 2 + min_y * scale
+    return scale, ox, oy
+
+
+def to_pixels(drawing: FlatDrawing, width: int, height: int, margin: float = 0.05):
+    """كل المسارات بإحداثيات البكسل (تحويل متجه واحد لكل مسار)."""
+    scale, ox, oy = fit_transform(drawing.bounds, width, height, margin)
+    factor = np.array([scale, -scale])
+    offset = np.array([ox, oy])
+    return [p * factor + offset for p in drawing.polylines]
@@ -0,0 +1,243 @@
+# tools/edge_chaining.py — إعادة بناء Wires و Faces من حواف DXF المتفرقة
+"""
+ملفات DXF تصل كحواف غير متصلة (LINE / ARC / ...)، والبروفايل متعدد المسارات
+(جلد خارجي + تجاويف داخلية) لا يصبح Face صالحًا للإكسترود.
+
+الخطوات:
+1) Spatial hash على نقاط أطراف الحواف → مطابقة O(n) بدل البحث الثنائي
+2) تتبّع السلاسل حتى تعود لنقطة البداية → Wires مغلقة
+3) تصنيف المسارات: المساحة (Shoelace) + الاحتواء (نقطة داخل مضلع)
+   العمق الزوجي = حدود خارجية، الفردي = ثقب داخل أصغر مسار يحتويه
+4) بناء Face لكل حد خارجي مع ثقوبه — جاهز لـ extrude_shape
+"""
+
+from collections import defaultdict
+
+import numpy as np
+from OCC.Core.BRep import BRep_Tool, BRep_Builder
+from OCC.Core.BRepAdaptor import BRepAdaptor_Curve
+from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeFace
+from OCC.Core.BRepTools import BRepTools_WireExplorer
+from OCC.Core.ShapeExtend import ShapeExtend_WireData
+from OCC.Core.ShapeFix import ShapeFix_Wire, ShapeFix_Face
+from OCC.Core.TopAbs import TopAbs_EDGE, TopAbs_WIRE, TopAbs_REVERSED
+from OCC.Core.TopExp import TopExp_Explorer, topexp
+from OCC.Core.TopoDS import TopoDS_Compound, topods
+
+DEFAULT_TOL = 1e-3
+SAMPLES_PER_EDGE = 16
+
+
+# ==================== 🔑 Spatial Hash ====================
+class _EndpointHash:
+    """شبكة خلايا بحجم tol: كل نقطة تُبحث في خليتها والخلايا الثمانية المجاورة فقط."""
+
+    def __init__(self, tol):
+        self.tol = tol
+        self.cells = defaultdict(list)
+
+    def _cell(self, p):
+        return int(np.floor(p[0] / self.tol)), int(np.floor(p[1] / self.tol))
+
+    def add(self, p, item):
+        self.cells[self._cell(p)].append((p, item))
+
+    def near(self, p):
+        cx, cy = self._cell(p)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for q, item in self.cells.get((cx + dx, cy + dy), ()):
+                    if abs(q[0] - p[0]) <= self.tol and abs(q[1] - p[1]) <= self.tol:
+                        yield item
+
+
+def _endpoints(edge):
+    first = BRep_Tool.Pnt(topexp.FirstVertex(edge, True))
+    last = BRep_Tool.Pnt(topexp.LastVertex(edge, True))
+    return (first.X(), first.Y()), (last.X(), last.Y())
+
+
+def _explode(shape, kind):
+    exp = TopExp_Explorer(shape, kind)
+    while exp.More():
+        yield exp.Current()
+        exp.Next()
+
+
+# ==================== 🔗 تسلسل الحواف ====================
+def chain_edges(shapes, tol: float = DEFAULT_TOL):
+    """
+    تجميع الحواف في Wires.
+    Wires المغلقة القادمة جاهزة (مثل LWPOLYLINE) تُستخدم كما هي.
+    يرجع (closed_wires, open_count).
+    """
+    closed = []
+    edges = []
+    for shape in shapes:
+        if shape is None or shape.IsNull():
+            continue
+        if shape.ShapeType() == TopAbs_WIRE and BRep_Tool.IsClosed(shape):
+            closed.append(topods.Wire(shape))
+            continue
+        for e in _explode(shape, TopAbs_EDGE):
+            edges.append(topods.Edge(e))
+
+    ends = [_endpoints(e) for e in edges]
+    index = _EndpointHash(tol)
+    for i, (a, b) in enumerate(ends):
+        # حافة مغلقة بذاتها (دائرة كاملة)
+        if abs(a[0] - b[0]) <= tol and abs(a[1] - b[1]) <= tol:
+            continue
+        index.add(a, (i, 0))
+        index.add(b, (i, 1))
+
+    used = [False] * len(edges)
+    open_count = 0
+    for start in range(len(edges)):
+        if used[start]:
+            continue
+        used[start] = True
+        chain = [edges[start]]
+        origin, tip = ends[start]
+        while not (abs(tip[0] - origin[0]) <= tol and abs(tip[1] - origin[1]) <= tol):
+            nxt = next(((i, side) for i, side in index.near(tip) if not used[i]), None)
+            if nxt is None:
+                break
+            i, side = nxt
+            used[i] = True
+            # الحافة الموصولة من نهايتها تُعكس → كل السلسلة باتجاه واحد
+            chain.append(edges[i] if side == 0 else topods.Edge(edges[i].Reversed()))
+            tip = ends[i][1 - side]
+        else:
+            wire = _make_wire(chain, tol)
+            if wire is not None:
+                closed.append(wire)
+            continue
+        open_count += 1
+
+    if open_count:
+        print(f"[CHAIN] ⚠️ {open_count} open chain(s) ignored")
+    return closed, open_count
+
+
+def _make_wire(edges, tol):
+    """
+    الحواف بترتيب السلسلة واتجاهها → ShapeExtend_WireData → ShapeFix_Wire.
+    بدون BRepBuilderAPI_MakeWire: فجوة أكبر من سماحية الرأس (وحتى tol) تفشل هناك
+    بـ DisconnectedWire، بينما FixConnected يدمج الرؤوس المتقاربة ويغلق المسار.
+    """
+    data = ShapeExtend_WireData()
+    for e in edges:
+        data.Add(e)
+    fixer = ShapeFix_Wire()
+    fixer.Load(data)
+    fixer.SetPrecision(tol)
+    fixer.SetMaxTolerance(tol)
+    fixer.FixConnected(tol)
+    fixer.FixClosed(tol)
+    wire = fixer.Wire()
+    return None if wire.IsNull() else wire
+
+
+# ==================== 🧭 تصنيف المسارات ====================
+def _polygon(wire) -> np.ndarray:
+    """
+    تقريب المسار بمضلع (نقاط على كل حافة) للمساحة والاحتواء.
+    الحواف بترتيب المسار (BRepTools_WireExplorer)، والحافة المعكوسة تُعيَّن من آخرها
+    — وإلا يتقاطع المضلع مع نفسه وتفسد المساحة والاحتواء.
+    """
+    pts = []
+    exp = BRepTools_WireExplorer(wire)
+    while exp.More():
+        edge = exp.Current()
+        curve = BRepAdaptor_Curve(edge)
+        first, last = curve.FirstParameter(), curve.LastParameter()
+        if edge.Orientation() == TopAbs_REVERSED:
+            first, last = last, first
+        for t in np.linspace(first, last, SAMPLES_PER_EDGE, endpoint=False):
+            p = curve.Value(float(t))
+            pts.append((p.X(), p.Y()))
+        exp.Next()
+    return np.asarray(pts, dtype=float)
+
+
+def _area(poly) -> float:
+    x, y = poly[:, 0], poly[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def _contains(poly, p) -> bool:
+    """نقطة داخل مضلع (Ray casting) — متجه بالكامل."""
+    x, y = poly[:, 0], poly[:, 1]
+    x2, y2 = np.roll(x, -1), np.roll(y, -1)
+    crosses = (y > p[1]) != (y2 > p[1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xs = x + (p[1] - y) * (x2 - x) / (y2 - y)
+    return bool(np.count_nonzero(crosses & (p[0] < xs)) % 2)
+
+
+def classify_loops(wires):
+    """
+    يرجع قائمة [(outer_wire, [hole_wires...]), ...].
+    المسارات مرتبة تنازليًا بالمساحة، والأب = أصغر مسار أكبر منه يحتويه.
+    """
+    loops = []
+    for w in wires:
+        poly = _polygon(w)
+        if len(poly) >= 3:
+            loops.append((w, poly, _area(poly)))
+    loops.sort(key=lambda item: -item[2])
+
+    parents = [-1] * len(loops)
+    depth = [0] * len(loops)
+    for i, (_, poly, _) in enumerate(loops):
+        probe = poly[0]
+        for j in range(i - 1, -1, -1):
+            if _contains(loops[j][1], probe):
+                parents[i] = j
+                depth[i] = depth[j] + 1
+                break
+
+    groups = {}
+    for i, (w, _, _) in enumerate(loops):
+        if depth[i] % 2 == 0:
+            groups[i] = (w, [])
+    for i, (w, _, _) in enumerate(loops):
+        if depth[i] % 2 == 1 and parents[i] in groups:
+            groups[parents[i]][1].append(w)
+    return list(groups.values())
+
+
+# ==================== 🧱 بناء الأوجه ====================
+def build_faces(shapes, tol: float = DEFAULT_TOL):
+    """
+    حواف/Wires متفرقة → Face واحد (أو Compound من الأوجه عند وجود عدة بروفايلات).
+    يرجع None إذا لم يوجد أي مسار مغلق.
+    """
+    wires, _ = chain_edges(shapes, tol)
+    if not wires:
+        return None
+
+    faces = []
+    for outer, holes in classify_loops(wires):
+        mk = BRepBuilderAPI_MakeFace(outer, True)
+        if not mk.IsDone():
+            continue
+        for hole in holes:
+            mk.Add(hole)
+        fix = ShapeFix_Face(mk.Face())
+        fix.FixOrientation()
+        fix.Perform()
+        faces.append(fix.Face())
+        print(f"[CHAIN] ✅ face with {len(holes)} hole(s)")
+
+    if not faces:
+        return None
+    if len(faces) == 1:
+        return faces[0]
+    builder = BRep_Builder()
+    compound = TopoDS_Compound()
+    builder.MakeCompound(compound)
+    for f in faces:
+        builder.Add(compound, f)
+    return compound
@@ -0,0 +1,149 @@
+# tools/extrusion.py — واجهة إكسترود موحّدة لأي محور أو اتجاه
+"""
+بدل أن تكتب كل نافذة Translate ثم Prism بمنطق محاور خاص بها (مع نسخة كاملة من الشكل
+عبر BRepBuilderAPI_Transform)، كل الإكسترود يمر من هنا:
+
+- direction_vector : "X" / "Y" / "Z" / "-Z" ... أو (dx, dy, dz) أو gp_Dir / gp_Vec
+- extrude          : Prism بطول distance على الاتجاه، مع زاوية Draft اختيارية
+- place / placed   : تموضع بدون نسخ عبر TopLoc_Location (shape.Moved)
+
+التحويلات الصلبة (إزاحة/دوران) تُطبق كـ Location فقط؛ التحجيم وحده يحتاج نسخة.
+"""
+
+import math
+
+from OCC.Core.gp import gp_Vec, gp_Dir, gp_Trsf, gp_Ax1, gp_Pnt
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakePrism
+
+from tools.shape_cache import memoize_shape
+
+_AXES = {
+    "X": (1.0, 0.0, 0.0),
+    "Y": (0.0, 1.0, 0.0),
+    "Z": (0.0, 0.0, 1.0),
+}
+
+
+# ==================== 🧭 الاتجاهات ====================
+def direction_vector(direction="Y") -> gp_Vec:
+    """متجه وحدة من اسم محور (مع إشارة اختيارية) أو ثلاثية أو gp_Dir / gp_Vec."""
+    if isinstance(direction, gp_Dir):
+        return gp_Vec(direction)
+    if isinstance(direction, gp_Vec):
+        return gp_Vec(gp_Dir(direction))
+    if isinstance(direction, str):
+        name = direction.strip().upper()
+        sign = -1.0 if name.startswith("-") else 1.0
+        axis = _AXES.get(name.lstrip("+-"))
+        if axis is None:
+            raise ValueError(f"Unknown extrude axis: {direction}")
+        return gp_Vec(*(sign * c for c in axis))
+    dx, dy, dz = (float(c) for c in direction)
+    return gp_Vec(gp_Dir(dx, dy, dz))
+
+
+def _direction_key(direction):
+    v = direction_vector(direction)
+    return (round(v.X(), 6), round(v.Y(), 6), round(v.Z(), 6))
+
+
+# ==================== 📍 التموضع بدون نسخ ====================
+def translation(dx, dy, dz) -> gp_Trsf:
+    trsf = gp_Trsf()
+    trsf.SetTranslation(gp_Vec(float(dx), float(dy), float(dz)))
+    return trsf
+
+
+def rotation(axis: str, angle_deg: float, origin=(0.0, 0.0, 0.0)) -> gp_Trsf:
+    trsf = gp_Trsf()
+    trsf.SetRotation(gp_Ax1(gp_Pnt(*origin), gp_Dir(direction_vector(axis))), math.radians(angle_deg))
+    return trsf
+
+
+def placed(shape, trsf: gp_Trsf):
+    """نفس الشكل (بدون نسخ الـ topology) بموضع جديد عبر TopLoc_Location."""
+    if shape is None or shape.IsNull():
+        return shape
+    return shape.Moved(TopLoc_Location(trsf))
+
+
+def place(shape, dx=0.0, dy=0.0, dz=0.0):
+    return placed(shape, translation(dx, dy, dz))
+
+
+# ==================== 🧱 الإكسترود ====================
+def _single_face(shape):
+    from OCC.Core.TopExp import TopExp_Explorer
+    from OCC.Core.TopoDS import topods
+    exp = TopExp_Explorer(shape, TopAbs_FACE)
+    if not exp.More():
+        return None
+    face = topods.Face(exp.Current())
+    exp.Next()
+    return None if exp.More() else face
+
+
+def _draft_prism(shape, distance, vec, draft_deg):
+    """
+    Prism بزاوية Draft عبر LocOpe_DPrism — يعمل على وجه مستوٍ واحد والاتجاه = ناظم الوجه.
+    يرجع None إذا لم تتحقق الشروط ليستخدم المستدعي Prism عادي.
+    """
+    from OCC.Core.LocOpe import LocOpe_DPrism
+    from OCC.Core.BRepAdaptor import BRepAdaptor_Surface
+    from OCC.Core.GeomAbs import GeomAbs_Plane
+
+    face = _single_face(shape)
+    if face is None:
+        return None
+    surf = BRepAdaptor_Surface(face)
+    if surf.GetType() != GeomAbs_Plane:
+        return None
+    normal = gp_Vec(surf.Plane().Axis().Direction())
+    if face.Orientation() == TopAbs_REVERSED:
+        normal.Reverse()
+    if not normal.IsParallel(vec, 1e-6):
+        return None
+    height = distance if normal.Dot(vec) > 0 else -distance
+    dprism = LocOpe_DPrism(face, height, math.radians(draft_deg))
+    if not dprism.IsDone():
+        return None
+    return dprism.Shape()
+
+
+@memoize_shape()
+def _prism(shape, distance, direction_key, draft_deg):
+    vec = gp_Vec(*direction_key)
+    if abs(draft_deg) > 1e-9:
+        try:
+            drafted = _draft_prism(shape, distance, vec, draft_deg)
+            if drafted is not None and not drafted.IsNull():
+                return drafted
+        except Exception as e:
+            print(f"[EXTRUDE] ⚠️ draft failed ({e})")
+        print("[EXTRUDE] ⚠️ draft needs a single planar face normal to the axis — straight prism used")
+    return BRepPrimAPI_MakePrism(shape, vec.Multiplied(float(distance))).Shape()
+
+
+def extrude(shape, distance: float, direction="Y", draft_deg: float = 0.0, placement: gp_Trsf = None):
+    """
+    إكسترود الشكل بطول distance على direction.
+    placement (اختياري) يُطبق على الناتج كـ Location فقط بدون نسخة إضافية.
+    """
+    if shape is None or shape.IsNull():
+        return None
+    result = _prism(shape, float(distance), _direction_key(direction), float(draft_deg))
+    if placement is not None and result is not None:
+        result = placed(result, placement)
+    return result
+
+
+def extrude_from_origin(shape, distance: float, direction="Y", draft_deg: float = 0.0):
+    """نقل الحد الأدنى للـ bbox إلى (0,0,0) كـ Location ثم الإكسترود."""
+    from tools.bbox_service import get_extents
+
+    if shape is None or shape.IsNull():
+        return None
+    xmin, ymin, zmin, _, _, _ = get_extents(shape)
+    return extrude(place(shape, -xmin, -ymin, -zmin), distance, direction, draft_deg)
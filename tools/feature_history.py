@@ -0,0 +1,175 @@
+# tools/feature_history.py — سجل العمليات مع إعادة بناء تزايدية (Feature History)
+"""
+كل عملية (Hole / Extrude / BoxCut ...) تُخزَّن كعقدة تحمل:
+- نوع العملية ومعاملاتها
+- مفتاح محتوى (hash) يعتمد على مفتاح العقدة السابقة + المعاملات
+- الشكل الناتج TopoDS_Shape بعد تطبيقها
+
+عند تعديل أو حذف عقدة يُعاد تنفيذ العمليات التي بعدها فقط،
+وكل ما قبلها يُستخدم من الذاكرة كما هو.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+
+# ==================== 🧱 منفذو العمليات ====================
+def _build_hole(shape, params):
+    from tools.geometry_ops import add_holes
+    return add_holes(shape, [params])
+
+
+def _build_pattern(shape, params):
+    from tools.geometry_ops import add_hole_pattern
+    return add_hole_pattern(shape, params)
+
+
+def _build_extrude(shape, params):
+    from tools.geometry_ops import extrude_shape
+    if params.get("heal"):
+        # نفس التبسيط الذي سبق الإكسترود الأصلي، وإلا يختلف الـ Solid عند إعادة البناء
+        from tools.shape_healing import heal_shape
+        shape, _report = heal_shape(shape)
+    return extrude_shape(
+        shape, float(params.get("height", 0)),
+        params.get("axis", "Y") or "Y", float(params.get("draft", 0.0)),
+    )
+
+
+def _build_box_cut(shape, params):
+    from tools.geometry_ops import apply_box_cut
+    return apply_box_cut(
+        shape,
+        float(params.get("x", 0)), float(params.get("y", 0)), float(params.get("z", 0)),
+        float(params.get("dx", 0)), float(params.get("dy", 0)), float(params.get("dz", 0)),
+    )
+
+
+OP_BUILDERS: Dict[str, Callable] = {
+    "hole": _build_hole,
+    "pattern": _build_pattern,
+    "extrude": _build_extrude,
+    "boxcut": _build_box_cut,
+}
+
+
+def register_builder(op_type: str, builder: Callable):
+    """تسجيل منفذ لنوع عملية جديد: builder(shape, params) -> shape"""
+    OP_BUILDERS[op_type.lower()] = builder
+
+
+def _op_key(parent_key: str, op_type: str, params: dict) -> str:
+    payload = json.dumps({"type": op_type.lower(), "params": params}, sort_keys=True, default=str)
+    return hashlib.sha1((parent_key + "|" + payload).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FeatureNode:
+    node_id: int
+    op_type: str
+    params: dict
+    key: str = ""
+    shape: object = None
+
+
+@dataclass
+class FeatureHistory:
+    base_shape: object = None
+    base_key: str = ""
+    nodes: List[FeatureNode] = field(default_factory=list)
+    last_rebuilt: int = 0
+    _next_id: int = 1
+
+    # ---------- API ----------
+    def set_base(self, shape):
+        """تعيين الشكل الأساسي (البروفايل) وإعادة بناء كل السلسلة إن وُجدت عمليات."""
+        self.base_shape = shape
+        self.base_key = hashlib.sha1(f"base:{hash(shape) if shape is not None else 0}".encode()).hexdigest()
+        if self.nodes:
+            self.regenerate(0)
+
+    def append(self, op_type: str, params: dict, shape=None) -> FeatureNode:
+        """
+        إضافة عملية في نهاية السلسلة.
+        إذا مُرِّر الشكل الناتج (لأن النافذة نفّذت العملية مسبقًا) يُخزَّن مباشرة بدون إعادة حساب.
+        """
+        parent_key = self.nodes[-1].key if self.nodes else self.base_key
+        node = FeatureNode(self._next_id, op_type, dict(params))
+        node.key = _op_key(parent_key, op_type, node.params)
+        self._next_id += 1
+        self.nodes.append(node)
+        prev_shape = self.nodes[-2].shape if len(self.nodes) > 1 else self.base_shape
+        if shape is not None:
+            node.shape = shape
+        elif prev_shape is not None:
+            self.regenerate(len(self.nodes) - 1)
+        return node
+
+    def update(self, node_id: int, params: dict):
+        """تعديل معاملات عملية وإعادة بناء ما بعدها فقط."""
+        idx = self._index_of(node_id)
+        if idx is None:
+            return None
+        self.nodes[idx].params.update(params)
+        return self.regenerate(idx)
+
+    def remove(self, node_id: int):
+        """حذف عملية وإعادة بناء العمليات التالية لها فقط."""
+        idx = self._index_of(node_id)
+        if idx is None:
+            return None
+        del self.nodes[idx]
+        if idx >= len(self.nodes):
+            self.last_rebuilt = 0
+            return self.result()
+        return self.regenerate(idx)
+
+    def result(self):
+        """الشكل النهائي بعد آخر عملية."""
+        if self.nodes:
+            return self.nodes[-1].shape
+        return self.base_shape
+
+    def shape_at(self, node_id: int):
+        idx = self._index_of(node_id)
+        return None if idx is None else self.nodes[idx].shape
+
+    # ---------- إعادة البناء ----------
+    def regenerate(self, start: int = 0):
+        """
+        إعادة تنفيذ العمليات من الفهرس start حتى النهاية.
+        العقدة التي لم يتغير مفتاحها وشكلها موجود تُستخدم كما هي.
+        """
+        self.last_rebuilt = 0
+        parent_key = self.nodes[start - 1].key if start > 0 else self.base_key
+        shape = self.nodes[start - 1].shape if start > 0 else self.base_shape
+
+        for node in self.nodes[start:]:
+            key = _op_key(parent_key, node.op_type, node.params)
+            if key != node.key or node.shape is None:
+                if shape is None:
+                    print(f"[HISTORY] ⚠️ لا يوجد شكل سابق لإعادة بناء {node.op_type} #{node.node_id}")
+                    return None
+                builder = OP_BUILDERS.get(node.op_type.lower())
+                if builder is None:
+                    print(f"[HISTORY] ⚠️ لا يوجد منفذ لنوع العملية: {node.op_type}")
+                    return None
+                node.shape = builder(shape, node.params)
+                node.key = key
+                self.last_rebuilt += 1
+                if node.shape is None or node.shape.IsNull():
+                    print(f"[HISTORY] ❌ فشل إعادة بناء {node.op_type} #{node.node_id}")
+                    return None
+            parent_key = node.key
+            shape = node.shape
+
+        print(f"[HISTORY] ♻️ Rebuilt {self.last_rebuilt}/{len(self.nodes)} operations")
+        return shape
+
+    def _index_of(self, node_id: int) -> Optional[int]:
+        for i, n in enumerate(self.nodes):
+            if n.node_id == node_id:
+                return i
+        return None
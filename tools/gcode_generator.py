@@ -3,11 +3,13 @@
 #  Purpose: توليد G-Code لعمليات الحفر والإكسترود من شجرة العمليات
 # ==============================================================
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import List, Optional
 import time
 
+from tools.tool_db import DIA_TOLERANCE, ToolLibrary
+
 
 @dataclass
 class GCodeSettings:
@@ -17,6 +19,9 @@ class GCodeSettings:
     spindle: Optional[int] = 8000
     safe_z: float = 5.0
     comment: str = "Generated by Syriantech CAD"
+    auto_tool: bool = True   # اختيار الأداة وبيانات القطع من مكتبة الأدوات لكل ثقب/نمط
+    material: str = "aluminum"
+    step_down: float = 1.0   # عمق كل دورة في التفريغ الحلزوني
 
 
 @dataclass
@@ -55,11 +60,39 @@ def generate_program(operations: List[dict], settings: Optional[GCodeSettings] =
         lines.append(f"M3 S{settings.spindle}")
     lines.append("")
 
+    library = _tool_library() if settings.auto_tool else None
+    current_tool = None
+
     for i, op in enumerate(operations, 1):
         t = op.get("type", "").lower()
         lines.append(f"(--- Operation #{i}: {op.get('type','?')} ---)")
-        if t == "hole":
-            lines.extend(_generate_hole_block(op, settings))
+        if t in ("hole", "pattern"):
+            op_settings = settings
+            bore_dia = None
+            tool = _resolve_tool(op, library)
+            if tool is not None:
+                data = library.cutting_data(tool, settings.material)
+                if tool.id != current_tool:
+                    lines.append(f"(Tool: {tool.name} D{tool.diameter:g} {tool.type})")
+                    lines.append(f"T{tool.id} M6")
+                    current_tool = tool.id
+                    if data["rpm"]:
+                        lines.append(f"M3 S{int(data['rpm'])}")
+                if tool.diameter < float(op.get("dia", 0)) - DIA_TOLERANCE:
+                    # أداة أصغر من الثقب → تفريغ حلزوني بدل غطس مستقيم يترك الثقب ناقصًا
+                    bore_dia = tool.diameter
+                    op_settings = replace(settings, feed=data["feed"] or settings.feed,
+                                          step_down=data["step_down"] or settings.step_down)
+                else:
+                    op_settings = replace(settings, feed=data["plunge_feed"] or settings.feed)
+            elif library is not None:
+                lines.append(f"(⚠️ No tool in library for dia={op.get('dia')} depth={op.get('depth')})")
+            if bore_dia is not None:
+                lines.extend(_generate_helix_block(op, bore_dia, op_settings))
+            elif t == "hole":
+                lines.extend(_generate_hole_block(op, op_settings))
+            else:
+                lines.extend(_generate_pattern_block(op, op_settings))
         elif t == "extrude":
             lines.extend(_generate_extrude_block(op, settings))
         else:
@@ -72,6 +105,30 @@ def generate_program(operations: List[dict], settings: Optional[GCodeSettings] =
     return "\n".join(lines)
 
 
+def _tool_library():
+    """مكتبة الأدوات إن كانت متاحة — وإلا G-code بالإعدادات العامة فقط."""
+    try:
+        return ToolLibrary()
+    except Exception as e:
+        print(f"[GCODE] ⚠️ Tool library unavailable: {e}")
+        return None
+
+
+def _resolve_tool(op, library):
+    """الأداة المسمّاة في العملية إن وُجدت، وإلا أفضل أداة للقطر والعمق (استعلام مفهرس)."""
+    if library is None:
+        return None
+    name = op.get("tool")
+    if name and name != "Unknown":
+        tool = library.find_by_name(name)
+        if tool is not None:
+            return tool
+    try:
+        return library.best_tool_for_hole(float(op.get("dia", 0)), float(op.get("depth", 0)))
+    except (TypeError, ValueError):
+        return None
+
+
 def _generate_hole_block(op, s):
     x, y, z = op.get("x", 0), op.get("y", 0), op.get("z", 0)
     dia, depth, axis = op.get("dia", 0), op.get("depth", 0), op.get("axis", "Z")
@@ -92,6 +149,82 @@ def _generate_hole_block(op, s):
     return lines
 
 
+# مستوى العمل لكل محور حفر: الدورة G81 تحفر عموديًا على المستوى المختار
+_DRILL_PLANES = {"Z": "G17", "Y": "G18", "X": "G19"}
+
+
+def _generate_pattern_block(op, s):
+    """كل ثقوب النمط ككتلة واحدة بدورة الحفر G81 بدل حركات منفصلة لكل ثقب."""
+    from tools.hole_pattern import pattern_positions
+
+    pts = pattern_positions(op)
+    dia, depth = op.get("dia", 0), op.get("depth", 0)
+    axis = str(op.get("axis", "Z")).upper()
+    if axis not in _DRILL_PLANES:
+        return [f"(⚠️ Unsupported pattern axis: {axis})"]
+
+    lines = []
+    lines.append(f"(Pattern {op.get('kind', '?')} x{len(pts)} dia={dia}, depth={depth}, axis={axis})")
+    if len(pts) == 0:
+        return lines
+    lines.append(_DRILL_PLANES[axis])
+    lines.append("G98")
+    others = [a for a in "XYZ" if a != axis]
+    cols = ["XYZ".index(a) for a in others]
+    for p in pts:
+        pos = " ".join(f"{a}{_fmt(p[c])}" for a, c in zip(others, cols))
+        lines.append(f"G81 {pos} {axis}-{_fmt(abs(depth))} R{s.safe_z} F{s.feed}")
+    lines.append("G80")
+    lines.append("G17")
+    return lines
+
+
+# حرف إزاحة المركز (I/J/K) لكل محور في أقواس G2/G3
+_ARC_OFFSETS = {"X": "I", "Y": "J", "Z": "K"}
+
+
+def _generate_helix_block(op, tool_dia, s):
+    """
+    تفريغ ثقب (أو كل ثقوب النمط) بأداة أصغر من قطره: دوائر G3 حلزونية
+    نصف قطرها (dia - tool_dia) / 2 تنزل step_down في كل دورة، ثم دورة تنظيف في القاع.
+    """
+    dia, depth = float(op.get("dia", 0)), abs(float(op.get("depth", 0)))
+    axis = str(op.get("axis", "Z")).upper()
+    if axis not in _DRILL_PLANES:
+        return [f"(⚠️ Unsupported axis: {axis})"]
+    if str(op.get("type", "")).lower() == "pattern":
+        from tools.hole_pattern import pattern_positions
+        centers = [tuple(p) for p in pattern_positions(op)]
+    else:
+        centers = [(op.get("x", 0), op.get("y", 0), op.get("z", 0))]
+
+    u, v = [a for a in "XYZ" if a != axis]
+    iu, iv = "XYZ".index(u), "XYZ".index(v)
+    r = (dia - tool_dia) / 2.0
+    step = max(s.step_down, 0.01)
+    levels = []
+    level = 0.0
+    while level < depth - 1e-9:
+        level = min(level + step, depth)
+        levels.append(level)
+
+    lines = [f"(Helical bore dia={dia:g}, depth={depth:g}, axis={axis}, tool D{tool_dia:g} x{len(centers)})"]
+    lines.append(_DRILL_PLANES[axis])
+    for c in centers:
+        cu, cv = c[iu], c[iv]
+        start = f"{u}{_fmt(cu + r)} {v}{_fmt(cv)}"
+        offset = f"{_ARC_OFFSETS[u]}{_fmt(-r)} {_ARC_OFFSETS[v]}0"
+        lines.append(f"G0 {start} {axis}{s.safe_z}")
+        lines.append(f"G1 {axis}0 F{s.feed}")
+        for lv in levels:
+            lines.append(f"G3 {start} {axis}-{_fmt(lv)} {offset} F{s.feed}")
+        lines.append(f"G3 {start} {offset}")
+        lines.append(f"G1 {u}{_fmt(cu)} {v}{_fmt(cv)}")
+        lines.append(f"G0 {axis}{s.safe_z}")
+    lines.append("G17")
+    return lines
+
+
 def _generate_extrude_block(op, s):
     h, axis, profile = op.get("distance", 0), op.get("axis", "Y"), op.get("profile", "unknown")
     lines = []
@@ -0,0 +1,133 @@
+# tools/geometry_cache.py — كاش دائم للهندسة المستوردة من DXF (Binary BRep)
+"""
+كل تشغيل كان يعيد تحليل نفس ملفات DXF عبر ezdxf ويبني حواف OCC من جديد.
+هنا يُحفظ الشكل الناتج مرة واحدة بصيغة BinTools الثنائية (أسرع قراءة من .brep النصي):
+
+- المفتاح = sha256(محتوى الملف) + IMPORTER_VERSION + اسم المستورد وخياراته
+  → محتوى فقط: إعادة التسمية أو النقل لا تُبطل الكاش، وأي تعديل للملف يُنتج مفتاحًا جديدًا
+- القيمة = GEOMETRY_CACHE_ROOT/<key[:2]>/<key>.bin
+- عند الإصابة يُقرأ الـ B-rep مباشرة بدون ezdxf وبدون بناء حواف
+
+⚠️ ارفع IMPORTER_VERSION عند أي تغيير في منطق الاستيراد (dxf_tools / dxf_loader)
+حتى لا تُستخدم أشكال قديمة.
+"""
+
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+IMPORTER_VERSION = "3"
+GEOMETRY_CACHE_ROOT = Path(__file__).resolve().parents[1] / "geometry_cache"
+GEOMETRY_CACHE_ENABLED = True
+
+_CHUNK = 1 << 20
+
+
+# ==================== 🔑 المفاتيح ====================
+def file_digest(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(path, variant: str = "") -> str:
+    h = hashlib.sha256()
+    h.update(file_digest(path).encode())
+    h.update(f"|{IMPORTER_VERSION}|{variant}".encode())
+    return h.hexdigest()
+
+
+def cache_path(key: str) -> Path:
+    return GEOMETRY_CACHE_ROOT / key[:2] / f"{key}.bin"
+
+
+# ==================== 💾 قراءة / كتابة ====================
+def read_shape(key: str):
+    """يرجع TopoDS_Shape من الكاش أو None."""
+    path = cache_path(key)
+    if not path.exists():
+        return None
+    from OCC.Core.BinTools import binTools
+    from OCC.Core.TopoDS import TopoDS_Shape
+
+    shape = TopoDS_Shape()
+    try:
+        ok = binTools.Read(shape, str(path))
+    except Exception as e:
+        print(f"[GEOCACHE] ⚠️ Corrupt entry {path.name}: {e}")
+        ok = False
+    if not ok or shape.IsNull():
+        path.unlink(missing_ok=True)
+        return None
+    return shape
+
+
+def write_shape(key: str, shape) -> bool:
+    """كتابة ذرّية (ملف مؤقت ثم replace) حتى لا يقرأ عامل آخر ملفًا ناقصًا."""
+    if shape is None or shape.IsNull():
+        return False
+    from OCC.Core.BinTools import binTools
+
+    path = cache_path(key)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not binTools.Write(shape, str(tmp)):
+            return False
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        print(f"[GEOCACHE] ⚠️ Failed to write {path.name}: {e}")
+        return False
+    finally:
+        if tmp.exists():
+            tmp.unlink(missing_ok=True)
+
+
+def clear_geometry_cache() -> int:
+    removed = 0
+    if GEOMETRY_CACHE_ROOT.exists():
+        for f in GEOMETRY_CACHE_ROOT.glob("*/*.bin"):
+            f.unlink(missing_ok=True)
+            removed += 1
+    print(f"[GEOCACHE] 🧹 Removed {removed} cached shapes")
+    return removed
+
+
+# ==================== 🎯 Decorator للمستوردات ====================
+def _variant(name, args, kwargs) -> str:
+    return f"{name}|{args!r}|{sorted(kwargs.items())!r}"
+
+
+def cached_import(name: str):
+    """
+    تغليف دالة استيراد fn(path, *args, **kwargs) -> TopoDS_Shape:
+    الوسائط الإضافية (heal, options ...) تدخل في المفتاح عبر repr.
+    النتيجة None (فشل الاستيراد) لا تُخزَّن.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(path, *args, **kwargs):
+            if not GEOMETRY_CACHE_ENABLED:
+                return fn(path, *args, **kwargs)
+            try:
+                key = cache_key(path, _variant(name, args, kwargs))
+            except OSError:
+                return fn(path, *args, **kwargs)
+
+            shape = read_shape(key)
+            if shape is not None:
+                print(f"[GEOCACHE] ⚡ {os.path.basename(os.fspath(path))} ← {key[:12]}")
+                return shape
+
+            shape = fn(path, *args, **kwargs)
+            if shape is not None and write_shape(key, shape):
+                print(f"[GEOCACHE] 💾 {os.path.basename(os.fspath(path))} → {key[:12]}")
+            return shape
+        wrapper.uncached = fn
+        wrapper.cache_name = name
+        return wrapper
+    return decorator
@@ -1,15 +1,17 @@
 # tools/geometry_ops.py — FINAL BUILD (Box + Extrude + Hole + BoxCut)
-from OCC.Core.gp import gp_Pnt, gp_Dir, gp_Ax2, gp_Vec
+from OCC.Core.gp import gp_Pnt, gp_Dir, gp_Ax2
 from OCC.Core.BRepPrimAPI import (
     BRepPrimAPI_MakeBox,
-    BRepPrimAPI_MakePrism,
     BRepPrimAPI_MakeCylinder
 )
-from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut
-from OCC.Core.Bnd import Bnd_Box
-from OCC.Core.BRepBndLib import brepbndlib
+from tools.bbox_service import get_extents
+from tools.boolean_ops import cut, cut_many
+from tools.extrusion import extrude
+from tools.shape_cache import memoize_shape
+from tools.gcode_generator import HoleOp
 
 # ==================== 📦 Box ====================
+@memoize_shape()
 def make_box(x, y, z, dx, dy, dz):
     """إنشاء مجسم بوكس"""
     return BRepPrimAPI_MakeBox(gp_Pnt(x, y, z), dx, dy, dz).Shape()
@@ -18,13 +20,14 @@ def preview_box(x, y, z, dx, dy, dz):
     """معاينة صندوق"""
     return make_box(x, y, z, dx, dy, dz)
 
+@memoize_shape()
 def make_hole_cylinder(base_shape, x, y, z, dia, axis, depth=None):
     """
     إنشاء أسطوانة الحفر بحيث يبدأ أعلاها من السطح العلوي للجسم
     وتمتد للأسفل بالعمق المحدد.
     """
     radius = dia / 2.0
-    zmax, zmin = _get_shape_top_z(base_shape)
+    _, _, zmin, _, _, zmax = get_extents(base_shape)
 
     if depth is None:
         depth = (zmax - zmin) + 5.0  # افتراضي
@@ -44,6 +47,7 @@ def make_hole_cylinder(base_shape, x, y, z, dia, axis, depth=None):
     cyl = BRepPrimAPI_MakeCylinder(ax, radius, depth).Shape()
     return cyl
 # ==================== ✂️ Box Cut ====================
+@memoize_shape()
 def make_box_cut_shape(x, y, z, dx, dy, dz):
     """إنشاء شكل الصندوق المستخدم كأداة طرح (وضع حر)"""
     return BRepPrimAPI_MakeBox(gp_Pnt(x, y, z), dx, dy, dz).Shape()
@@ -52,54 +56,48 @@ def preview_box_cut(x, y, z, dx, dy, dz):
     """معاينة صندوق الطرح (شفاف أو بلون مميز لاحقاً في الواجهة)"""
     return make_box_cut_shape(x, y, z, dx, dy, dz)
 
-def apply_box_cut(base_shape, x, y, z, dx, dy, dz):
+def apply_box_cut(base_shape, x, y, z, dx, dy, dz, options=None, progress=None):
     """تطبيق عملية طرح صندوق من الشكل الأساسي"""
     box_shape = make_box_cut_shape(x, y, z, dx, dy, dz)
     if box_shape is None or box_shape.IsNull():
         print("[❌] apply_box_cut: box shape is null")
         return None
 
-    try:
-        cut = BRepAlgoAPI_Cut(base_shape, box_shape).Shape()
-        return cut
-    except Exception as e:
-        print(f"[❌] BoxCut failed: {e}")
-        return None
+    # Box Cut غالبًا يلامس سطح البروفايل — خيارات المشروع (fuzzy/glue) تعالج ذلك
+    result = cut(base_shape, box_shape, options=options, progress=progress)
+    if result is None:
+        print("[❌] BoxCut failed")
+    return result
 
 def _get_shape_top_z(shape):
     """إرجاع أعلى نقطة Z للشكل"""
-    box = Bnd_Box()
-    brepbndlib.Add(shape, box)
-    xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
-    return zmax
+    return get_extents(shape)[5]
 
 def get_top_z(shape):
     """إرجاع أعلى قيمة Z للمجسم (سقف الشكل)."""
-    box = Bnd_Box()
-    brepbndlib.Add(shape, box)
-    xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
-    return zmax
+    return get_extents(shape)[5]
 
 #-----------------------------------------------------------------
-def preview_extrude(shape, distance: float):
+def preview_extrude(shape, distance: float, axis="Y", draft_deg: float = 0.0, heal: bool = False):
     """
-    إنشاء نسخة معاينة من الشكل عن طريق الإكسترود على محور Y فقط.
+    إنشاء نسخة معاينة من الشكل عن طريق الإكسترود.
+    (نفس بنّاء extrude_shape لتشارك كاش المعاينة مع التطبيق الفعلي)
+    heal=True يبسّط البروفايل أولًا كما يفعل Apply، فتطابق المعاينة النتيجة.
     """
-    if shape is None or shape.IsNull():
-        return None
-    vec = gp_Vec(0, distance, 0)
-    return BRepPrimAPI_MakePrism(shape, vec).Shape()
-def extrude_shape(shape, distance: float):
+    if heal:
+        from tools.shape_healing import heal_shape
+        shape, _report = heal_shape(shape)
+    return extrude_shape(shape, distance, axis, draft_deg)
+
+def extrude_shape(shape, distance: float, axis="Y", draft_deg: float = 0.0):
     """
-    تطبيق إكسترود فعلي للشكل على محور Y فقط.
+    تطبيق إكسترود فعلي للشكل (الافتراضي محور Y كما كان) عبر tools.extrusion.
     """
-    if shape is None or shape.IsNull():
-        return None
-    vec = gp_Vec(0, distance, 0)
-    return BRepPrimAPI_MakePrism(shape, vec).Shape()
+    return extrude(shape, distance, axis, draft_deg)
 from OCC.Core.gp import gp_Pnt, gp_Dir, gp_Ax2
 from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeCylinder
 
+@memoize_shape()
 def preview_hole(base_shape, x, y, z, dia, axis, preview_len):
     """
     إنشاء أسطوانة المعاينة بنفس موضع واتجاه القص الحقيقي
@@ -130,17 +128,36 @@ def preview_hole(base_shape, x, y, z, dia, axis, preview_len):
     return cyl_shape
 
 
+# ==================== 👁️ معاينة خفيفة (شكل عند الأصل + تحويل) ====================
+_PREVIEW_DIRS = {"Z": gp_Dir(0, 0, -1), "Y": gp_Dir(0, -1, 0), "X": gp_Dir(-1, 0, 0)}
 
+@memoize_shape()
+def preview_hole_geometry(dia, axis, preview_len):
+    """أسطوانة المعاينة عند الأصل — تُبنى فقط عند تغيّر القطر/الطول/المحور."""
+    direction = _PREVIEW_DIRS.get(axis)
+    if direction is None:
+        print("[❌] preview_hole_geometry: invalid axis")
+        return None
+    return BRepPrimAPI_MakeCylinder(gp_Ax2(gp_Pnt(0, 0, 0), direction), dia / 2.0, preview_len).Shape()
 
-def add_hole(base_shape, x, y, z, dia, axis, depth):
+def preview_hole_origin(base_shape, x, y, z):
+    """موضع أسطوانة المعاينة بنفس منطق preview_hole (Z=0 → السطح العلوي)."""
+    if z == 0 and base_shape is not None and not base_shape.IsNull():
+        z = get_top_z(base_shape)
+    return x, y, z
+
+def preview_box_geometry(dx, dy, dz):
+    """صندوق المعاينة عند الأصل — الموضع يُطبّق كتحويل في العارض."""
+    return make_box_cut_shape(0, 0, 0, dx, dy, dz)
+
+
+
+
+def make_hole_tool(base_shape, x, y, z, dia, axis, depth):
     """
-    القص يبدأ من Z المعاينة نفسها (وليس top_z - depth).
-    العمق يحدد فقط طول الاسطوانة للأسفل.
+    أسطوانة أداة الحفر فقط (بدون قص) بنفس منطق add_hole:
+    البداية من (x, y, z) والعمق يحدد الطول باتجاه سالب المحور.
     """
-    if base_shape is None or base_shape.IsNull():
-        print("[❌] add_hole: base_shape is null")
-        return None
-
     # إذا المستخدم لم يدخل Z → نأخذ top_z فقط كقيمة افتراضية
     if z == 0:
         z = get_top_z(base_shape)
@@ -155,30 +172,71 @@ def add_hole(base_shape, x, y, z, dia, axis, depth):
     elif axis == "X":
         direction = gp_Dir(-1, 0, 0)
     else:
-        print("[❌] add_hole: invalid axis")
+        print("[❌] make_hole_tool: invalid axis")
         return None
 
     # ✅ العمق يحدد فقط طول الاسطوانة، نقطة البداية تبقى origin نفسها
     cyl_ax2 = gp_Ax2(origin, direction)
     cyl_shape = BRepPrimAPI_MakeCylinder(cyl_ax2, radius, depth).Shape()
-
     if cyl_shape is None or cyl_shape.IsNull():
-        print("[❌] add_hole: cylinder shape is null")
+        print("[❌] make_hole_tool: cylinder shape is null")
         return None
+    return cyl_shape
 
-    try:
-        cut_shape = BRepAlgoAPI_Cut(base_shape, cyl_shape).Shape()
-        return cut_shape
-    except Exception as e:
-        print(f"[❌] add_hole: cut failed: {e}")
-        return None
 
+def add_hole(base_shape, x, y, z, dia, axis, depth):
+    """
+    القص يبدأ من Z المعاينة نفسها (وليس top_z - depth).
+    العمق يحدد فقط طول الاسطوانة للأسفل.
+    """
+    if base_shape is None or base_shape.IsNull():
+        print("[❌] add_hole: base_shape is null")
+        return None
+    return add_holes(base_shape, [HoleOp(x, y, z, dia, depth, axis)])
 
 
+def _hole_fields(hole):
+    """قراءة (x, y, z, dia, depth, axis) من HoleOp أو dict بنفس المفاتيح."""
+    if isinstance(hole, dict):
+        get = hole.get
+    else:
+        get = lambda k, d=None: getattr(hole, k, d)
+    return (
+        float(get("x", 0)), float(get("y", 0)), float(get("z", 0)),
+        float(get("dia", 0)), float(get("depth", 0)), str(get("axis", "Z")).upper()
+    )
 
 
+def add_holes(base_shape, holes, parallel: bool = None, options=None, progress=None):
+    """
+    تطبيق مجموعة ثقوب (HoleOp أو dict) بعملية قص واحدة:
+    تُبنى كل الأسطوانات أولاً ثم تُطرح معًا كأدوات لـ Boolean واحد.
+    """
+    if base_shape is None or base_shape.IsNull():
+        print("[❌] add_holes: base_shape is null")
+        return None
 
+    tools = []
+    for hole in holes:
+        x, y, z, dia, depth, axis = _hole_fields(hole)
+        cyl = make_hole_tool(base_shape, x, y, z, dia, axis, depth)
+        if cyl is None:
+            return None
+        tools.append(cyl)
 
+    if not tools:
+        return base_shape
 
+    result = cut_many(base_shape, tools, parallel=parallel, options=options, progress=progress)
+    if result is None or result.IsNull():
+        print(f"[❌] add_holes: cut failed for {len(tools)} holes")
+        return None
+    return result
 
 
+def add_hole_pattern(base_shape, params: dict, parallel: bool = None, options=None):
+    """تطبيق نمط ثقوب كامل (linear / grid / along) بعملية قص واحدة."""
+    from tools.hole_pattern import pattern_holes
+    holes = pattern_holes(params)
+    print(f"[PATTERN] {params.get('kind')} → {len(holes)} holes in one cut")
+    return add_holes(base_shape, holes, parallel=parallel, options=options)
@@ -0,0 +1,113 @@
+# tools/hole_pattern.py — أنماط الثقوب (Linear / Grid / Along Length)
+"""
+نمط الثقوب عملية واحدة: مواضع كل الثقوب تُولَّد كمصفوفة NumPy (N, 3)
+ثم تُقص بعملية Boolean واحدة (add_holes) وتُصدَّر ككتلة G-code واحدة (G81).
+
+معاملات النمط (dict):
+- kind       : "linear" | "grid" | "along"
+- x, y, z    : موضع أول ثقب
+- dia, depth, axis
+- count, pitch, direction        : الاتجاه الأول ("X" / "Y" / "Z")
+- count2, pitch2, direction2     : الاتجاه الثاني (grid فقط)
+- start, length, margin          : along — توزيع بخطوة pitch على طول البروفايل
+"""
+
+from typing import List
+
+import numpy as np
+
+from tools.gcode_generator import HoleOp
+
+_AXES = {
+    "X": np.array([1.0, 0.0, 0.0]),
+    "Y": np.array([0.0, 1.0, 0.0]),
+    "Z": np.array([0.0, 0.0, 1.0]),
+}
+
+PATTERN_KINDS = ("linear", "grid", "along")
+
+
+def _unit(direction) -> np.ndarray:
+    try:
+        return _AXES[str(direction).upper()]
+    except KeyError:
+        raise ValueError(f"Invalid pattern direction: {direction}")
+
+
+# ==================== 🧮 توليد المواضع ====================
+def linear_positions(origin, direction, count, pitch) -> np.ndarray:
+    """count موضع على خط واحد بخطوة pitch."""
+    steps = np.arange(max(int(count), 0), dtype=float) * float(pitch)
+    return np.asarray(origin, dtype=float) + steps[:, None] * _unit(direction)
+
+
+def grid_positions(origin, direction, count, pitch, direction2, count2, pitch2) -> np.ndarray:
+    """شبكة count × count2 — الترتيب صف بعد صف (أقصر مسار للحفر)."""
+    row = linear_positions(origin, direction, count, pitch)
+    offsets = np.arange(max(int(count2), 0), dtype=float) * float(pitch2)
+    grid = row[None, :, :] + offsets[:, None, None] * _unit(direction2)
+    # عكس اتجاه الصفوف الفردية (Zig-Zag) لتقليل حركة الأداة
+    grid[1::2] = grid[1::2, ::-1]
+    return grid.reshape(-1, 3)
+
+
+def along_length_positions(origin, direction, start, length, pitch, margin=0.0) -> np.ndarray:
+    """
+    توزيع بخطوة pitch على طول البروفايل من start+margin حتى start+length-margin.
+    إحداثي الموضع على اتجاه النمط يُستبدل بالقيم المولدة.
+    """
+    pitch = float(pitch)
+    if pitch <= 0 or length <= 2 * margin:
+        return np.empty((0, 3))
+    first = float(start) + float(margin)
+    last = float(start) + float(length) - float(margin)
+    values = np.arange(first, last + 1e-9, pitch)
+    pts = np.repeat(np.asarray(origin, dtype=float)[None, :], len(values), axis=0)
+    pts[:, "XYZ".index(str(direction).upper())] = values
+    return pts
+
+
+def pattern_positions(params: dict) -> np.ndarray:
+    """مصفوفة (N, 3) لمواضع كل ثقوب النمط."""
+    kind = str(params.get("kind", "linear")).lower()
+    origin = (float(params.get("x", 0)), float(params.get("y", 0)), float(params.get("z", 0)))
+    direction = params.get("direction", "X")
+    pitch = float(params.get("pitch", 0))
+
+    if kind == "linear":
+        return linear_positions(origin, direction, int(params.get("count", 1)), pitch)
+    if kind == "grid":
+        return grid_positions(
+            origin, direction, int(params.get("count", 1)), pitch,
+            params.get("direction2", "Y"), int(params.get("count2", 1)), float(params.get("pitch2", 0)),
+        )
+    if kind == "along":
+        return along_length_positions(
+            origin, direction, float(params.get("start", 0)), float(params.get("length", 0)),
+            pitch, float(params.get("margin", 0)),
+        )
+    raise ValueError(f"Unknown pattern kind: {kind}")
+
+
+def pattern_holes(params: dict) -> List[HoleOp]:
+    """تحويل النمط إلى قائمة HoleOp للقص المجمّع."""
+    dia = float(params.get("dia", 0))
+    depth = float(params.get("depth", 0))
+    axis = params.get("axis", "Z") or "Z"
+    return [HoleOp(float(x), float(y), float(z), dia, depth, axis)
+            for x, y, z in pattern_positions(params)]
+
+
+def fill_along_extent(params: dict, shape) -> dict:
+    """
+    لنمط along: تثبيت start/length من حدود البروفايل على اتجاه النمط،
+    حتى تُعاد نفس المواضع عند إعادة البناء أو توليد الجي كود.
+    """
+    from tools.bbox_service import get_extents
+
+    params = dict(params)
+    idx = "XYZ".index(str(params.get("direction", "X")).upper())
+    ext = get_extents(shape)
+    params["start"] = ext[idx]
+    params["length"] = ext[idx + 3] - ext[idx]
+    return params
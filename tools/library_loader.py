@@ -0,0 +1,87 @@
+# tools/library_loader.py — تحميل مكتبة DXF بالتوازي (Process Pool)
+"""
+تحميل مئات ملفات DXF بالتسلسل على خيط الواجهة يجمّد صفحة Shape Manager عند الفتح.
+هنا يُعالَج كل ملف في عملية منفصلة ويُعاد الناتج عبر pickle،
+والنتائج تصل لخيط الواجهة واحدة تلو الأخرى عبر Qt signals مع التقدّم.
+
+worker = دالة على مستوى الموديول: _parse_dxf (الشكل الكامل) افتراضيًا،
+أو shape_library.read_entry_metadata لبناء الفهرس الخفيف فقط.
+"""
+
+import os
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from tools.op_executor import OperationExecutor
+
+
+def _parse_dxf(dxf_path: str, heal: bool = False):
+    """يعمل داخل عملية العامل — يجب أن يبقى دالة على مستوى الموديول ليُرسل بـ pickle."""
+    from dxf_loader import smart_load_dxf
+    shape = smart_load_dxf(dxf_path, heal=heal)
+    if shape is None or shape.IsNull():
+        return None
+    return shape
+
+
+class LibraryLoader(QObject):
+    itemLoaded = pyqtSignal(str, str, object)    # (key, dxf_path, result)
+    progress = pyqtSignal(int, int)              # (done, total)
+    finished = pyqtSignal(int)                   # عدد الأشكال المحمّلة
+
+    def __init__(self, max_workers: int = None, worker=_parse_dxf, parent=None):
+        super().__init__(parent)
+        self._worker = worker
+        workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self._executor = OperationExecutor(max_workers=workers, use_processes=True, parent=self)
+        self._pending = set()
+        self._total = 0
+        self._done = 0
+        self._loaded = 0
+
+    def start(self, dxf_paths, *worker_args):
+        """بدء التحميل — يرجع فورًا، والنتائج تصل عبر itemLoaded بترتيب انتهائها."""
+        self.cancel()
+        paths = list(dxf_paths)
+        self._total, self._done, self._loaded = len(paths), 0, 0
+        self.progress.emit(0, self._total)
+        if not paths:
+            self.finished.emit(0)
+            return
+        for path in paths:
+            self._pending.add(path)
+            self._executor.submit(
+                self._worker, path, *worker_args, key=path,
+                on_done=lambda result, p=path: self._on_parsed(p, result),
+                on_error=lambda err, p=path: self._on_failed(p, err),
+            )
+        print(f"[LIBRARY] ⏳ Processing {len(paths)} DXF files in background...")
+
+    def cancel(self):
+        for path in list(self._pending):
+            self._executor.cancel(path)
+        self._pending.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    # ---------- داخلي (خيط الواجهة) ----------
+    def _on_parsed(self, path, result):
+        if result is not None and not (hasattr(result, "IsNull") and result.IsNull()):
+            self._loaded += 1
+            key = os.path.splitext(os.path.basename(path))[0]
+            self.itemLoaded.emit(key, path, result)
+        self._step(path)
+
+    def _on_failed(self, path, error):
+        print(f"[LIBRARY] ❌ {os.path.basename(path)}: {error}")
+        self._step(path)
+
+    def _step(self, path):
+        self._pending.discard(path)
+        self._done += 1
+        self.progress.emit(self._done, self._total)
+        if self._done >= self._total:
+            print(f"[LIBRARY] ✅ Loaded {self._loaded}/{self._total} files")
+            self.finished.emit(self._loaded)
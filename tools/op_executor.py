@@ -0,0 +1,225 @@
+# tools/op_executor.py — تنفيذ العمليات الهندسية في الخلفية (Worker Pool)
+"""
+عمليات Boolean على بروفايل معقّد قد تستغرق ثوانٍ، وتنفيذها على خيط الواجهة
+يجمّد البرنامج. هذا المنفّذ يشغّل الدوال في Thread/Process Pool ويرجع GeometryJob
+فيه إمكانية الإلغاء، ثم يعيد النتيجة لخيط الواجهة عبر Qt signals.
+
+- submit(..., key="hole_preview"): أي مهمة جديدة بنفس المفتاح تلغي السابقة،
+  ونتيجة المهمة الملغاة تُهمل حتى لو انتهت.
+  ⚠️ للمعاينات فقط — عمليات Apply لا تستخدم key (إلغاء الأولى يضيّع تعديلها).
+- on_done / on_error تُستدعى دائمًا على خيط الواجهة (آمنة للعرض في العارض).
+- submit(..., progress=True): تُمرَّر للدالة progress=Message_ProgressRange مربوط
+  بالمهمة — تقدّم OCC يصل كـ jobProgress(job, fraction)، و cancel() يجعل
+  UserBreak() يرجع True فيتوقف الـ Boolean فعلًا بدل إهمال نتيجته فقط.
+- progress_bar=QProgressBar: يُعرض عليه التقدّم ويُخفى عند الانتهاء.
+"""
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+try:
+    from OCC.Core.Message import Message_ProgressIndicator
+
+    class _JobIndicator(Message_ProgressIndicator):
+        """مؤشر تقدّم OCC يحوّل Show() إلى job.report() و UserBreak() إلى الإلغاء."""
+
+        def __init__(self, job):
+            super().__init__()
+            self._job = job
+
+        def Show(self, scope, force):
+            self._job.report(self.GetPosition())
+
+        def UserBreak(self):
+            return self._job.is_cancelled()
+except Exception:  # OCC غير متاح أو لا يسمح بالاشتقاق → تقدّم على مستوى المهمة فقط
+    _JobIndicator = None
+
+
+class GeometryJob:
+    """مرجع لمهمة في الخلفية: الإلغاء + المستقبل (Future)."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, key=None, on_done=None, on_error=None):
+        self.job_id = next(self._ids)
+        self.key = key
+        self.future = None
+        self.on_done = on_done
+        self.on_error = on_error
+        self.progress = 0.0
+        self.progress_bar = None
+        self._executor = None
+        self._indicator = None
+        self._cancelled = threading.Event()
+
+    def report(self, value: float):
+        """تحديث التقدّم (0..1) من خيط العامل — يصل للواجهة كـ jobProgress."""
+        value = min(max(float(value), 0.0), 1.0)
+        if value - self.progress < 0.01 and value < 1.0:
+            return  # لا نغرق الواجهة بإشارات على كل خطوة صغيرة
+        self.progress = value
+        if self._executor is not None and not self.is_cancelled():
+            self._executor.jobProgress.emit(self, value)
+
+    def progress_range(self):
+        """Message_ProgressRange مربوط بالمهمة (أو None إن تعذّر إنشاؤه)."""
+        if _JobIndicator is None:
+            return None
+        try:
+            self._indicator = _JobIndicator(self)  # نحتفظ بالمرجع طوال عمر المهمة
+            return self._indicator.Start()
+        except Exception as e:
+            print(f"[EXEC] ⚠️ Progress indicator unavailable: {e}")
+            self._indicator = None
+            return None
+
+    def cancel(self):
+        """إلغاء المهمة: إن لم تبدأ لن تُنفّذ، وإن بدأت يوقفها UserBreak() أو تُهمل نتيجتها."""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def __repr__(self):
+        return f"<GeometryJob #{self.job_id} key={self.key!r}>"
+
+
+class OperationExecutor(QObject):
+    jobFinished = pyqtSignal(object, object)   # (job, result)
+    jobFailed = pyqtSignal(object, str)        # (job, error)
+    jobProgress = pyqtSignal(object, float)    # (job, fraction 0..1)
+
+    def __init__(self, max_workers: int = 2, use_processes: bool = False, parent=None):
+        super().__init__(parent)
+        self.use_processes = use_processes
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._pool = pool_cls(max_workers=max_workers)
+        self._latest = {}  # key -> آخر GeometryJob
+        self._lock = threading.Lock()
+
+        # الإشارات تصدر من خيط العامل وتصل هنا على خيط الواجهة (Queued)
+        self.jobFinished.connect(self._dispatch_finished)
+        self.jobFailed.connect(self._dispatch_failed)
+        self.jobProgress.connect(self._dispatch_progress)
+        self._bars = {}  # id(QProgressBar) -> المهمة التي تملكه حاليًا
+
+    # ---------- API ----------
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None,
+               progress=False, progress_bar=None, **kwargs) -> GeometryJob:
+        """تشغيل fn(*args, **kwargs) في الخلفية.
+
+        progress=True يمرّر للدالة progress=Message_ProgressRange (Threads فقط —
+        المؤشر لا يعبر حدود العمليات).
+        """
+        job = GeometryJob(key=key, on_done=on_done, on_error=on_error)
+        job._executor = self
+        if progress and not self.use_processes:
+            kwargs["progress"] = job.progress_range()
+        if progress_bar is not None:
+            self._attach_bar(job, progress_bar)
+
+        if key is not None:
+            with self._lock:
+                previous = self._latest.get(key)
+                self._latest[key] = job
+            if previous is not None and not previous.done():
+                previous.cancel()
+
+        job.future = self._pool.submit(fn, *args, **kwargs)
+        job.future.add_done_callback(lambda fut, j=job: self._on_future_done(j, fut))
+        return job
+
+    def cancel(self, key):
+        """إلغاء آخر مهمة مسجلة بهذا المفتاح."""
+        with self._lock:
+            job = self._latest.pop(key, None)
+        if job is not None:
+            job.cancel()
+            self._release_bar(job)
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            jobs = list(self._latest.values())
+            self._latest.clear()
+        for job in jobs:
+            job.cancel()
+        self._pool.shutdown(wait=wait)
+
+    # ---------- داخلي ----------
+    def _on_future_done(self, job, fut):
+        # يعمل على خيط العامل — لا نلمس الواجهة هنا، فقط نصدر الإشارة
+        if job.is_cancelled() or fut.cancelled():
+            return
+        err = fut.exception()
+        if err is not None:
+            self.jobFailed.emit(job, str(err))
+        else:
+            self.jobFinished.emit(job, fut.result())
+
+    def _is_superseded(self, job) -> bool:
+        if job.key is None:
+            return False
+        with self._lock:
+            latest = self._latest.get(job.key)
+            if latest is job:
+                del self._latest[job.key]
+                return False
+        return True
+
+    def _attach_bar(self, job, bar):
+        job.progress_bar = bar
+        self._bars[id(bar)] = job  # مهمة أحدث على نفس الشريط تستلمه
+        bar.setRange(0, 100)
+        bar.setValue(0)
+        bar.setFormat("%p%")
+        bar.setVisible(True)
+
+    def _release_bar(self, job):
+        bar = job.progress_bar
+        if bar is not None and self._bars.get(id(bar)) is job:
+            del self._bars[id(bar)]
+            bar.setVisible(False)
+
+    def _dispatch_progress(self, job, value):
+        bar = job.progress_bar
+        if bar is not None and self._bars.get(id(bar)) is job:
+            bar.setValue(int(value * 100))
+
+    def _dispatch_finished(self, job, result):
+        self._release_bar(job)
+        if job.is_cancelled() or self._is_superseded(job):
+            print(f"[EXEC] ⏭️ Dropped superseded result of {job}")
+            return
+        if callable(job.on_done):
+            try:
+                job.on_done(result)
+            except Exception as e:
+                print(f"[EXEC] ❌ on_done failed for {job}: {e}")
+
+    def _dispatch_failed(self, job, error):
+        self._release_bar(job)
+        if job.is_cancelled() or self._is_superseded(job):
+            return
+        print(f"[EXEC] ❌ {job} failed: {error}")
+        if callable(job.on_error):
+            job.on_error(error)
+
+
+_default_executor = None
+
+
+def get_executor() -> OperationExecutor:
+    """المنفّذ المشترك للتطبيق (يُنشأ عند أول استخدام على خيط الواجهة)."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = OperationExecutor(max_workers=2)
+    return _default_executor
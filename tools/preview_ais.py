@@ -0,0 +1,68 @@
+# tools/preview_ais.py — معاينة خفيفة بكائن AIS واحد يُعاد استخدامه
+"""
+المعاينة الحية كانت تبني أسطوانة/صندوق B-rep جديد و AIS_Shape جديد عند كل ضغطة زر.
+هنا يُبنى الشكل مرة واحدة عند الأصل (0,0,0) ويُحرَّك بتحويل gp_Trsf فقط:
+- تغيير الموضع   → SetLocation على نفس الكائن (بدون أي topology)
+- تغيير القطر/الطول/الأبعاد → إعادة بناء الشكل فقط وتحديث نفس الكائن
+"""
+
+from OCC.Core.AIS import AIS_Shape
+from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.gp import gp_Trsf
+
+
+class ReusablePreview:
+    """كائن معاينة واحد لكل نافذة: الشكل يُبنى عند تغيّر geom_key فقط."""
+
+    def __init__(self, display, color=(1.0, 0.0, 0.0), transparency=0.5):
+        self.display = display
+        self.color = color
+        self.transparency = transparency
+        self.ais = None
+        self._geom_key = None
+
+    def show(self, geom_key, builder, trsf: gp_Trsf):
+        """
+        عرض/تحديث المعاينة.
+        builder() يُستدعى فقط إذا تغيّر geom_key، ويجب أن يرجع الشكل عند الأصل.
+        """
+        ctx = self.display.Context
+        if self.ais is None or geom_key != self._geom_key:
+            shape = builder()
+            if shape is None or shape.IsNull():
+                self.hide()
+                return False
+            if self.ais is None:
+                self.ais = AIS_Shape(shape)
+                r, g, b = self.color
+                self.ais.SetColor(Quantity_Color(r, g, b, Quantity_TOC_RGB))
+                self.ais.SetTransparency(self.transparency)
+            else:
+                self.ais.SetShape(shape)
+                if ctx.IsDisplayed(self.ais):
+                    ctx.Redisplay(self.ais, False)
+            self._geom_key = geom_key
+
+        ctx.SetLocation(self.ais, TopLoc_Location(trsf))
+        if not ctx.IsDisplayed(self.ais):
+            ctx.Display(self.ais, False)
+        return True
+
+    def hide(self):
+        """إخفاء المعاينة مع الإبقاء على الكائن لإعادة استخدامه."""
+        if self.ais is not None:
+            try:
+                self.display.Context.Erase(self.ais, False)
+            except Exception:
+                pass
+
+    def reset(self):
+        """حذف الكائن نهائيًا (مثلاً بعد تطبيق العملية أو تغيير الشكل الأساسي)."""
+        if self.ais is not None:
+            try:
+                self.display.Context.Remove(self.ais, False)
+            except Exception:
+                pass
+        self.ais = None
+        self._geom_key = None
@@ -15,16 +15,10 @@ def _write_brep(shape, brep_path: Path) -> None:
     from OCC.Core.BRepTools import breptools
     breptools.Write(shape, str(brep_path))
 
-def _dump_display_png(display, shp, img_path: Path) -> None:
-    # يتوقع display كائن OCC viewer (مثل qtViewer3d._display)
-    display.EraseAll()
-    display.DisplayShape(shp, update=True)
-    try:
-        display.FitAll()
-    except Exception:
-        pass
-    # pythonocc >= 7.6: display.View.Dump
-    display.View.Dump(str(img_path))
+def _render_profile_png(dxf_path: Path, img_path: Path) -> bool:
+    # Offscreen من tools.thumbnail_cache — لا يلمس العارض ولا مشهد المستخدم
+    from tools.thumbnail_cache import export_thumbnail  # noqa: WPS433
+    return export_thumbnail(dxf_path, img_path, "detail") is not None
 
 def slugify(name: str) -> str:
     s = "".join(c if c.isalnum() or c in "-_." else "_" for c in name.strip())
@@ -56,15 +50,18 @@ def process_dxf_to_assets(
     if shp is None:
         raise RuntimeError("DXF parsing returned no shape.")
 
-    # 3) حفظ صورة فقط
+    # 3) حفظ صورة فقط (display لم يعد مستخدمًا — يبقى للتوافق مع المستدعين)
+    # بدون QApplication (سكربت/خادم) يُستخدم tools.raster2d تلقائيًا
     img_path = out_dir / f"{base}.png"
-    if display is not None:
-        try:
-            _dump_display_png(display, shp, img_path)
-        except Exception:
-            img_path.touch()
-    else:
-        img_path.touch()
+    try:
+        ok = _render_profile_png(dxf_dst, img_path)
+    except Exception as e:
+        print(f"[THUMB] ⚠️ {e}")
+        ok = False
+    if not ok:
+        # الكاش غير متاح (مجلد للقراءة فقط مثلًا) → رسم مباشر في مجلد البروفايل
+        from tools.raster2d import render_dxf_png  # noqa: WPS433
+        render_dxf_png(str(dxf_dst), str(img_path))
 
     return dxf_dst, None, img_path
 
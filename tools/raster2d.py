@@ -0,0 +1,112 @@
+# tools/raster2d.py — راسم ثنائي الأبعاد خالص (NumPy + zlib) للوضع Headless
+"""
+process_dxf_to_assets كان يحتاج العارض الحي لتصوير PNG، وبدونه يكتب ملفًا فارغًا.
+هذا الراسم لا يحتاج Qt ولا OCC ولا شاشة:
+
+- المسارات من tools.dxf_flatten (مرور واحد على الـ DXF)
+- كل المقاطع تُرسم دفعة واحدة (DDA متجه) على Canvas بدقة مضاعفة
+  ثم تصغير بمتوسط الكتل → حواف ناعمة (Anti-aliasing بسيط)
+- ترميز PNG يدوي (IHDR + IDAT عبر zlib + IEND)
+
+مناسب للاستيراد الجماعي من سكربت على خادم بدون واجهة.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+from tools.dxf_flatten import flatten_dxf, to_pixels
+
+BACKGROUND = (250, 250, 250)
+FOREGROUND = (40, 40, 40)
+SUPERSAMPLE = 2
+
+
+# ==================== ✏️ الرسم ====================
+def draw_segments(canvas: np.ndarray, segments: np.ndarray, color, thickness: int = 1):
+    """
+    رسم مقاطع (M, 4) = x1, y1, x2, y2 بالبكسل على canvas (H, W, 3) في عملية متجهة واحدة:
+    كل مقطع يُقسَّم إلى max(|dx|, |dy|) + 1 نقطة ثم تُكتب كل النقاط بفهرسة واحدة.
+    """
+    if len(segments) == 0:
+        return canvas
+    h, w = canvas.shape[:2]
+    x1, y1, x2, y2 = segments.T
+    n = (np.ceil(np.maximum(np.abs(x2 - x1), np.abs(y2 - y1))).astype(np.int64) + 1)
+    seg_idx = np.repeat(np.arange(len(segments)), n)
+    step = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    t = step / np.maximum(n[seg_idx] - 1, 1)
+
+    xs = np.rint(x1[seg_idx] + (x2 - x1)[seg_idx] * t).astype(np.int64)
+    ys = np.rint(y1[seg_idx] + (y2 - y1)[seg_idx] * t).astype(np.int64)
+
+    color = np.asarray(color, dtype=np.uint8)
+    r = max(int(thickness) // 2, 0)
+    for oy in range(-r, r + 1):
+        for ox in range(-r, r + 1):
+            px, py = xs + ox, ys + oy
+            inside = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+            canvas[py[inside], px[inside]] = color
+    return canvas
+
+
+def _downsample(canvas: np.ndarray, factor: int) -> np.ndarray:
+    if factor <= 1:
+        return canvas
+    h, w, c = canvas.shape
+    blocks = canvas.reshape(h // factor, factor, w // factor, factor, c).astype(np.uint16)
+    return (blocks.mean(axis=(1, 3)) + 0.5).astype(np.uint8)
+
+
+def rasterize(drawing, width: int = 480, height: int = 320,
+              background=BACKGROUND, color=FOREGROUND, supersample: int = SUPERSAMPLE) -> np.ndarray:
+    """FlatDrawing → صورة RGB (H, W, 3) uint8."""
+    ss = max(int(supersample), 1)
+    canvas = np.empty((height * ss, width * ss, 3), dtype=np.uint8)
+    canvas[:] = np.asarray(background, dtype=np.uint8)
+
+    polylines = [p for p in to_pixels(drawing, width * ss, height * ss) if len(p) >= 2]
+    if polylines:
+        segments = np.vstack([np.hstack([p[:-1], p[1:]]) for p in polylines])
+        draw_segments(canvas, segments, color, thickness=ss)
+    return _downsample(canvas, ss)
+
+
+# ==================== 💾 ترميز PNG ====================
+def _chunk(tag: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(tag + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", crc)
+
+
+def encode_png(image: np.ndarray, level: int = 6) -> bytes:
+    """ترميز صورة (H, W, 3) أو (H, W, 4) uint8 إلى PNG بدون أي مكتبة صور."""
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    h, w, c = image.shape
+    color_type = {3: 2, 4: 6}[c]
+    # بايت فلتر 0 (None) في بداية كل سطر
+    raw = np.zeros((h, w * c + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(h, w * c)
+    header = struct.pack(">IIBBBBB", w, h, 8, color_type, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n"
+            + _chunk(b"IHDR", header)
+            + _chunk(b"IDAT", zlib.compress(raw.tobytes(), level))
+            + _chunk(b"IEND", b""))
+
+
+def write_png(path, image: np.ndarray) -> None:
+    with open(path, "wb") as f:
+        f.write(encode_png(image))
+
+
+# ==================== 🖼 DXF → PNG ====================
+def render_dxf_png(dxf_path: str, png_path: str, width: int = 480, height: int = 320) -> bool:
+    """نفس توقيع preview_utils.generate_dxf_preview_png لكن بدون Qt."""
+    try:
+        drawing = flatten_dxf(dxf_path)
+        write_png(png_path, rasterize(drawing, width, height))
+        print(f"🖼 [Headless] DXF preview: {png_path} | {drawing.vertex_count()} vertices")
+        return True
+    except Exception as e:
+        print(f"🔥 [Headless] فشل توليد المعاينة: {e}")
+        return False
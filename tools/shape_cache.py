@@ -0,0 +1,153 @@
+# tools/shape_cache.py — كاش LRU للأشكال المبنية من معاملات (Parametric Memoization)
+"""
+المعاينة الحية تعيد بناء نفس الـ primitives عند كل تغيير في الحقول.
+هذا الكاش يحفظ النتيجة بمفتاح = اسم الدالة + المعاملات المقرّبة + هوية الشكل الأساسي،
+فالقيم التي سبق بناؤها تُرجع مباشرة بدون أي عملية OCC.
+
+هوية الشكل (hash = عنوان TShape + Location) لا تكفي وحدها: بعد تحرير الشكل قد يُعاد
+استخدام نفس العنوان لشكل آخر. لذلك كل عنصر يحتفظ بمرجع قوي للأشكال المصدر
+(فلا يُحرَّر عنوانها ما دام العنصر في الكاش) ويُتحقق منها بـ IsSame عند القراءة.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+
+class ShapeCache:
+    """كاش LRU محدود بعدد العناصر مع عدّادات hit/miss (آمن للاستخدام من عدة خيوط)."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None, shapes=()):
+        """shapes: الأشكال المصدر للمفتاح — الإصابة فقط إن كانت IsSame مع المحفوظة."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and _same_shapes(entry[1], shapes):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, shapes=()):
+        with self._lock:
+            self._data[key] = (value, tuple(shapes))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def invalidate(self, predicate=None):
+        """مسح الكاش بالكامل، أو العناصر التي يحقق مفتاحها predicate(key) فقط."""
+        with self._lock:
+            if predicate is None:
+                self._data.clear()
+                return
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+
+def _same_shapes(stored, given) -> bool:
+    if len(stored) != len(given):
+        return False
+    return all(a is b or a.IsSame(b) for a, b in zip(stored, given))
+
+
+def source_shapes(*values):
+    """الأشكال (كائنات OCC) بين القيم — تُمرَّر كـ shapes لـ get/put."""
+    found = []
+    for v in values:
+        if isinstance(v, (tuple, list)):
+            found.extend(source_shapes(*v))
+        elif hasattr(v, "IsNull") and hasattr(v, "IsSame"):
+            found.append(v)
+    return tuple(found)
+
+
+def shape_identity(shape):
+    """
+    هوية الشكل (TShape + Location) كما يحسبها OCC، أو None.
+    للمفتاح فقط — التحقق الفعلي بـ IsSame عبر shapes في ShapeCache.get.
+    """
+    if shape is None:
+        return None
+    try:
+        return ("shape", hash(shape))
+    except TypeError:
+        return ("shape-id", id(shape))
+
+
+def _norm(value, ndigits):
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), ndigits)
+    if isinstance(value, (tuple, list)):
+        return tuple(_norm(v, ndigits) for v in value)
+    if hasattr(value, "IsNull"):
+        return shape_identity(value)
+    return repr(value)
+
+
+# كاش مشترك لبنّائي الأشكال الأساسية في geometry_ops
+PRIMITIVE_CACHE = ShapeCache(max_entries=256)
+
+
+def memoize_shape(cache: ShapeCache = None, ndigits: int = 4):
+    """
+    ديكوريتر لتخزين ناتج دوال بناء الأشكال.
+    النتائج الفارغة (None / IsNull) لا تُخزَّن.
+    """
+    cache = cache if cache is not None else PRIMITIVE_CACHE
+
+    def decorator(fn):
+        name = fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (
+                name,
+                tuple(_norm(a, ndigits) for a in args),
+                tuple(sorted((k, _norm(v, ndigits)) for k, v in kwargs.items())),
+            )
+            shapes = source_shapes(args, tuple(v for _, v in sorted(kwargs.items())))
+            hit = cache.get(key, shapes=shapes)
+            if hit is not None:
+                return hit
+            result = fn(*args, **kwargs)
+            if result is not None and not result.IsNull():
+                cache.put(key, result, shapes=shapes)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def invalidate_shape_cache():
+    """مسح صريح لكاش الأشكال الأساسية وكاش الـ bbox (مثلاً عند فتح مشروع جديد)."""
+    PRIMITIVE_CACHE.invalidate()
+    from tools.bbox_service import invalidate_bbox_cache  # bbox_service يستورد هذا الموديول
+    invalidate_bbox_cache()
@@ -0,0 +1,229 @@
+# tools/shape_healing.py — تنظيف وتبسيط البروفايلات قبل عمليات Boolean / Prism
+"""
+ملفات DXF (خاصة الـ Splines المقسّمة لـ 800 نقطة) تنتج بروفايلات بآلاف الحواف الصغيرة،
+وكل BRepAlgoAPI_Cut و BRepPrimAPI_MakePrism بعدها يصبح بطيئًا.
+
+المراحل (كلها اختيارية عبر HealingOptions):
+1) دمج المقاطع المتتالية على خط واحد ضمن سماحية
+   (simplify_polyline على النقاط عند الاستيراد، UnifyEdges على الشكل في heal_shape)
+2) دمج الـ Splines: نقاط → BSpline واحد عند الاستيراد (refit_bspline_edge)،
+   وحواف BSpline متتالية → حافة واحدة في heal_shape (ConcatBSplines)
+3) توحيد الأوجه من نفس السطح (ShapeUpgrade_UnifySameDomain)
+4) إصلاح الحواف الصغيرة والفجوات (ShapeFix_Wireframe + ShapeFix_Shape)
+
+heal_shape ترجع الشكل الجديد + HealingReport (عدد الحواف قبل/بعد وزمن الـ Boolean).
+"""
+
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import numpy as np
+from OCC.Core.TopAbs import TopAbs_EDGE, TopAbs_FACE
+from OCC.Core.TopExp import TopExp_Explorer
+
+
+@dataclass
+class HealingOptions:
+    merge_collinear: bool = True
+    refit_splines: bool = True
+    unify_same_domain: bool = True
+    fix_small_edges: bool = True
+    tolerance: float = 0.01          # mm — أقصى انحراف مسموح عن الشكل الأصلي
+    angular_tolerance: float = 1e-3  # rad
+    measure_booleans: bool = False   # قياس زمن Prism + Cut قبل/بعد (مكلف)
+
+
+@dataclass
+class HealingReport:
+    edges_before: int = 0
+    edges_after: int = 0
+    faces_before: int = 0
+    faces_after: int = 0
+    heal_time: float = 0.0
+    boolean_before: Optional[float] = None
+    boolean_after: Optional[float] = None
+
+    def summary(self) -> str:
+        text = (f"edges {self.edges_before} → {self.edges_after}, "
+                f"faces {self.faces_before} → {self.faces_after}, "
+                f"heal {self.heal_time * 1000:.1f} ms")
+        if self.boolean_before is not None and self.boolean_after is not None:
+            speedup = self.boolean_before / self.boolean_after if self.boolean_after > 0 else 0.0
+            text += (f", boolean {self.boolean_before * 1000:.1f} → "
+                     f"{self.boolean_after * 1000:.1f} ms (×{speedup:.1f})")
+        return text
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+DEFAULT_OPTIONS = HealingOptions()
+
+
+# ==================== 🔢 عدّادات ====================
+def _count(shape, kind) -> int:
+    exp = TopExp_Explorer(shape, kind)
+    n = 0
+    while exp.More():
+        n += 1
+        exp.Next()
+    return n
+
+
+def count_edges(shape) -> int:
+    return _count(shape, TopAbs_EDGE) if shape is not None and not shape.IsNull() else 0
+
+
+def count_faces(shape) -> int:
+    return _count(shape, TopAbs_FACE) if shape is not None and not shape.IsNull() else 0
+
+
+# ==================== 📉 تبسيط النقاط (قبل بناء الحواف) ====================
+def simplify_polyline(pts, tolerance: float = 0.01) -> np.ndarray:
+    """
+    دمج المقاطع المتتالية شبه المستقيمة (Ramer–Douglas–Peucker بدون recursion).
+    كل نقطة محذوفة تبعد عن الخط الناتج أقل من tolerance.
+    """
+    arr = np.asarray(pts, dtype=float)
+    n = len(arr)
+    if n < 3:
+        return arr
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        seg = arr[j] - arr[i]
+        rel = arr[i + 1:j] - arr[i]
+        seg_len = np.hypot(seg[0], seg[1])
+        if seg_len < 1e-12:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / seg_len
+        k = int(np.argmax(dist))
+        if dist[k] > tolerance:
+            m = i + 1 + k
+            keep[m] = True
+            stack.append((i, m))
+            stack.append((m, j))
+    return arr[keep]
+
+
+def refit_bspline_edge(pts, tolerance: float = 0.01):
+    """
+    منحنى BSpline واحد يمر بالنقاط ضمن tolerance بدل مئات الحواف المستقيمة.
+    يرجع TopoDS_Edge أو None عند الفشل.
+    """
+    from OCC.Core.gp import gp_Pnt
+    from OCC.Core.TColgp import TColgp_Array1OfPnt
+    from OCC.Core.GeomAPI import GeomAPI_PointsToBSpline
+    from OCC.Core.GeomAbs import GeomAbs_C2
+    from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeEdge
+
+    arr = np.asarray(pts, dtype=float)
+    if len(arr) < 2:
+        return None
+    array = TColgp_Array1OfPnt(1, len(arr))
+    for i, p in enumerate(arr, 1):
+        array.SetValue(i, gp_Pnt(float(p[0]), float(p[1]), float(p[2]) if len(p) > 2 else 0.0))
+    try:
+        fit = GeomAPI_PointsToBSpline(array, 3, 8, GeomAbs_C2, tolerance)
+        if not fit.IsDone():
+            return None
+        mk = BRepBuilderAPI_MakeEdge(fit.Curve())
+        return mk.Edge() if mk.IsDone() else None
+    except Exception as e:
+        print(f"[HEAL] ⚠️ BSpline refit failed: {e}")
+        return None
+
+
+# ==================== 🩹 إصلاح الشكل ====================
+def _unify_same_domain(shape, opts: HealingOptions):
+    """UnifyEdges = merge_collinear، UnifyFaces = unify_same_domain، ConcatBSplines = refit_splines."""
+    from OCC.Core.ShapeUpgrade import ShapeUpgrade_UnifySameDomain
+    unify = ShapeUpgrade_UnifySameDomain(shape, opts.merge_collinear, opts.unify_same_domain,
+                                         opts.refit_splines)
+    unify.SetLinearTolerance(opts.tolerance)
+    unify.SetAngularTolerance(opts.angular_tolerance)
+    unify.Build()
+    return unify.Shape()
+
+
+def _fix_small_edges(shape, opts: HealingOptions):
+    from OCC.Core.ShapeFix import ShapeFix_Wireframe, ShapeFix_Shape
+    wf = ShapeFix_Wireframe(shape)
+    wf.SetPrecision(opts.tolerance)
+    wf.SetMaxTolerance(opts.tolerance * 10)
+    wf.FixSmallEdges()
+    wf.FixWireGaps()
+    fixer = ShapeFix_Shape(wf.Shape())
+    fixer.SetPrecision(opts.tolerance)
+    fixer.SetMaxTolerance(opts.tolerance * 10)
+    fixer.Perform()
+    return fixer.Shape()
+
+
+def _time_boolean(shape, distance: float = 100.0) -> Optional[float]:
+    """زمن Prism + Cut نموذجي على الشكل (بنفس اتجاه الإكسترود Y)."""
+    from OCC.Core.gp import gp_Vec, gp_Pnt
+    from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakePrism, BRepPrimAPI_MakeBox
+    from tools.boolean_ops import cut_many
+    from tools.bbox_service import get_extents
+
+    try:
+        t0 = time.perf_counter()
+        solid = BRepPrimAPI_MakePrism(shape, gp_Vec(0, distance, 0)).Shape()
+        xmin, ymin, zmin, xmax, ymax, zmax = get_extents(solid)
+        cx, cz = (xmin + xmax) / 2.0, (zmin + zmax) / 2.0
+        box = BRepPrimAPI_MakeBox(gp_Pnt(cx, ymin + distance / 4.0, cz - 1.0),
+                                  max(xmax - cx, 1.0), distance / 2.0, max(zmax - cz, 1.0) + 1.0).Shape()
+        cut_many(solid, [box])
+        return time.perf_counter() - t0
+    except Exception as e:
+        print(f"[HEAL] ⚠️ Boolean timing failed: {e}")
+        return None
+
+
+def heal_shape(shape, options: HealingOptions = None):
+    """
+    تشغيل مراحل التبسيط والإصلاح على بروفايل مستورد.
+    يرجع (shape, HealingReport) — وإذا فشلت مرحلة يُستخدم ناتج المرحلة السابقة.
+    """
+    opts = options or DEFAULT_OPTIONS
+    report = HealingReport()
+    if shape is None or shape.IsNull():
+        return shape, report
+
+    report.edges_before = count_edges(shape)
+    report.faces_before = count_faces(shape)
+    if opts.measure_booleans and report.faces_before:
+        report.boolean_before = _time_boolean(shape)
+
+    t0 = time.perf_counter()
+    result = shape
+    stages = []
+    unify = opts.merge_collinear or opts.unify_same_domain or opts.refit_splines
+    if unify and report.faces_before:
+        stages.append(("unify", _unify_same_domain))
+    if opts.fix_small_edges:
+        stages.append(("fix", _fix_small_edges))
+    for name, stage in stages:
+        try:
+            healed = stage(result, opts)
+            if healed is not None and not healed.IsNull():
+                result = healed
+        except Exception as e:
+            print(f"[HEAL] ⚠️ stage '{name}' failed: {e}")
+    report.heal_time = time.perf_counter() - t0
+
+    report.edges_after = count_edges(result)
+    report.faces_after = count_faces(result)
+    if opts.measure_booleans and report.faces_after:
+        report.boolean_after = _time_boolean(result)
+
+    print(f"[HEAL] 🩹 {report.summary()}")
+    return result, report
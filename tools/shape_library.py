@@ -0,0 +1,161 @@
+# tools/shape_library.py — مكتبة أشكال كسولة: فهرس خفيف + تحليل الهندسة عند الاختيار
+"""
+بدل بناء TopoDS_Shape لكل ملف DXF عند فتح الصفحة والاحتفاظ بها كلها في الذاكرة:
+- فهرس JSON خفيف (الاسم، الأبعاد، حجم الملف، عدد الكائنات، مسار الصورة) في
+  LIBRARY_CACHE_ROOT — خارج مجلد المكتبة المتتبَّع في git، ملف لكل مجلد مكتبة —
+  يُعاد حسابه فقط للملفات التي تغيّر حجمها أو تاريخ تعديلها
+- الهندسة تُحلَّل عند أول اختيار وتُحفظ في كاش LRU محدود (ShapeCache)
+  بمفتاح (الاسم، heal) فاستهلاك الذاكرة ثابت مهما كبرت المكتبة
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+
+from tools.shape_cache import ShapeCache
+
+LIBRARY_CACHE_ROOT = Path(__file__).resolve().parents[1] / "library_cache"
+
+
+def index_path_for(folder: str) -> Path:
+    """ملف الفهرس لمجلد مكتبة: library_cache/<اسم المجلد>_<hash المسار>.json"""
+    folder = os.path.abspath(folder)
+    digest = hashlib.sha1(folder.encode("utf-8")).hexdigest()[:12]
+    return LIBRARY_CACHE_ROOT / f"{os.path.basename(folder) or 'library'}_{digest}.json"
+
+
+@dataclass
+class LibraryEntry:
+    name: str
+    dxf_path: str
+    png_path: str = ""
+    file_size: int = 0
+    mtime: float = 0.0
+    width: float = 0.0
+    height: float = 0.0
+    entities: int = 0
+
+    def summary(self) -> str:
+        return (f"{self.width:.1f} × {self.height:.1f} mm | "
+                f"{self.entities} entities | {self.file_size / 1024:.0f} KB")
+
+
+def read_entry_metadata(dxf_path: str) -> dict:
+    """
+    بيانات الفهرس لملف واحد (بدون OCC) — دالة على مستوى الموديول لتعمل في Process Pool.
+    """
+    import ezdxf
+    from ezdxf import bbox
+
+    st = os.stat(dxf_path)
+    entry = LibraryEntry(
+        name=os.path.splitext(os.path.basename(dxf_path))[0],
+        dxf_path=dxf_path,
+        file_size=st.st_size,
+        mtime=st.st_mtime,
+    )
+    png = os.path.splitext(dxf_path)[0] + ".png"
+    if os.path.exists(png):
+        entry.png_path = png
+
+    doc = ezdxf.readfile(dxf_path)
+    msp = doc.modelspace()
+    entry.entities = len(msp)
+    ext = bbox.extents(msp, fast=True)
+    if ext.has_data:
+        entry.width = float(ext.size.x)
+        entry.height = float(ext.size.y)
+    return asdict(entry)
+
+
+class ShapeLibrary:
+    def __init__(self, folder: str, max_shapes: int = 8):
+        self.folder = folder
+        self.index_path = index_path_for(folder)
+        self._entries = {}  # name -> LibraryEntry
+        self._shapes = ShapeCache(max_entries=max_shapes)
+        self._load_index()
+
+    # ---------- الفهرس ----------
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return
+        names = {f.name for f in fields(LibraryEntry)}
+        for item in raw.get("entries", []):
+            entry = LibraryEntry(**{k: v for k, v in item.items() if k in names})
+            self._entries[entry.name] = entry
+
+    def save_index(self):
+        data = {"entries": [asdict(e) for e in self._entries.values()]}
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+        except OSError as e:
+            print(f"[LIBRARY] ⚠️ Failed to save index: {e}")
+
+    def refresh(self):
+        """
+        مقارنة المجلد بالفهرس: يرجع (entries الصالحة, مسارات تحتاج إعادة فهرسة).
+        الملفات المحذوفة تُزال من الفهرس والكاش.
+        """
+        on_disk = {}
+        for fname in sorted(os.listdir(self.folder)):
+            if fname.lower().endswith(".dxf"):
+                on_disk[os.path.splitext(fname)[0]] = os.path.join(self.folder, fname)
+
+        for name in [n for n in self._entries if n not in on_disk]:
+            del self._entries[name]
+            self._shapes.invalidate(lambda k, n=name: k[0] == n)
+
+        fresh, stale = [], []
+        for name, path in on_disk.items():
+            entry = self._entries.get(name)
+            st = os.stat(path)
+            if entry and entry.file_size == st.st_size and abs(entry.mtime - st.st_mtime) < 1e-6:
+                fresh.append(entry)
+            else:
+                self._shapes.invalidate(lambda k, n=name: k[0] == n)
+                stale.append(path)
+        return fresh, stale
+
+    def update_entry(self, meta: dict) -> LibraryEntry:
+        entry = LibraryEntry(**meta)
+        self._entries[entry.name] = entry
+        return entry
+
+    def entry(self, name: str):
+        return self._entries.get(name)
+
+    def entries(self):
+        return [self._entries[n] for n in sorted(self._entries)]
+
+    # ---------- الهندسة (كسولة) ----------
+    def cached_shape(self, name: str, heal: bool = False):
+        return self._shapes.get((name, bool(heal)))
+
+    def get_shape(self, name: str, heal: bool = False):
+        """تحليل الشكل عند أول طلب ثم إرجاعه من كاش LRU (الشكل المبسّط وغير المبسّط منفصلان)."""
+        key = (name, bool(heal))
+        shape = self._shapes.get(key)
+        if shape is not None:
+            return shape
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        from dxf_loader import smart_load_dxf
+        shape = smart_load_dxf(entry.dxf_path, heal=heal)
+        if shape is not None and not shape.IsNull():
+            self._shapes.put(key, shape)
+            return shape
+        return None
+
+    def stats(self) -> dict:
+        data = self._shapes.stats()
+        data["indexed"] = len(self._entries)
+        return data
@@ -0,0 +1,113 @@
+# tools/thumbnail_cache.py — كاش صور المعاينة حسب محتوى المصدر والحجم
+"""
+ensure_preview_image كانت تكتفي بوجود <name>.png: إن تغيّر الـ DXF تبقى الصورة القديمة.
+و _dump_display_png كانت ترسم عبر العارض ثلاثي الأبعاد الحي فتمسح مشهد المستخدم.
+
+هنا:
+- المفتاح = sha256(محتوى DXF) + الحجم + الراسم (qt / raster) + RENDERER_VERSION
+  → أي تعديل يُنتج صورة جديدة، وصورة Headless لا تُستخدم بدل صورة QPainter
+- التوليد Offscreen بدون أي display: QImage (preview_utils) داخل التطبيق،
+  و tools.raster2d (NumPy خالص) في الوضع Headless / السكربتات
+- أحجام متعددة: "list" للقوائم و "detail" للعرض المفصل
+- الموديول لا يستورد Qt؛ التوليد في الخلفية للواجهة في tools.thumbnail_loader
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from tools.geometry_cache import file_digest
+
+RENDERER_VERSION = "1"
+THUMB_CACHE_ROOT = Path(__file__).resolve().parents[1] / "thumbnail_cache"
+THUMB_SIZES = {
+    "list": (96, 64),
+    "detail": (480, 320),
+}
+
+# (path, mtime, size) -> sha256 — لتفادي إعادة قراءة الملف عند كل طلب
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+def source_digest(dxf_path) -> str:
+    path = os.fspath(dxf_path)
+    st = os.stat(path)
+    stamp = (os.path.abspath(path), st.st_mtime, st.st_size)
+    with _digests_lock:
+        digest = _digests.get(stamp)
+    if digest is None:
+        digest = file_digest(path)
+        with _digests_lock:
+            _digests[stamp] = digest
+    return digest
+
+
+def renderer_name() -> str:
+    """"qt" عند وجود QApplication (QPainter بحواف أنعم)، وإلا "raster" (tools.raster2d بدون Qt)."""
+    try:
+        from PyQt5.QtGui import QGuiApplication
+        if QGuiApplication.instance() is not None:
+            return "qt"
+    except ImportError:
+        pass
+    return "raster"
+
+
+def thumbnail_path(dxf_path, size: str = "list", renderer: str = None) -> Path:
+    w, h = THUMB_SIZES[size]
+    digest = source_digest(dxf_path)
+    renderer = renderer or renderer_name()
+    return THUMB_CACHE_ROOT / size / f"{digest[:32]}_{w}x{h}_{renderer}_v{RENDERER_VERSION}.png"
+
+
+def cached_thumbnail(dxf_path, size: str = "list"):
+    """مسار الصورة إن كانت موجودة وحديثة (لنفس الراسم)، وإلا None (بدون توليد)."""
+    try:
+        path = thumbnail_path(dxf_path, size)
+    except OSError:
+        return None
+    return str(path) if path.exists() else None
+
+
+def _preview_renderer(name: str):
+    if name == "qt":
+        from frontend.window.tools.preview_utils import generate_dxf_preview_png
+        return generate_dxf_preview_png
+    from tools.raster2d import render_dxf_png
+    return render_dxf_png
+
+
+def render_thumbnail(dxf_path, size: str = "list"):
+    """توليد الصورة Offscreen إن لزم — آمن في خيط خلفي. يرجع المسار أو None."""
+    renderer = renderer_name()
+    try:
+        path = thumbnail_path(dxf_path, size, renderer)
+    except OSError as e:
+        print(f"[THUMB] ❌ {dxf_path}: {e}")
+        return None
+    if path.exists():
+        return str(path)
+
+    generate = _preview_renderer(renderer)
+    w, h = THUMB_SIZES[size]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.png")
+    try:
+        if not generate(os.fspath(dxf_path), str(tmp), w, h):
+            return None
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink(missing_ok=True)
+    return str(path)
+
+
+def export_thumbnail(dxf_path, dest, size: str = "detail"):
+    """نسخ صورة من الكاش (مع توليدها عند الحاجة) إلى مسار ثابت مثل مجلد البروفايل."""
+    src = render_thumbnail(dxf_path, size)
+    if src is None:
+        return None
+    shutil.copyfile(src, dest)
+    return str(dest)
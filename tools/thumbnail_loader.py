@@ -0,0 +1,34 @@
+# tools/thumbnail_loader.py — توليد صور المعاينة الناقصة في الخلفية للواجهة
+"""
+غلاف Qt حول tools.thumbnail_cache: الحساب (hash + توليد إن لزم) في خيوط خاصة،
+والنتيجة تصل لخيط الواجهة عبر إشارة thumbnailReady.
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from tools.op_executor import OperationExecutor
+from tools.thumbnail_cache import render_thumbnail
+
+
+class ThumbnailCache(QObject):
+    thumbnailReady = pyqtSignal(str, str, str)   # (dxf_path, size, png_path)
+
+    def __init__(self, max_workers: int = 2, parent=None):
+        super().__init__(parent)
+        # منفّذ خاص حتى لا تزاحم الصور عمليات الهندسة في get_executor()
+        self._executor = OperationExecutor(max_workers=max_workers, parent=self)
+
+    def request(self, dxf_path: str, size: str = "list"):
+        """طلب صورة — ترجع فورًا، والمسار يصل عبر thumbnailReady."""
+        self._executor.submit(
+            render_thumbnail, dxf_path, size,
+            key=f"thumb:{size}:{dxf_path}",
+            on_done=lambda png, p=dxf_path, s=size: self._on_ready(p, s, png),
+        )
+
+    def _on_ready(self, dxf_path, size, png_path):
+        if png_path:
+            self.thumbnailReady.emit(dxf_path, size, png_path)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -1,12 +1,12 @@
+from dataclasses import dataclass, fields
 from pathlib import Path
-import sqlite3
+
+from tools.db_access import get_database
 
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "tools.db"
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
+    get_database(DB_PATH).execute("""
         CREATE TABLE IF NOT EXISTS tools (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL,
@@ -18,23 +18,189 @@ def init_db():
             image_path TEXT
         )
     """)
-    conn.commit()
-    conn.close()
 
 def insert_tool(name, diameter, length, type_, rpm, steps, image_path):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO tools (name, diameter, length, type, rpm, steps, image_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (name, diameter, length, type_, rpm, steps, image_path))
-    conn.commit()
-    conn.close()
+    with get_database(DB_PATH).transaction() as con:
+        con.execute("""
+            INSERT INTO tools (name, diameter, length, type, rpm, steps, image_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (name, diameter, length, type_, rpm, steps, image_path))
 
 def get_all_tools():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM tools")
-    tools = cursor.fetchall()
-    conn.close()
-    return tools
\ No newline at end of file
+    return get_database(DB_PATH).query("SELECT * FROM tools")
+
+
+# ==================== 🧰 مكتبة أدوات مُنمّطة + بيانات القطع ====================
+# أعمدة مُنمّطة تُضاف للجداول القديمة عند الفتح
+TYPED_COLUMNS = {
+    "flute_count": "INTEGER DEFAULT 2",
+    "material": "TEXT DEFAULT ''",      # مادة الأداة (HSS / Carbide ...)
+    "max_depth": "REAL",                # أقصى عمق قطع مفيد (mm)
+    "feedrate": "REAL DEFAULT 500",
+    "image_path": "TEXT DEFAULT ''",
+}
+
+CUTTING_DATA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cutting_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tool_id INTEGER NOT NULL REFERENCES tools(id) ON DELETE CASCADE,
+    material TEXT NOT NULL COLLATE NOCASE,     -- مادة القطعة (aluminum / steel ...)
+    rpm INTEGER,
+    feed REAL,
+    plunge_feed REAL,
+    step_down REAL,
+    UNIQUE(tool_id, material) ON CONFLICT REPLACE
+);
+"""
+
+TOOL_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_tools_type_dia ON tools(type COLLATE NOCASE, diameter);
+CREATE INDEX IF NOT EXISTS idx_tools_dia ON tools(diameter);
+CREATE INDEX IF NOT EXISTS idx_tools_name ON tools(name COLLATE NOCASE);
+"""
+
+# أنواع تصلح للثقوب بترتيب الأفضلية (المثقاب أولًا) — المقارنة بدون حساسية للحالة
+HOLE_TOOL_TYPES = ("Drill", "Endmill")
+# أنواع تستطيع تفريغ ثقب أكبر من قطرها (استيفاء حلزوني)
+BORING_TOOL_TYPES = ("Endmill",)
+DEFAULT_MATERIAL = "aluminum"
+DIA_TOLERANCE = 0.05
+
+
+@dataclass
+class Tool:
+    id: int
+    name: str
+    type: str = ""
+    diameter: float = 0.0
+    length: float = 0.0
+    rpm: int = 0
+    feedrate: float = 0.0
+    flute_count: int = 2
+    material: str = ""
+    max_depth: float = None
+    image_path: str = ""
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Tool":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in row.items() if k in names})
+
+    @property
+    def reach(self):
+        """أقصى عمق يمكن للأداة حفره: max_depth وإلا طول الأداة (None = غير معروف)."""
+        return self.max_depth if self.max_depth is not None else (self.length or None)
+
+    def as_dict(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+def ensure_tool_schema(db):
+    """ترقية جدول tools للأعمدة المُنمّطة + cutting_data + الفهارس (idempotent)."""
+    cols = db.columns("tools")
+    with db.transaction() as con:
+        for col, decl in TYPED_COLUMNS.items():
+            if col not in cols:
+                con.execute(f"ALTER TABLE tools ADD COLUMN {col} {decl}")
+    db.conn.executescript(CUTTING_DATA_SCHEMA + TOOL_INDEXES)
+
+
+class ToolLibrary:
+    """استعلامات مفهرسة على مكتبة الأدوات — بدون تحميل الجدول كاملًا."""
+
+    def __init__(self, db_path: Path = DB_PATH):
+        self.db = get_database(db_path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS tools (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                type TEXT,
+                diameter REAL,
+                length REAL,
+                rpm INTEGER
+            )
+        """)
+        ensure_tool_schema(self.db)
+
+    # ---------- بحث ----------
+    def get(self, tool_id):
+        rows = self.db.query_dicts("SELECT * FROM tools WHERE id = ?", (tool_id,))
+        return Tool.from_row(rows[0]) if rows else None
+
+    def find_by_name(self, name: str):
+        rows = self.db.query_dicts("SELECT * FROM tools WHERE name = ? COLLATE NOCASE LIMIT 1", (name,))
+        return Tool.from_row(rows[0]) if rows else None
+
+    def by_diameter(self, dia_min: float, dia_max: float, types=None, limit: int = 100):
+        """أدوات بقطر ضمن النطاق (idx_tools_type_dia / idx_tools_dia)."""
+        sql, params = "SELECT * FROM tools WHERE diameter BETWEEN ? AND ?", [dia_min, dia_max]
+        if types:
+            sql += f" AND type COLLATE NOCASE IN ({', '.join('?' * len(types))})"
+            params += list(types)
+        sql += " ORDER BY diameter LIMIT ?"
+        params.append(limit)
+        return [Tool.from_row(r) for r in self.db.query_dicts(sql, params)]
+
+    def tools_for_holes(self, types=HOLE_TOOL_TYPES, limit: int = 500):
+        rows = self.db.query_dicts(
+            f"SELECT * FROM tools WHERE type COLLATE NOCASE IN ({', '.join('?' * len(types))}) "
+            "ORDER BY diameter LIMIT ?", (*types, limit))
+        return [Tool.from_row(r) for r in rows]
+
+    def best_tool_for_hole(self, dia: float, depth: float = 0.0, types=HOLE_TOOL_TYPES,
+                           tol: float = DIA_TOLERANCE):
+        """
+        أفضل أداة لثقب قطره dia وعمقه depth:
+        1) مثقاب/فريزة بقطر = dia (± tol) تصل للعمق — المثقاب أولًا ثم الأقرب قطرًا ثم الأقصر
+        2) وإلا أكبر فريزة (BORING_TOOL_TYPES فقط — المثقاب الأصغر يترك الثقب ناقصًا)
+           أصغر من dia تصل للعمق → المولّد يفرّغها حلزونيًا
+        يرجع Tool أو None (مع تحذير).
+        """
+        reach = "COALESCE(max_depth, NULLIF(length, 0), :depth) >= :depth"
+        named = {f"t{i}": t for i, t in enumerate(types)}
+        type_in = ", ".join(f":{k}" for k in named)
+        rank = " ".join(f"WHEN type = :{k} COLLATE NOCASE THEN {i}" for i, k in enumerate(named))
+        rows = self.db.query_dicts(f"""
+            SELECT * FROM tools
+            WHERE type COLLATE NOCASE IN ({type_in})
+              AND diameter BETWEEN :lo AND :hi AND {reach}
+            ORDER BY CASE {rank} ELSE {len(types)} END,
+                     ABS(diameter - :dia), COALESCE(max_depth, length, 1e9)
+            LIMIT 1
+        """, {**named, "lo": dia - tol, "hi": dia + tol, "dia": dia, "depth": depth})
+        if not rows:
+            boring = {f"b{i}": t for i, t in enumerate(BORING_TOOL_TYPES)}
+            boring_in = ", ".join(f":{k}" for k in boring)
+            rows = self.db.query_dicts(f"""
+                SELECT * FROM tools
+                WHERE type COLLATE NOCASE IN ({boring_in})
+                  AND diameter < :dia AND diameter > 0 AND {reach}
+                ORDER BY diameter DESC
+                LIMIT 1
+            """, {**boring, "dia": dia - tol, "depth": depth})
+        if not rows:
+            print(f"[TOOLS] ⚠️ No tool for hole D{dia:g} x {depth:g}")
+            return None
+        return Tool.from_row(rows[0])
+
+    # ---------- بيانات القطع ----------
+    def set_cutting_data(self, tool_id, material: str, rpm=None, feed=None,
+                         plunge_feed=None, step_down=None):
+        with self.db.transaction() as con:
+            con.execute("""
+                INSERT INTO cutting_data (tool_id, material, rpm, feed, plunge_feed, step_down)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (tool_id, material, rpm, feed, plunge_feed, step_down))
+
+    def cutting_data(self, tool: Tool, material: str = DEFAULT_MATERIAL) -> dict:
+        """rpm / feed / plunge_feed للأداة على المادة — وإلا قيم الأداة الافتراضية."""
+        rows = self.db.query_dicts(
+            "SELECT rpm, feed, plunge_feed, step_down FROM cutting_data WHERE tool_id = ? AND material = ?",
+            (tool.id, material))
+        data = {"rpm": tool.rpm or None, "feed": tool.feedrate or None,
+                "plunge_feed": None, "step_down": None}
+        if rows:
+            data.update({k: v for k, v in rows[0].items() if v is not None})
+        if data["plunge_feed"] is None:
+            data["plunge_feed"] = data["feed"]
+        return data